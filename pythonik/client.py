@@ -1,29 +1,74 @@
+from typing import Optional
+
 from urllib3.util import Retry
-from requests import Session
-from requests.adapters import HTTPAdapter
+from requests import Request, Session
 
-from pythonik.specs.assets import AssetSpec
-from pythonik.specs.files import FilesSpec
-from pythonik.specs.jobs import JobSpec
-from pythonik.specs.metadata import MetadataSpec
-from pythonik.specs.search import SearchSpec
-from pythonik.specs.collection import CollectionSpec
+from pythonik.hooks import RequestHooks
+from pythonik.ratelimit import RateLimiter
+from pythonik.specs.assets import AssetSpec, AsyncAssetSpec
+from pythonik.specs.files import AsyncFilesSpec, FilesSpec
+from pythonik.specs.jobs import AsyncJobSpec, JobSpec
+from pythonik.specs.metadata import AsyncMetadataSpec, MetadataSpec
+from pythonik.specs.search import AsyncSearchSpec, SearchSpec
+from pythonik.specs.collection import AsyncCollectionSpec, CollectionSpec
+from pythonik.transport import PooledHTTPAdapter, PoolStats, new_storage_session
 
 
 # Iconik APIs
 class PythonikClient:
     """
     Iconik Client
+
+    Args:
+        app_id: Iconik application ID
+        auth_token: Iconik auth token
+        timeout: Request timeout in seconds
+        base_url: Iconik environment to connect to
+        hooks: Instrumentation hooks shared by every spec created by this
+            client, a new empty registry is created if not provided
+        rate_limiter: Request budget shared by every spec created by this
+            client, which also retries throttled (429) requests
+        pool_connections: Number of hosts whose connection pools are kept
+        pool_maxsize: Connections kept alive per host. Set it to at least the
+            number of threads sharing the client, otherwise extra connections
+            are opened and discarded after each request
+        pool_block: Wait for a free connection once pool_maxsize connections
+            to a host are in use, instead of opening extra ones
+        tcp_keepalive: Enable TCP keep-alive probes on pooled connections
+
+    Object storage (S3/GCS) traffic goes through a separate pooled session,
+    ``storage_session``, which never carries the Iconik credentials and
+    retries throttled and failed requests. It uses the same pool settings.
     """
 
-    def __init__(self, app_id: str, auth_token: str, timeout: int, base_url: str  = "https://app.iconik.io" ):
+    def __init__(
+        self,
+        app_id: str,
+        auth_token: str,
+        timeout: int,
+        base_url: str = "https://app.iconik.io",
+        hooks: Optional[RequestHooks] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        tcp_keepalive: bool = False,
+    ):
         self.session = Session()
         self.base_url = base_url
         retry_strategy = Retry(
             total=4,  # Maximum number of retries
             backoff_factor=3,
+            # with a rate limiter, 429 responses are retried by the limiter
+            respect_retry_after_header=rate_limiter is None,
+        )
+        http_adapter = PooledHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=retry_strategy,
+            tcp_keepalive=tcp_keepalive,
         )
-        http_adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", http_adapter)
         self.session.mount("https://", http_adapter)
         self.session.headers = {
@@ -32,21 +77,231 @@ class PythonikClient:
             "Accept": "application/json",
         }
         self.timeout = timeout
+        self.hooks = hooks if hooks is not None else RequestHooks()
+        self.rate_limiter = rate_limiter
+        self.storage_session = new_storage_session(
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            tcp_keepalive=tcp_keepalive,
+        )
+
+    def close(self):
+        """Close the underlying connection pools"""
+        self.session.close()
+        self.storage_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def warmup(self, connections: int = 1) -> int:
+        """
+        Open connections to base_url ahead of the first requests, so their TCP
+        and TLS handshakes are not paid by the first calls.
+
+        Args:
+            connections: Number of connections to open, capped at pool_maxsize
+
+        Returns:
+            Number of connections opened
+        """
+        request = self.session.prepare_request(Request("GET", self.base_url))
+        settings = self.session.merge_environment_settings(request.url, {}, None, None, None)
+        adapter = self.session.get_adapter(request.url)
+        return adapter.warmup(
+            request,
+            connections,
+            verify=settings["verify"],
+            cert=settings["cert"],
+            proxies=settings["proxies"],
+        )
+
+    def pool_stats(self) -> PoolStats:
+        """Connection pool counters of the session, see :class:`PoolStats`"""
+        return self.session.get_adapter(self.base_url).pool_stats()
+
+    def storage_pool_stats(self) -> PoolStats:
+        """Connection pool counters of the object storage session, summed over storage hosts"""
+        return self.storage_session.get_adapter("https://").pool_stats()
 
     def collections(self):
-        return CollectionSpec(self.session, self.timeout, self.base_url)
+        return CollectionSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            rate_limiter=self.rate_limiter,
+        )
 
     def assets(self):
-        return AssetSpec(self.session, self.timeout, self.base_url)
+        return AssetSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            rate_limiter=self.rate_limiter,
+        )
 
     def files(self):
-        return FilesSpec(self.session, self.timeout, self.base_url)
+        return FilesSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            storage_session=self.storage_session,
+            rate_limiter=self.rate_limiter,
+        )
 
     def metadata(self):
-        return MetadataSpec(self.session, self.timeout, self.base_url)
+        return MetadataSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            rate_limiter=self.rate_limiter,
+        )
 
     def search(self):
-        return SearchSpec(self.session, self.timeout, self.base_url)
+        return SearchSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            rate_limiter=self.rate_limiter,
+        )
 
     def jobs(self):
-        return JobSpec(self.session, self.timeout, self.base_url)
+        return JobSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            rate_limiter=self.rate_limiter,
+        )
+
+
+class AsyncPythonikClient:
+    """
+    asyncio Iconik Client
+
+    Mirrors :class:`PythonikClient`, but every spec method is a coroutine
+    returning the same ``Response`` wrapper and Pydantic models. All specs
+    share one ``httpx.AsyncClient`` connection pool, so a single event loop
+    can keep many requests in flight.
+
+    Requires the optional ``httpx`` dependency (``pip install nsa-pythonik[async]``).
+
+    Example:
+        async with AsyncPythonikClient(app_id, auth_token, timeout=10) as client:
+            res = await client.assets().get(asset_id)
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        auth_token: str,
+        timeout: int,
+        base_url: str = "https://app.iconik.io",
+        max_connections: int = 100,
+        hooks: Optional[RequestHooks] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        try:
+            import httpx
+        except ImportError as e:  # pragma: no cover - depends on the environment
+            raise ImportError(
+                "AsyncPythonikClient requires httpx, install it with"
+                " `pip install nsa-pythonik[async]`"
+            ) from e
+
+        self.base_url = base_url
+        self.timeout = timeout
+        self.hooks = hooks if hooks is not None else RequestHooks()
+        self.rate_limiter = rate_limiter
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self.session = httpx.AsyncClient(
+            headers={
+                "App-ID": app_id,
+                "Auth-Token": auth_token,
+                "Accept": "application/json",
+            },
+            # retry failed connection attempts like the sync client does
+            transport=httpx.AsyncHTTPTransport(retries=4, limits=limits),
+            follow_redirects=True,
+        )
+        # object storage (S3/GCS) traffic must never carry the Iconik credentials
+        self.storage_session = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(retries=4, limits=limits),
+            follow_redirects=True,
+        )
+
+    async def aclose(self):
+        """Close the underlying connection pools"""
+        await self.session.aclose()
+        await self.storage_session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def collections(self):
+        return AsyncCollectionSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            rate_limiter=self.rate_limiter,
+        )
+
+    def assets(self):
+        return AsyncAssetSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            rate_limiter=self.rate_limiter,
+        )
+
+    def files(self):
+        return AsyncFilesSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            storage_session=self.storage_session,
+            rate_limiter=self.rate_limiter,
+        )
+
+    def metadata(self):
+        return AsyncMetadataSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            rate_limiter=self.rate_limiter,
+        )
+
+    def search(self):
+        return AsyncSearchSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            rate_limiter=self.rate_limiter,
+        )
+
+    def jobs(self):
+        return AsyncJobSpec(
+            self.session,
+            self.timeout,
+            self.base_url,
+            hooks=self.hooks,
+            rate_limiter=self.rate_limiter,
+        )
@@ -0,0 +1,161 @@
+import json
+import mmap
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from pythonik.exceptions import DownloadError
+from pythonik.hashing import DEFAULT_ALGORITHMS, file_digests
+from pythonik.uploads import MiB, Part, PathLike
+
+DEFAULT_DOWNLOAD_PART_SIZE = 16 * MiB
+# size of the chunks read from a response body
+DOWNLOAD_CHUNK_SIZE = MiB
+DEFAULT_CHECKSUM_ALGORITHM = DEFAULT_ALGORITHMS[0]
+_CONTENT_RANGE = re.compile(r"bytes (?:\d+-\d+|\*)/(\d+)")
+
+
+def download_source(source: Any) -> Tuple[str, Optional[str]]:
+    """
+    URL and known checksum of what to download: a URL, or an object with a
+    signed ``url`` such as a File, Proxy or Keyframe.
+
+    Raises:
+        ValueError: If the object has no download URL
+    """
+    if isinstance(source, str):
+        return source, None
+    url = getattr(source, "url", None)
+    if not url:
+        raise ValueError(
+            f"{type(source).__name__} has no download URL, fetch it with generate_signed_url"
+        )
+    return url, getattr(source, "checksum", None) or None
+
+
+def content_range_size(response) -> Optional[int]:
+    """Total size of the object, from the Content-Range of a 206 or 416 response"""
+    match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
+
+
+def range_header(part: Part) -> str:
+    return f"bytes={part.offset}-{part.offset + part.length - 1}"
+
+
+def download_state_path(dest: PathLike) -> str:
+    """Sidecar file recording the parts of dest already downloaded"""
+    return f"{os.fspath(dest)}.download"
+
+
+def preallocate(dest: PathLike, size: int):
+    """Create dest with its final size, reserving the disk space where supported"""
+    with open(dest, "wb") as f:
+        if size and hasattr(os, "posix_fallocate"):
+            # a full disk then fails here instead of with SIGBUS in a mapped write
+            os.posix_fallocate(f.fileno(), 0, size)
+        else:
+            f.truncate(size)
+
+
+def verify_checksum(path: PathLike, expected: str, algorithm: str = DEFAULT_CHECKSUM_ALGORITHM):
+    """
+    Raises:
+        DownloadError: If the checksum of the file is not the expected one
+    """
+    actual = file_digests(path, (algorithm,))[algorithm]
+    if actual.lower() != expected.lower():
+        raise DownloadError(
+            f"Checksum mismatch for {os.fspath(path)}: expected {expected}, got {actual}"
+        )
+
+
+class PartWriter:
+    """
+    Writes the body of a ranged response into its place in the preallocated
+    destination, through a memory map of that part only. Closing flushes the
+    part to disk, so a part recorded as done survives a crash.
+
+    Raises:
+        DownloadError: If the body is longer or shorter than the part, the
+            latter being retryable
+    """
+
+    def __init__(self, dest: PathLike, part: Part):
+        self.part = part
+        self.written = 0
+        start = part.offset - part.offset % mmap.ALLOCATIONGRANULARITY
+        with open(dest, "r+b") as f:
+            self._mapped = mmap.mmap(
+                f.fileno(), part.offset + part.length - start, offset=start, access=mmap.ACCESS_WRITE
+            )
+        self._view = memoryview(self._mapped)[part.offset - start :]
+
+    def write(self, chunk: bytes):
+        end = self.written + len(chunk)
+        if end > self.part.length:
+            raise DownloadError(f"Part {self.part.number} received more than {self.part.length} bytes")
+        self._view[self.written : end] = chunk
+        self.written = end
+
+    def close(self, complete: bool = True):
+        self._view.release()
+        try:
+            if complete:
+                if self.written != self.part.length:
+                    raise DownloadError(
+                        f"Part {self.part.number} ended after {self.written} of {self.part.length} bytes",
+                        retryable=True,
+                    )
+                self._mapped.flush()
+        finally:
+            self._mapped.close()
+
+    def __enter__(self) -> "PartWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(complete=exc_type is None)
+
+
+@dataclass
+class DownloadState:
+    """
+    Parts of a download already written to the destination, and the
+    identity of the object they belong to. Signed URLs change on every
+    request, so the object is recognised by its size and ETag.
+    """
+
+    size: int
+    etag: str
+    part_size: int
+    done: List[int] = field(default_factory=list)
+
+    @classmethod
+    def load(
+        cls, state_path: PathLike, size: int, etag: str, part_size: int
+    ) -> Optional["DownloadState"]:
+        """The saved state, or None if missing, unreadable or for another object"""
+        try:
+            with open(state_path, encoding="utf-8") as f:
+                state = cls(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        if (state.size, state.etag, state.part_size) != (size, etag, part_size):
+            return None
+        return state
+
+    def save(self, state_path: PathLike):
+        """Write the state atomically"""
+        tmp_path = f"{os.fspath(state_path)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f)
+        os.replace(tmp_path, state_path)
+
+    @staticmethod
+    def clear(state_path: PathLike):
+        try:
+            os.remove(state_path)
+        except FileNotFoundError:
+            pass
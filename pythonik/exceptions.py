@@ -5,3 +5,32 @@ class PythonikException(Exception):
 class UnexpectedStorageMethodForProxy(PythonikException):
     """Raised when an unexpected storage method is called for a proxy."""
     pass
+
+
+class TransferError(PythonikException):
+    """Raised when moving data to or from object storage fails.
+
+    ``response`` holds the storage response, if there was one, and
+    ``retryable`` is set when the transfer failed in a way worth retrying.
+    """
+
+    def __init__(self, message: str, response=None, retryable: bool = False):
+        super().__init__(message)
+        self.response = response
+        self.retryable = retryable
+
+
+class UploadError(TransferError):
+    """Raised when uploading a file to object storage fails."""
+
+
+class DownloadError(TransferError):
+    """Raised when downloading a file from object storage fails."""
+
+
+class ExportError(PythonikException):
+    """Raised when a row does not fit the columns of an export being written.
+
+    Without explicit ``fields`` the columns are inferred from the first rows,
+    and a later row with other columns or types cannot be written.
+    """
@@ -0,0 +1,270 @@
+import csv
+import json
+import os
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from pydantic import BaseModel
+
+from pythonik.exceptions import ExportError
+
+FORMATS = ("ndjson", "csv", "parquet")
+
+Destination = Union[str, "os.PathLike[str]", IO]
+
+
+def project(obj: Union[BaseModel, Dict[str, Any]], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Turn a search result object into a flat row.
+
+    Only the fields present in the API response are kept (fields the
+    response did not include are not filled with model defaults), and the
+    internal ``_sort`` cursor is dropped.
+
+    Args:
+        obj: Search result Object, or an already dumped dict
+        fields: Columns to keep, in order. Dotted names reach into nested
+            dicts, e.g. ``metadata.Description``. Missing values are None.
+    """
+    if isinstance(obj, BaseModel):
+        data = obj.model_dump(mode="json", exclude_unset=True, exclude={"sort"})
+    else:
+        data = {key: value for key, value in obj.items() if key != "_sort"}
+    if fields is None:
+        return data
+
+    row = {}
+    for field in fields:
+        value = data
+        for part in field.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        row[field] = value
+    return row
+
+
+def _json_cell(value: Any) -> Any:
+    """Encode nested values as JSON so they fit a flat cell"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+class _Writer:
+    binary = False
+
+    def __init__(self, destination: Destination, fields: Optional[Sequence[str]] = None):
+        self.fields = list(fields) if fields is not None else None
+        self.rows = 0
+        if isinstance(destination, (str, os.PathLike)):
+            mode = "wb" if self.binary else "w"
+            kwargs = {} if self.binary else {"encoding": "utf-8", "newline": ""}
+            self._file = open(destination, mode, **kwargs)
+            self._owns_file = True
+        else:
+            self._file = destination
+            self._owns_file = False
+
+    def write(self, row: Dict[str, Any]):
+        raise NotImplementedError
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]):
+        for row in rows:
+            self.write(row)
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NDJSONWriter(_Writer):
+    """Write one JSON document per line"""
+
+    def write(self, row: Dict[str, Any]):
+        self._file.write(json.dumps(row, separators=(",", ":")) + "\n")
+        self.rows += 1
+
+
+class CSVWriter(_Writer):
+    """
+    Write rows as CSV, nested values are JSON encoded.
+
+    The columns are ``fields`` if given, and other keys of the rows are
+    left out. Otherwise they are the keys of the first row, as the header is
+    written before the other rows are seen: pass ``fields`` for results
+    whose fields vary, such as sparse metadata.
+
+    Raises:
+        ExportError: From :meth:`write`, without ``fields``, for a row with
+            a key the first row did not have
+    """
+
+    def __init__(self, destination: Destination, fields: Optional[Sequence[str]] = None):
+        super().__init__(destination, fields)
+        self._writer = None
+
+    def write(self, row: Dict[str, Any]):
+        if self._writer is None:
+            columns = self.fields if self.fields is not None else list(row)
+            self._writer = csv.DictWriter(self._file, fieldnames=columns, extrasaction="ignore")
+            self._writer.writeheader()
+        elif self.fields is None:
+            extra = [key for key in row if key not in self._writer.fieldnames]
+            if extra:
+                raise ExportError(
+                    f"Row {self.rows + 1} has columns missing from the CSV header inferred"
+                    f" from the first row: {', '.join(extra)}. Pass fields to export them."
+                )
+        self._writer.writerow({key: _json_cell(value) for key, value in row.items()})
+        self.rows += 1
+
+
+class ParquetWriter(_Writer):
+    """
+    Write rows as Parquet, one row group every ``row_group_size`` rows so
+    memory stays bounded.
+
+    The columns are ``fields`` if given, otherwise the keys of the rows of
+    the first row group, and their types are inferred from the first row
+    group. Nested values are stored as JSON strings and columns that are
+    empty in the first row group are typed as strings. Pass ``fields`` (and
+    a larger ``row_group_size``) for results whose fields vary. Requires the
+    optional ``pyarrow`` dependency (``pip install nsa-pythonik[parquet]``).
+
+    Raises:
+        ExportError: From :meth:`write` or :meth:`close`, for a row group
+            with a column missing from the schema (without ``fields``) or a
+            value of another type. The row groups before it are written.
+    """
+
+    binary = True
+
+    def __init__(
+        self,
+        destination: Destination,
+        fields: Optional[Sequence[str]] = None,
+        row_group_size: int = 10000,
+    ):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:  # pragma: no cover - depends on the environment
+            raise ImportError(
+                "Parquet export requires pyarrow, install it with"
+                " `pip install nsa-pythonik[parquet]`"
+            ) from e
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        super().__init__(destination, fields)
+        self.row_group_size = row_group_size
+        self._batch: List[Dict[str, Any]] = []
+        self._schema = None
+        self._writer = None
+
+    def write(self, row: Dict[str, Any]):
+        self._batch.append({key: _json_cell(value) for key, value in row.items()})
+        self.rows += 1
+        if len(self._batch) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        pa = self._pa
+        first_row = self.rows - len(batch) + 1
+        if self._schema is None:
+            columns = self.fields
+            if columns is None:
+                columns = list(dict.fromkeys(key for row in batch for key in row))
+            try:
+                inferred = pa.Table.from_pylist(
+                    [{column: row.get(column) for column in columns} for row in batch]
+                ).schema
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise ExportError(f"Cannot infer the schema from the first row group: {e}") from e
+            self._schema = pa.schema(
+                [
+                    pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                    for field in inferred
+                ]
+            )
+            self._writer = self._pq.ParquetWriter(self._file, self._schema)
+        elif self.fields is None:
+            extra = list(
+                dict.fromkeys(
+                    key for row in batch for key in row if self._schema.get_field_index(key) < 0
+                )
+            )
+            if extra:
+                raise ExportError(
+                    f"The row group from row {first_row} has columns missing from the schema"
+                    f" inferred from the first row group: {', '.join(extra)}. Pass fields to"
+                    " export them."
+                )
+        try:
+            table = pa.Table.from_pylist(batch, schema=self._schema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ExportError(
+                f"The row group from row {first_row} does not match the schema inferred"
+                f" from the first row group: {e}"
+            ) from e
+        self._writer.write_table(table)
+
+    def close(self):
+        try:
+            self._flush()
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+            super().close()
+
+
+WRITERS = {"ndjson": NDJSONWriter, "csv": CSVWriter, "parquet": ParquetWriter}
+
+
+def open_writer(
+    destination: Destination, format: str = "ndjson", fields: Optional[Sequence[str]] = None
+) -> _Writer:
+    """
+    Open a row writer for an export format.
+
+    Args:
+        destination: Path, or an open file (text for ndjson/csv, binary for parquet)
+        format: One of ``ndjson``, ``csv`` or ``parquet``
+        fields: Columns to write, see :func:`project`
+
+    Raises:
+        ValueError: If format is not supported
+    """
+    if format not in WRITERS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    return WRITERS[format](destination, fields)
+
+
+def export_objects(
+    objects: Iterable[Union[BaseModel, Dict[str, Any]]],
+    destination: Destination,
+    format: str = "ndjson",
+    fields: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Stream objects into an export file, one row at a time.
+
+    Args:
+        objects: Search result objects, e.g. from ``SearchSpec.iter_search``
+        destination: Path or open file to write to
+        format: One of ``ndjson``, ``csv`` or ``parquet``
+        fields: Columns to write, see :func:`project`
+
+    Returns:
+        Number of rows written
+    """
+    with open_writer(destination, format, fields) as writer:
+        for obj in objects:
+            writer.write(project(obj, fields))
+    return writer.rows
@@ -0,0 +1,82 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, Optional, Sequence
+
+from pythonik.uploads import MiB, PathLike
+
+# algorithms hashed when none are given, Iconik records MD5 checksums
+DEFAULT_ALGORITHMS = ("md5",)
+DEFAULT_BUFFER_SIZE = 8 * MiB
+
+
+def file_digests(
+    path: PathLike,
+    algorithms: Sequence[str] = DEFAULT_ALGORITHMS,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Dict[str, str]:
+    """
+    Hex digests of a file for each hashlib algorithm, computed in a single
+    pass with large reads into one reused buffer.
+
+    Args:
+        path: File to hash
+        algorithms: hashlib algorithm names, e.g. ``("md5", "sha256")``
+        buffer_size: Bytes read at a time
+
+    Returns:
+        Hex digest keyed by algorithm name
+    """
+    hashes = {name: hashlib.new(name) for name in algorithms}
+    buffer = memoryview(bytearray(buffer_size))
+    with open(path, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            chunk = buffer[:read]
+            for digest in hashes.values():
+                digest.update(chunk)
+    return {name: digest.hexdigest() for name, digest in hashes.items()}
+
+
+def hash_files(
+    paths: Iterable[PathLike],
+    algorithms: Sequence[str] = DEFAULT_ALGORITHMS,
+    processes: Optional[int] = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Dict[str, Dict[str, str]]:
+    """
+    Hash many files in parallel across a process pool, e.g. to fill
+    ``FileCreate.checksum`` when registering files without uploading them.
+
+    Each file is hashed by one process with :func:`file_digests`, small
+    files are handed to the processes in batches.
+
+    Args:
+        paths: Files to hash
+        algorithms: hashlib algorithm names, e.g. ``("md5", "sha256")``
+        processes: Number of processes, defaults to the number of CPUs
+        buffer_size: Bytes read at a time by each process
+
+    Returns:
+        Digests of each file keyed by ``os.fspath(path)``, then by algorithm
+
+    Raises:
+        OSError: If a file cannot be read
+
+    Example:
+        digests = hash_files(paths, algorithms=("md5", "sha256"), processes=8)
+        body = FileCreate(..., checksum=digests[os.fspath(path)]["md5"])
+    """
+    paths = [os.fspath(path) for path in paths]
+    if not paths:
+        return {}
+    processes = min(processes or os.cpu_count() or 1, len(paths))
+    hash_one = partial(file_digests, algorithms=tuple(algorithms), buffer_size=buffer_size)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        digests = executor.map(hash_one, paths, chunksize=max(1, len(paths) // (processes * 4)))
+        return dict(zip(paths, digests))
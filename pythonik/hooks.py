@@ -0,0 +1,137 @@
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+
+PRE_REQUEST = "pre_request"
+POST_RESPONSE = "post_response"
+ERROR = "error"
+STAGES = (PRE_REQUEST, POST_RESPONSE, ERROR)
+
+# Iconik object ids are UUIDs, collapsing them gives the endpoint template
+_ID_SEGMENT = re.compile(
+    r"(?<=/)[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}(?=/|$)"
+)
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Return the path of ``url`` with object ids replaced by ``{}``, e.g.
+    ``/API/assets/v1/assets/{}/segments/``. Useful for grouping metrics by
+    endpoint rather than by individual object.
+    """
+    return _ID_SEGMENT.sub("{}", urlparse(url).path)
+
+
+@dataclass
+class RequestEvent:
+    """
+    Describes a single API call. The same instance is passed to every stage
+    of the call, with the response fields filled in once they are known.
+    """
+
+    method: str
+    url: str
+    endpoint: str
+    bytes_out: int = 0
+    status_code: Optional[int] = None
+    bytes_in: int = 0
+    elapsed: float = 0.0  # seconds
+    error: Optional[BaseException] = None
+    started: float = field(default=0.0, repr=False)
+
+
+Hook = Callable[[RequestEvent], None]
+
+
+class RequestHooks:
+    """
+    Registry of instrumentation hooks called around every API request.
+
+    Stages:
+        - ``pre_request``: before the request is sent
+        - ``post_response``: after a response is received, whatever its status
+        - ``error``: when sending the request raised (connection errors,
+          timeouts, ...); the exception is re-raised afterwards
+
+    When no hook is registered the specs skip instrumentation entirely, so an
+    empty registry costs nothing per request.
+
+    Example:
+        client = PythonikClient(app_id, auth_token, timeout=10)
+
+        @client.hooks.on("post_response")
+        def record(event):
+            metrics.timing(event.endpoint, event.elapsed, status=event.status_code)
+    """
+
+    def __init__(self):
+        self._hooks: Dict[str, List[Hook]] = {stage: [] for stage in STAGES}
+
+    def __bool__(self) -> bool:
+        return any(self._hooks.values())
+
+    def register(self, stage: str, hook: Hook) -> Hook:
+        """
+        Register a hook for a stage.
+
+        Args:
+            stage: One of ``pre_request``, ``post_response`` or ``error``
+            hook: Callable receiving the RequestEvent
+
+        Returns:
+            The hook, so this can be used as a decorator
+
+        Raises:
+            ValueError: If stage is not a known stage
+        """
+        if stage not in self._hooks:
+            raise ValueError(f"stage must be one of {', '.join(STAGES)}")
+        self._hooks[stage].append(hook)
+        return hook
+
+    def unregister(self, stage: str, hook: Hook):
+        """Remove a previously registered hook"""
+        self._hooks[stage].remove(hook)
+
+    def on(self, stage: str) -> Callable[[Hook], Hook]:
+        """Decorator form of :meth:`register`"""
+        return lambda hook: self.register(stage, hook)
+
+    def _call(self, stage: str, event: RequestEvent):
+        for hook in self._hooks[stage]:
+            try:
+                hook(event)
+            except Exception:
+                # instrumentation must never break the request itself
+                logger.exception(f"pythonik {stage} hook {hook!r} failed")
+
+    def before_request(self, method: str, url: str, headers) -> RequestEvent:
+        """Build the event for a request about to be sent and run pre_request hooks"""
+        event = RequestEvent(
+            method=method,
+            url=url,
+            endpoint=endpoint_template(url),
+            bytes_out=int(headers.get("Content-Length") or 0),
+        )
+        self._call(PRE_REQUEST, event)
+        event.started = time.perf_counter()
+        return event
+
+    def after_response(self, event: RequestEvent, response) -> RequestEvent:
+        """Record the response on the event and run post_response hooks"""
+        event.elapsed = time.perf_counter() - event.started
+        event.status_code = response.status_code
+        event.bytes_in = len(response.content)
+        self._call(POST_RESPONSE, event)
+        return event
+
+    def on_error(self, event: RequestEvent, error: BaseException) -> RequestEvent:
+        """Record the exception on the event and run error hooks"""
+        event.elapsed = time.perf_counter() - event.started
+        event.error = error
+        self._call(ERROR, event)
+        return event
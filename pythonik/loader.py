@@ -0,0 +1,344 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from pythonik.specs.async_base import AsyncSpec
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchFunction = Callable[[List[K]], Mapping[K, V]]
+AsyncBatchFunction = Callable[[List[K]], Awaitable[Mapping[K, V]]]
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Coalesce lookups issued from independent places into batched requests.
+
+    Keys requested with :meth:`load` within ``wait`` seconds of each other
+    are deduplicated and resolved with a single call to ``batch_fn``, which
+    receives the list of keys and returns a mapping of the values it found.
+    Keys missing from that mapping resolve to None. A batch is dispatched as
+    soon as it reaches ``max_batch_size`` keys.
+
+    Results are cached per key for the lifetime of the loader, so a loader
+    should be scoped to one unit of work (a request, a job...). Failed
+    lookups are not cached. Every call returns its own Future, so a caller
+    cancelling it does not affect the other callers of the same key.
+
+    Args:
+        batch_fn: Resolves a list of keys into a mapping of key to value
+        max_batch_size: Maximum number of keys passed to batch_fn at once
+        wait: Seconds to collect keys before dispatching a batch
+        cache: Whether to remember the result of each key
+        workers: Maximum number of batches running at the same time
+
+    Example:
+        loader = asset_loader(client.assets())
+        futures = [loader.load(asset_id) for asset_id in asset_ids]
+        assets = [future.result() for future in futures]
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFunction,
+        max_batch_size: int = 250,
+        wait: float = 0.005,
+        cache: bool = True,
+        workers: int = 4,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.wait = wait
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._futures: Dict[K, Future] = {}
+        self._pending: Dict[K, Future] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pythonik-loader")
+
+    def load(self, key: K) -> Future:
+        """Request a key, returning a Future resolving to its value"""
+        with self._lock:
+            source = self._futures.get(key) or self._pending.get(key)
+            if source is None:
+                source = Future()
+                self._pending[key] = source
+                if self.cache:
+                    self._futures[key] = source
+                if len(self._pending) >= self.max_batch_size:
+                    self._dispatch_locked()
+                elif self._timer is None:
+                    self._timer = threading.Timer(self.wait, self.dispatch)
+                    self._timer.daemon = True
+                    self._timer.start()
+        return self._follow(source)
+
+    @staticmethod
+    def _follow(source: Future) -> Future:
+        """A Future of the caller, resolved like the shared future of the key"""
+        future = Future()
+
+        def resolve(source: Future):
+            # False when the caller cancelled its future
+            if not future.set_running_or_notify_cancel():
+                return
+            error = source.exception()
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(source.result())
+
+        source.add_done_callback(resolve)
+        return future
+
+    def load_many(self, keys: Iterable[K]) -> List[Future]:
+        """Request several keys, returning one Future per key"""
+        return [self.load(key) for key in keys]
+
+    def get(self, key: K) -> Optional[V]:
+        """Request a key and wait for its value"""
+        return self.load(key).result()
+
+    def dispatch(self):
+        """Send the pending keys now instead of waiting for the window to close"""
+        with self._lock:
+            self._dispatch_locked()
+
+    def _dispatch_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            self._executor.submit(self._run, batch)
+
+    def _run(self, batch: Dict[K, Future]):
+        try:
+            values = self.batch_fn(list(batch))
+            results = {key: values.get(key) for key in batch}
+        except BaseException as e:
+            # resolve every future, nothing may be left waiting forever
+            with self._lock:
+                for key in batch:
+                    self._futures.pop(key, None)
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results[key])
+
+    def clear(self, key: Optional[K] = None):
+        """Forget the cached value of key, or of every key"""
+        with self._lock:
+            if key is None:
+                self._futures.clear()
+            else:
+                self._futures.pop(key, None)
+
+    def close(self):
+        """Dispatch the pending keys and wait for the running batches"""
+        self.dispatch()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncBatchLoader(Generic[K, V]):
+    """
+    asyncio counterpart of :class:`BatchLoader`.
+
+    Keys requested during the same event-loop tick, for instance by
+    coroutines gathered together, are resolved with a single awaited call to
+    ``batch_fn``. Every call returns its own future, so a caller cancelled
+    while waiting, e.g. by ``asyncio.wait_for``, does not cancel the lookup
+    for the other callers of the same key.
+
+    Args:
+        batch_fn: Coroutine resolving a list of keys into a mapping of key to value
+        max_batch_size: Maximum number of keys passed to batch_fn at once
+        cache: Whether to remember the result of each key
+
+    Example:
+        loader = asset_loader(client.assets())
+        assets = await asyncio.gather(*(loader.load(i) for i in asset_ids))
+    """
+
+    def __init__(
+        self,
+        batch_fn: AsyncBatchFunction,
+        max_batch_size: int = 250,
+        cache: bool = True,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.cache = cache
+        self._futures: Dict[K, asyncio.Future] = {}
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._scheduled = False
+        # running batches, referenced so they are not garbage collected
+        self._tasks: Set["asyncio.Task"] = set()
+
+    def load(self, key: K) -> "asyncio.Future":
+        """Request a key, returning an awaitable resolving to its value"""
+        loop = asyncio.get_running_loop()
+        source = self._futures.get(key) or self._pending.get(key)
+        if source is not None and source.cancelled():
+            self._futures.pop(key, None)
+            source = None
+        if source is None:
+            source = loop.create_future()
+            self._pending[key] = source
+            if self.cache:
+                self._futures[key] = source
+            if len(self._pending) >= self.max_batch_size:
+                self.dispatch()
+            elif not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self.dispatch)
+        return self._follow(source, loop)
+
+    @staticmethod
+    def _follow(source: "asyncio.Future", loop: asyncio.AbstractEventLoop) -> "asyncio.Future":
+        """A future of the caller, resolved like the shared future of the key"""
+        future = loop.create_future()
+
+        def resolve(source: "asyncio.Future"):
+            if future.done():
+                # cancelled by its caller
+                return
+            if source.cancelled():
+                future.cancel()
+            elif source.exception() is not None:
+                future.set_exception(source.exception())
+            else:
+                future.set_result(source.result())
+
+        source.add_done_callback(resolve)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        """Request several keys and wait for their values"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def dispatch(self):
+        """Send the pending keys now instead of waiting for the next tick"""
+        self._scheduled = False
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[K, "asyncio.Future"]):
+        try:
+            values = await self.batch_fn(list(batch))
+            results = {key: values.get(key) for key in batch}
+        except BaseException as e:
+            # resolve every future, nothing may be left waiting forever
+            for key, future in batch.items():
+                self._futures.pop(key, None)
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results[key])
+
+    def clear(self, key: Optional[K] = None):
+        """Forget the cached value of key, or of every key"""
+        if key is None:
+            self._futures.clear()
+        else:
+            self._futures.pop(key, None)
+
+
+def asset_loader(assets, **kwargs):
+    """
+    Loader batching asset lookups by id through :meth:`AssetSpec.get_many`.
+
+    Args:
+        assets: AssetSpec or AsyncAssetSpec
+        **kwargs: Loader options, e.g. ``max_batch_size`` or ``wait``
+
+    Returns:
+        BatchLoader, or AsyncBatchLoader for an async spec, resolving asset
+        ids to Asset (None when the asset does not exist)
+    """
+    if isinstance(assets, AsyncSpec):
+        return AsyncBatchLoader(assets.get_many, **kwargs)
+    return BatchLoader(assets.get_many, **kwargs)
+
+
+def _metadata_value(resp):
+    # a view without metadata is reported as a 404
+    if resp.response.status_code == 404:
+        return None
+    resp.response.raise_for_status()
+    return resp.data
+
+
+def metadata_loader(metadata, workers: int = 8, **kwargs):
+    """
+    Loader batching asset metadata lookups keyed by ``(asset_id, view_id)``.
+
+    Iconik has no bulk metadata read, so each batch is deduplicated and
+    fanned out with at most ``workers`` concurrent requests.
+
+    Args:
+        metadata: MetadataSpec or AsyncMetadataSpec
+        workers: Maximum number of concurrent requests per batch
+        **kwargs: Loader options, e.g. ``max_batch_size`` or ``wait``
+
+    Returns:
+        BatchLoader, or AsyncBatchLoader for an async spec, resolving keys to
+        ViewMetadata (None when the view has no metadata for the asset)
+    """
+    if isinstance(metadata, AsyncSpec):
+
+        async def abatch(keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Any]:
+            limit = asyncio.Semaphore(workers)
+
+            async def fetch(key):
+                async with limit:
+                    return _metadata_value(await metadata.get_asset_metadata(*key))
+
+            return dict(zip(keys, await asyncio.gather(*(fetch(key) for key in keys))))
+
+        return AsyncBatchLoader(abatch, **kwargs)
+
+    def batch(keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Any]:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            responses = executor.map(lambda key: metadata.get_asset_metadata(*key), keys)
+            return {key: _metadata_value(resp) for key, resp in zip(keys, responses)}
+
+    return BatchLoader(batch, **kwargs)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import List, Optional, Union
+
+from pydantic import BaseModel
+
+from pythonik.models.files.file import File, FileSet
+from pythonik.models.files.format import Format
+from pythonik.models.files.keyframe import Keyframe
+from pythonik.models.files.proxy import Proxy
+
+
+class AssetBundle(BaseModel):
+    """
+    Formats (with their components), file sets, files, proxies and keyframes
+    of an asset, or of one version of it, as returned by
+    ``FilesSpec.get_asset_bundle``.
+
+    Files link to their file set and format through ``file_set_id`` and
+    ``format_id``, file sets to their format through ``format_id``. The
+    ``*_of`` helpers follow these links.
+    """
+
+    asset_id: str
+    version_id: Optional[str] = None
+    formats: List[Format] = []
+    file_sets: List[FileSet] = []
+    files: List[File] = []
+    proxies: List[Proxy] = []
+    keyframes: List[Keyframe] = []
+
+    def get_format(self, format_id: str) -> Optional[Format]:
+        return next((fmt for fmt in self.formats if fmt.id == format_id), None)
+
+    def get_file_set(self, file_set_id: str) -> Optional[FileSet]:
+        return next((file_set for file_set in self.file_sets if file_set.id == file_set_id), None)
+
+    def file_set_of(self, file: File) -> Optional[FileSet]:
+        """File set the file belongs to"""
+        return self.get_file_set(file.file_set_id)
+
+    def format_of(self, obj: Union[File, FileSet]) -> Optional[Format]:
+        """Format a file or a file set belongs to"""
+        return self.get_format(obj.format_id)
+
+    def file_sets_of(self, format_id: str) -> List[FileSet]:
+        """File sets of a format"""
+        return [file_set for file_set in self.file_sets if file_set.format_id == format_id]
+
+    def files_of(self, file_set_id: str) -> List[File]:
+        """Files of a file set"""
+        return [file for file in self.files if file.file_set_id == file_set_id]
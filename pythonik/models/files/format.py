@@ -9,7 +9,7 @@ from pythonik.models.base import Status, ArchiveStatus, PaginatedResponse
 
 class Component(BaseModel):
     id: Optional[str] = ""
-    metadata: Optional[dict]
+    metadata: Optional[dict] = None
     name: Optional[str] = ""
     type: Optional[str] = ""
 
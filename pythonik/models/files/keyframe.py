@@ -35,6 +35,7 @@ class Keyframe(BaseModel):
     id: Optional[str] = ""
     is_custom_keyframe: Optional[bool] = None
     is_public: Optional[bool] = None
+    multipart_upload_url: Optional[str] = ""
     name: Optional[str] = ""
     resolution: Optional[Resolution] = {}
     rotation: Optional[int] = None
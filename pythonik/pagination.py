@@ -0,0 +1,437 @@
+import asyncio
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional, Sequence
+
+from pythonik.models.base import Response
+
+# A page fetcher receives the cursor returned by the previous page (None for
+# the first page) and returns the parsed Response for that page.
+PageFetcher = Callable[[Optional[Any]], Response]
+AsyncPageFetcher = Callable[[Optional[Any]], Awaitable[Response]]
+# Given the data of a page, return the cursor of the next one or None when done.
+NextCursor = Callable[[Any], Optional[Any]]
+# Fetches a page by its 1-based page number.
+PageNumberFetcher = Callable[[int], Response]
+AsyncPageNumberFetcher = Callable[[int], Awaitable[Response]]
+
+# how often a blocked prefetch worker checks whether its consumer went away
+_STOP_POLL_INTERVAL = 0.1
+
+
+def next_url_cursor(data) -> Optional[str]:
+    """Cursor strategy for listings that link to their next page with next_url"""
+    if data is None:
+        return None
+    return data.next_url or None
+
+
+def scroll_id_cursor(data) -> Optional[str]:
+    """Cursor strategy for scroll listings, which end with an empty page"""
+    if data is None or not data.objects:
+        return None
+    return data.scroll_id or None
+
+
+def search_after_cursor(data) -> Optional[list]:
+    """Cursor strategy for search_after pagination: the ``_sort`` of the last hit"""
+    if data is None or not data.objects:
+        return None
+    return data.objects[-1].sort or None
+
+
+def iter_pages(fetch_page: PageFetcher, next_cursor: NextCursor) -> Iterator[Response]:
+    """
+    Lazily walk a paginated listing, one page at a time.
+
+    The next page is only requested once the caller asks for it, so only one
+    page is held in memory at a time.
+
+    Args:
+        fetch_page: Fetches the page for a cursor (None for the first page)
+        next_cursor: Returns the cursor of the page after the given page data
+
+    Raises:
+        requests.HTTPError: If a page request fails
+    """
+    cursor = None
+    while True:
+        page = fetch_page(cursor)
+        page.response.raise_for_status()
+        yield page
+        cursor = next_cursor(page.data)
+        if cursor is None:
+            return
+
+
+async def aiter_pages(
+    fetch_page: AsyncPageFetcher, next_cursor: NextCursor
+) -> AsyncIterator[Response]:
+    """asyncio counterpart of :func:`iter_pages`"""
+    cursor = None
+    while True:
+        page = await fetch_page(cursor)
+        page.response.raise_for_status()
+        yield page
+        cursor = next_cursor(page.data)
+        if cursor is None:
+            return
+
+
+class _Done:
+    pass
+
+
+class _Failed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetch_pages(
+    fetch_page: PageFetcher, next_cursor: NextCursor, depth: int = 1
+) -> Iterator[Response]:
+    """
+    Walk a paginated listing like :func:`iter_pages`, fetching up to ``depth``
+    pages ahead on a background thread while the caller processes the
+    current one.
+
+    At most ``depth`` fetched-but-unconsumed pages exist at any time, so
+    memory stays bounded however long the listing is. Closing the iterator
+    (or abandoning it) stops the worker after its in-flight request.
+
+    Args:
+        fetch_page: Fetches the page for a cursor (None for the first page)
+        next_cursor: Returns the cursor of the page after the given page data
+        depth: Number of pages to read ahead
+
+    Raises:
+        ValueError: If depth is lower than 1
+        requests.HTTPError: If a page request fails
+    """
+    if depth < 1:
+        raise ValueError("depth must be at least 1")
+    return _prefetch_pages(fetch_page, next_cursor, depth)
+
+
+def _prefetch_pages(fetch_page, next_cursor, depth):
+    pages = queue.Queue()
+    slots = threading.Semaphore(depth)
+    stop = threading.Event()
+
+    def worker():
+        walker = iter_pages(fetch_page, next_cursor)
+        while True:
+            while not slots.acquire(timeout=_STOP_POLL_INTERVAL):
+                if stop.is_set():
+                    return
+            if stop.is_set():
+                return
+            try:
+                pages.put(next(walker))
+            except StopIteration:
+                pages.put(_Done())
+                return
+            except Exception as e:
+                pages.put(_Failed(e))
+                return
+
+    thread = threading.Thread(target=worker, name="pythonik-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = pages.get()
+            slots.release()
+            if isinstance(item, _Done):
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+
+
+def aprefetch_pages(
+    fetch_page: AsyncPageFetcher, next_cursor: NextCursor, depth: int = 1
+) -> AsyncIterator[Response]:
+    """asyncio counterpart of :func:`prefetch_pages`, reading ahead on a task"""
+    if depth < 1:
+        raise ValueError("depth must be at least 1")
+    return _aprefetch_pages(fetch_page, next_cursor, depth)
+
+
+async def _aprefetch_pages(fetch_page, next_cursor, depth):
+    pages = asyncio.Queue()
+    slots = asyncio.Semaphore(depth)
+
+    async def worker():
+        walker = aiter_pages(fetch_page, next_cursor)
+        while True:
+            await slots.acquire()
+            try:
+                pages.put_nowait(await walker.__anext__())
+            except StopAsyncIteration:
+                pages.put_nowait(_Done())
+                return
+            except Exception as e:
+                pages.put_nowait(_Failed(e))
+                return
+
+    task = asyncio.ensure_future(worker())
+    try:
+        while True:
+            item = await pages.get()
+            slots.release()
+            if isinstance(item, _Done):
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+    finally:
+        task.cancel()
+
+
+def walk_pages(
+    fetch_page: PageFetcher, next_cursor: NextCursor, prefetch: int = 0
+) -> Iterator[Response]:
+    """:func:`iter_pages`, or :func:`prefetch_pages` when prefetch is set"""
+    if prefetch:
+        return prefetch_pages(fetch_page, next_cursor, prefetch)
+    return iter_pages(fetch_page, next_cursor)
+
+
+def awalk_pages(
+    fetch_page: AsyncPageFetcher, next_cursor: NextCursor, prefetch: int = 0
+) -> AsyncIterator[Response]:
+    """:func:`aiter_pages`, or :func:`aprefetch_pages` when prefetch is set"""
+    if prefetch:
+        return aprefetch_pages(fetch_page, next_cursor, prefetch)
+    return aiter_pages(fetch_page, next_cursor)
+
+
+def fan_out_pages(fetch_page_number: PageNumberFetcher, parallel: int) -> Iterator[Response]:
+    """
+    Walk a page-number listing, fetching the remaining pages concurrently.
+
+    Page 1 is fetched first to learn the page count (``pages``), then up to
+    ``parallel`` of the remaining pages are in flight at any time. Pages are
+    yielded in page order, so at most ``parallel + 1`` pages are held in
+    memory. If the listing does not report its page count, the following
+    pages are fetched one by one until one has no ``next_url``.
+
+    Args:
+        fetch_page_number: Fetches a page by its 1-based page number
+        parallel: Maximum number of concurrent page requests
+
+    Raises:
+        ValueError: If parallel is lower than 1
+        requests.HTTPError: If a page request fails
+    """
+    if parallel < 1:
+        raise ValueError("parallel must be at least 1")
+    return _fan_out_pages(fetch_page_number, parallel)
+
+
+def _fan_out_pages(fetch_page_number, parallel):
+    page = fetch_page_number(1)
+    page.response.raise_for_status()
+    yield page
+    if page.data is None:
+        return
+    if page.data.pages is None:
+        number = 1
+        while next_url_cursor(page.data) is not None:
+            number += 1
+            page = fetch_page_number(number)
+            page.response.raise_for_status()
+            yield page
+        return
+
+    numbers = iter(range(2, page.data.pages + 1))
+    executor = ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="pythonik-page")
+    pending = deque()
+    try:
+        for number in numbers:
+            pending.append(executor.submit(fetch_page_number, number))
+            if len(pending) == parallel:
+                break
+        while pending:
+            page = pending.popleft().result()
+            number = next(numbers, None)
+            if number is not None:
+                pending.append(executor.submit(fetch_page_number, number))
+            page.response.raise_for_status()
+            yield page
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def afan_out_pages(
+    fetch_page_number: AsyncPageNumberFetcher, parallel: int
+) -> AsyncIterator[Response]:
+    """asyncio counterpart of :func:`fan_out_pages`"""
+    if parallel < 1:
+        raise ValueError("parallel must be at least 1")
+    return _afan_out_pages(fetch_page_number, parallel)
+
+
+async def _afan_out_pages(fetch_page_number, parallel):
+    page = await fetch_page_number(1)
+    page.response.raise_for_status()
+    yield page
+    if page.data is None:
+        return
+    if page.data.pages is None:
+        number = 1
+        while next_url_cursor(page.data) is not None:
+            number += 1
+            page = await fetch_page_number(number)
+            page.response.raise_for_status()
+            yield page
+        return
+
+    numbers = iter(range(2, page.data.pages + 1))
+    pending = deque()
+    try:
+        for number in numbers:
+            pending.append(asyncio.ensure_future(fetch_page_number(number)))
+            if len(pending) == parallel:
+                break
+        while pending:
+            page = await pending.popleft()
+            number = next(numbers, None)
+            if number is not None:
+                pending.append(asyncio.ensure_future(fetch_page_number(number)))
+            page.response.raise_for_status()
+            yield page
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def merge_iterators(
+    factories: Sequence[Callable[[], Iterator[Any]]], workers: int, buffer: int = 16
+) -> Iterator[Any]:
+    """
+    Consume several iterators concurrently and yield their items as they arrive.
+
+    Each factory is called on one of ``workers`` threads and its iterator is
+    drained into a queue holding at most ``buffer`` items, so a slow consumer
+    applies back-pressure instead of accumulating results. The first error
+    raised by any iterator stops the others and is re-raised to the caller.
+
+    Args:
+        factories: Callables returning the iterators to merge
+        workers: Maximum number of iterators consumed at the same time
+        buffer: Maximum number of produced but unconsumed items
+
+    Raises:
+        ValueError: If workers is lower than 1
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    return _merge_iterators(list(factories), workers, buffer)
+
+
+def _merge_iterators(factories, workers, buffer):
+    if not factories:
+        return
+    todo = queue.Queue()
+    for factory in factories:
+        todo.put(factory)
+    items = queue.Queue(maxsize=buffer)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=_STOP_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker():
+        try:
+            while not stop.is_set():
+                try:
+                    factory = todo.get_nowait()
+                except queue.Empty:
+                    break
+                for item in factory():
+                    if not put(item):
+                        return
+        except Exception as e:
+            stop.set()
+            # the consumer may be blocked on get, make room for the failure
+            while True:
+                try:
+                    items.put_nowait(_Failed(e))
+                    return
+                except queue.Full:
+                    try:
+                        items.get_nowait()
+                    except queue.Empty:
+                        pass
+        put(_Done())
+
+    threads = [
+        threading.Thread(target=worker, name=f"pythonik-merge-{i}", daemon=True)
+        for i in range(min(workers, len(factories)))
+    ]
+    for thread in threads:
+        thread.start()
+    running = len(threads)
+    try:
+        while running:
+            item = items.get()
+            if isinstance(item, _Done):
+                running -= 1
+            elif isinstance(item, _Failed):
+                raise item.error
+            else:
+                yield item
+    finally:
+        stop.set()
+
+
+def amerge_iterators(
+    factories: Sequence[Callable[[], AsyncIterator[Any]]], workers: int, buffer: int = 16
+) -> AsyncIterator[Any]:
+    """asyncio counterpart of :func:`merge_iterators`, consuming on tasks"""
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    return _amerge_iterators(list(factories), workers, buffer)
+
+
+async def _amerge_iterators(factories, workers, buffer):
+    if not factories:
+        return
+    todo = deque(factories)
+    items = asyncio.Queue(maxsize=buffer)
+
+    async def worker():
+        try:
+            while todo:
+                async for item in todo.popleft()():
+                    await items.put(item)
+        except Exception as e:
+            await items.put(_Failed(e))
+            return
+        await items.put(_Done())
+
+    tasks = [asyncio.ensure_future(worker()) for _ in range(min(workers, len(factories)))]
+    running = len(tasks)
+    try:
+        while running:
+            item = await items.get()
+            if isinstance(item, _Done):
+                running -= 1
+            elif isinstance(item, _Failed):
+                raise item.error
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
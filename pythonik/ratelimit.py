@@ -0,0 +1,358 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+THROTTLED_STATUS = 429
+READ_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+# a shared bucket paused for longer than this is considered stale
+MAX_PAUSE = 3600.0
+
+# magic, tokens, updated, rate
+_SHARED_STATE = struct.Struct("<4sddd")
+_SHARED_MAGIC = b"PKB1"
+
+# builds the bucket of a budget: (name, rate, capacity) -> bucket
+BucketFactory = Callable[[str, float, Optional[float]], "TokenBucket"]
+
+
+def endpoint_family(method: str, url: str) -> Tuple[str, str]:
+    """
+    Return the (service, kind) of a request, e.g. ``("search", "write")`` for
+    ``POST /API/search/v1/search/``. kind is ``read`` for GET/HEAD/OPTIONS
+    requests and ``write`` otherwise.
+    """
+    parts = urlparse(url).path.split("/")
+    service = parts[2] if len(parts) > 2 and parts[1] == "API" else "default"
+    return service, "read" if method.upper() in READ_METHODS else "write"
+
+
+def retry_after(response) -> Optional[float]:
+    """Seconds to wait according to the Retry-After header, if any"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _BucketState:
+    __slots__ = ("tokens", "updated", "rate")
+
+    def __init__(self, tokens: float, updated: float, rate: float):
+        self.tokens = tokens
+        self.updated = updated
+        self.rate = rate
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing ``rate`` requests per second with
+    bursts of up to ``capacity`` requests.
+
+    :meth:`reserve` never blocks: it takes a token, letting the balance go
+    negative, and returns how long the caller must wait before using it. So
+    the same bucket can pace threads (``time.sleep``) and coroutines
+    (``asyncio.sleep``), and concurrent callers are served in order.
+
+    The rate adapts to throttling: :meth:`throttle` pauses the bucket and
+    halves its rate (down to ``min_rate``), then every :meth:`succeed` adds
+    back a twentieth of the configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = _BucketState(self.capacity, clock(), rate)
+
+    @contextmanager
+    def _locked(self) -> Iterator[_BucketState]:
+        """Hold the bucket state for a read-modify-write"""
+        with self._lock:
+            yield self._state
+
+    @property
+    def rate(self) -> float:
+        """Current rate in requests per second"""
+        with self._locked() as state:
+            return state.rate
+
+    def _refill(self, state: _BucketState, now: float):
+        # updated is in the future while the bucket is paused
+        if now > state.updated:
+            state.tokens = min(self.capacity, state.tokens + (now - state.updated) * state.rate)
+            state.updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens and return the number of seconds to wait before using them"""
+        with self._locked() as state:
+            now = self._clock()
+            self._refill(state, now)
+            state.tokens -= tokens
+            return max(0.0, state.updated - now) + max(0.0, -state.tokens) / state.rate
+
+    def acquire(self, tokens: float = 1.0):
+        """Take tokens, sleeping until they are available"""
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    def throttle(self, pause: float, adapt: bool = True):
+        """Pause the bucket for ``pause`` seconds and, if adapt, halve its rate"""
+        with self._locked() as state:
+            now = self._clock()
+            self._refill(state, now)
+            if adapt:
+                state.rate = max(self.min_rate, state.rate / 2)
+            state.tokens = min(state.tokens, 0.0)
+            state.updated = max(state.updated, now + pause)
+
+    def succeed(self):
+        """Record a request that was not throttled, recovering the rate"""
+        with self._locked() as state:
+            if state.rate < self.max_rate:
+                self._refill(state, self._clock())
+                state.rate = min(self.max_rate, state.rate + self.max_rate / 20)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    :class:`TokenBucket` whose state lives in a memory-mapped file, so every
+    process of the host opening the same ``path`` draws from one budget.
+
+    Updates are serialized with an exclusive ``flock`` on the file, held only
+    while the few bytes of state are read and written back. No external
+    service is involved; the file is created on first use and can live on
+    any local filesystem (``/dev/shm`` or ``/run`` avoid disk writes).
+
+    The processes should be configured with the same rate and capacity.
+    Timing relies on ``time.monotonic``, which is shared by the processes of
+    a host but not across hosts, so the file must not be on a network share.
+    POSIX only.
+
+    Args:
+        path: State file shared by the processes
+        rate: Requests per second
+        capacity: Maximum burst, defaults to one second worth of requests
+        min_rate: Lowest rate reached when adapting to throttling
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        rate: float,
+        capacity: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if fcntl is None:  # pragma: no cover - depends on the platform
+            raise OSError("SharedTokenBucket requires fcntl, which is not available on this platform")
+        super().__init__(rate, capacity, min_rate, clock)
+        self.path = os.fspath(path)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(self._fd).st_size < _SHARED_STATE.size:
+                    os.ftruncate(self._fd, _SHARED_STATE.size)
+                self._map = mmap.mmap(self._fd, _SHARED_STATE.size)
+                magic, *_ = _SHARED_STATE.unpack_from(self._map)
+                if magic != _SHARED_MAGIC:
+                    self._write(self._state)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def _write(self, state: _BucketState):
+        _SHARED_STATE.pack_into(self._map, 0, _SHARED_MAGIC, state.tokens, state.updated, state.rate)
+
+    @contextmanager
+    def _locked(self) -> Iterator[_BucketState]:
+        # flock does not exclude threads sharing the descriptor, hence the thread lock
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                _, tokens, updated, rate = _SHARED_STATE.unpack_from(self._map)
+                now = self._clock()
+                if updated > now + MAX_PAUSE:
+                    # written before a reboot reset the monotonic clock
+                    tokens, updated = self.capacity, now
+                state = _BucketState(tokens, updated, min(max(rate, self.min_rate), self.max_rate))
+                yield state
+                self._write(state)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        """Release the state file, other processes keep using it"""
+        if self._fd is not None:
+            self._map.close()
+            os.close(self._fd)
+            self._fd = None
+
+
+class SharedBuckets:
+    """
+    Bucket factory for :class:`RateLimiter` storing every bucket in a
+    :class:`SharedTokenBucket` file under ``directory``, one file per budget.
+
+    Example:
+        limiter = RateLimiter(rate=40, budgets={"search": 5}, bucket_factory=SharedBuckets("/run/pythonik"))
+    """
+
+    def __init__(self, directory: Union[str, "os.PathLike[str]"]):
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __call__(self, name: str, rate: float, capacity: Optional[float] = None) -> SharedTokenBucket:
+        return SharedTokenBucket(os.path.join(self.directory, f"{name}.bucket"), rate, capacity)
+
+
+class RateLimiter:
+    """
+    Client-side request budget shared by every spec of a client.
+
+    Requests draw from a global bucket (``rate`` requests per second) and
+    from the budget of their endpoint family. Families are named after the
+    API service, optionally split by kind: ``"search"`` applies to every
+    search request, ``"metadata.write"`` only to metadata requests that are
+    not GET/HEAD/OPTIONS. Both a service and a service.kind budget can apply
+    to the same request.
+
+    A 429 response pauses the buckets the request used for the time given by
+    Retry-After (or an exponential backoff), halves their rate and retries
+    the request, up to ``max_retries`` times. The rate then creeps back up
+    as requests succeed, so the client settles just under the server limit.
+
+    Args:
+        rate: Global requests per second, None for no global limit
+        burst: Global bucket capacity, defaults to one second worth of requests
+        budgets: Requests per second by endpoint family, e.g.
+            ``{"search": 5, "metadata.write": 10}``
+        max_retries: Number of times a throttled request is retried
+        adaptive: Whether to lower the rates after a 429
+        backoff: Base delay in seconds when a 429 has no Retry-After header
+        bucket_factory: Builds the bucket of each budget from its name
+            (``"global"`` or the family), rate and capacity. Defaults to
+            in-process :class:`TokenBucket`; pass :class:`SharedBuckets` to
+            share the budgets between the processes of a host.
+
+    Example:
+        limiter = RateLimiter(rate=40, budgets={"search": 5, "metadata.write": 10})
+        client = PythonikClient(app_id, auth_token, timeout=10, rate_limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        budgets: Optional[Dict[str, float]] = None,
+        max_retries: int = 5,
+        adaptive: bool = True,
+        backoff: float = 1.0,
+        bucket_factory: Optional[BucketFactory] = None,
+    ):
+        make_bucket = bucket_factory or (lambda name, rate, capacity: TokenBucket(rate, capacity))
+        self.global_bucket = make_bucket("global", rate, burst) if rate else None
+        self.budgets = {
+            family: make_bucket(family, value, None) for family, value in (budgets or {}).items()
+        }
+        self.max_retries = max_retries
+        self.adaptive = adaptive
+        self.backoff = backoff
+        self._paused: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def buckets(self, method: str, url: str) -> List[TokenBucket]:
+        """The buckets a request draws from"""
+        service, kind = endpoint_family(method, url)
+        buckets = [self.global_bucket] if self.global_bucket else []
+        for family in (service, f"{service}.{kind}"):
+            if family in self.budgets:
+                buckets.append(self.budgets[family])
+        return buckets
+
+    def reserve(self, method: str, url: str) -> float:
+        """Take a token for a request and return the number of seconds to wait"""
+        wait = max([bucket.reserve() for bucket in self.buckets(method, url)], default=0.0)
+        paused_until = self._paused.get(endpoint_family(method, url)[0])
+        if paused_until:
+            wait = max(wait, paused_until - time.monotonic())
+        return wait
+
+    def acquire(self, method: str, url: str):
+        """Wait until a request may be sent"""
+        wait = self.reserve(method, url)
+        if wait > 0:
+            time.sleep(wait)
+
+    def should_retry(self, method: str, url: str, response, attempt: int) -> bool:
+        """
+        Record the outcome of a request and tell whether it must be retried.
+
+        A throttled request pauses the buckets it used (and its service, so
+        requests drawing from no bucket wait too); the wait happens in the
+        next :meth:`reserve`.
+
+        Args:
+            method: HTTP method of the request
+            url: URL of the request
+            response: The response, anything with status_code and headers
+            attempt: Number of retries already made for this request
+        """
+        buckets = self.buckets(method, url)
+        if response.status_code != THROTTLED_STATUS:
+            for bucket in buckets:
+                bucket.succeed()
+            return False
+
+        pause = retry_after(response)
+        if pause is None:
+            pause = self.backoff * 2 ** attempt
+        for bucket in buckets:
+            bucket.throttle(pause, adapt=self.adaptive)
+        service = endpoint_family(method, url)[0]
+        with self._lock:
+            until = time.monotonic() + pause
+            self._paused[service] = max(self._paused.get(service, 0.0), until)
+        return attempt < self.max_retries
+
+    def close(self):
+        """Release the resources held by the buckets, e.g. shared state files"""
+        for bucket in [self.global_bucket, *self.budgets.values()]:
+            close = getattr(bucket, "close", None)
+            if close is not None:
+                close()
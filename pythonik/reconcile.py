@@ -0,0 +1,288 @@
+import json
+import os
+import posixpath
+import shutil
+import tempfile
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from pythonik.models.base import FileType
+from pythonik.models.files.file import File
+from pythonik.uploads import PathLike
+
+# kinds of Difference
+MISSING = "missing"
+EXTRA = "extra"
+CHANGED = "changed"
+
+LOCAL = "local"
+REMOTE = "remote"
+
+DEFAULT_PARTITIONS = 64
+DEFAULT_SCAN_WORKERS = 8
+# filesystems and the API round modification times differently
+DEFAULT_MTIME_TOLERANCE = 1.0
+
+
+class FileEntry(NamedTuple):
+    """
+    A file to reconcile, local or registered in Iconik.
+
+    ``path`` is relative to the storage root and ``/`` separated, ``mtime``
+    is a POSIX timestamp. ``file_id`` is the Iconik file ID of remote entries.
+    """
+
+    path: str
+    size: Optional[int]
+    mtime: Optional[float]
+    file_id: Optional[str] = None
+
+
+class Difference(NamedTuple):
+    """
+    A path on which the local tree and Iconik disagree.
+
+    ``missing``: the file is on disk but not registered in Iconik.
+    ``extra``: the file is registered in Iconik but not on disk.
+    ``changed``: both have the file, with a different size or modification time.
+    """
+
+    kind: str
+    path: str
+    local: Optional[FileEntry]
+    remote: Optional[FileEntry]
+
+
+def _scan_directory(
+    root: str, relative: str, follow_symlinks: bool
+) -> Tuple[List[FileEntry], List[str], List[OSError]]:
+    """
+    Regular files and subdirectories (relative to root) of one directory,
+    and the errors of the entries that could not be stat'ed
+    """
+    files, subdirs, errors = [], [], []
+    with os.scandir(os.path.join(root, relative)) as it:
+        for entry in it:
+            path = posixpath.join(relative, entry.name) if relative else entry.name
+            # an entry removed or changed during the listing is skipped on its
+            # own, not with the rest of the directory
+            try:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    subdirs.append(path)
+                elif entry.is_file(follow_symlinks=follow_symlinks):
+                    stat = entry.stat(follow_symlinks=follow_symlinks)
+                    files.append(FileEntry(path, stat.st_size, stat.st_mtime))
+            except OSError as e:
+                errors.append(e)
+    return files, subdirs, errors
+
+
+def scan_tree(
+    root: PathLike,
+    workers: int = DEFAULT_SCAN_WORKERS,
+    follow_symlinks: bool = False,
+    onerror: Optional[Callable[[OSError], None]] = None,
+) -> Iterator[FileEntry]:
+    """
+    Yield every regular file under root, listing up to ``workers``
+    directories at the same time.
+
+    Directory listings are dominated by metadata round trips on network
+    filesystems, so listing several directories concurrently is much faster
+    than ``os.walk``. Files are yielded as their directory is listed, in no
+    particular order, and only the directories waiting to be listed are held
+    in memory.
+
+    Args:
+        root: Directory to walk, the root of the storage
+        workers: Maximum number of directories listed concurrently
+        follow_symlinks: Follow symbolic links to files and directories
+        onerror: Called with the OSError of a directory that cannot be
+            listed, which is skipped with its subtree, or of an entry that
+            cannot be stat'ed, e.g. a file removed during the scan, which is
+            skipped alone. By default errors are ignored, like ``os.walk``.
+
+    Returns:
+        Iterator of FileEntry with ``/`` separated paths relative to root
+    """
+    root = os.fspath(root)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pythonik-scan")
+    pending = {executor.submit(_scan_directory, root, "", follow_symlinks)}
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    files, subdirs, errors = future.result()
+                except OSError as e:
+                    if onerror is not None:
+                        onerror(e)
+                    continue
+                if onerror is not None:
+                    for error in errors:
+                        onerror(error)
+                for subdir in subdirs:
+                    pending.add(executor.submit(_scan_directory, root, subdir, follow_symlinks))
+                yield from files
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    """POSIX timestamp of an ISO 8601 date of the API, naive dates being UTC"""
+    if not value:
+        return None
+    try:
+        date = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
+
+
+def storage_file_entry(file: File) -> Optional[FileEntry]:
+    """The FileEntry of a storage file listed by Iconik, None for directories and links"""
+    if file.type and file.type != FileType.FILE:
+        return None
+    path = posixpath.join(file.directory_path or "", file.name or "").lstrip("/")
+    size = file.size if isinstance(file.size, int) else None
+    return FileEntry(path, size, _timestamp(file.file_date_modified), file.id or None)
+
+
+def _differs(local: FileEntry, remote: FileEntry, mtime_tolerance: float) -> bool:
+    if local.size is not None and remote.size is not None and local.size != remote.size:
+        return True
+    if local.mtime is not None and remote.mtime is not None:
+        return abs(local.mtime - remote.mtime) > mtime_tolerance
+    return False
+
+
+class PartitionedJoin:
+    """
+    Join of the local and remote entries on their path, with bounded memory.
+
+    Entries are spilled to ``partitions`` files per side in a temporary
+    directory, by hash of their path (a Grace hash join). Each partition is
+    then joined on its own, so memory is bounded by the largest partition
+    rather than the whole tree: with the default 64 partitions, 20 million
+    files use about the memory of 300,000.
+
+    The two sides are written to different files, so one thread can add the
+    local entries while another adds the remote ones.
+
+    Args:
+        partitions: Number of partitions, raise it for larger trees
+        directory: Where to create the temporary directory, by default the
+            system temporary directory
+    """
+
+    def __init__(self, partitions: int = DEFAULT_PARTITIONS, directory: Optional[PathLike] = None):
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1")
+        self.partitions = partitions
+        self.directory = tempfile.mkdtemp(prefix="pythonik-reconcile-", dir=directory)
+        self._files = {
+            side: [
+                open(self._path(side, index), "w", encoding="utf-8")
+                for index in range(partitions)
+            ]
+            for side in (LOCAL, REMOTE)
+        }
+
+    def _path(self, side: str, index: int) -> str:
+        return os.path.join(self.directory, f"{side}-{index}.jsonl")
+
+    def _partition(self, path: str) -> int:
+        return zlib.crc32(path.encode("utf-8", "surrogatepass")) % self.partitions
+
+    def add(self, side: str, entries: Iterable[FileEntry]) -> int:
+        """
+        Spill the entries of one side, ``local`` or ``remote``.
+
+        Returns:
+            Number of entries added
+        """
+        files = self._files[side]
+        count = 0
+        for entry in entries:
+            files[self._partition(entry.path)].write(json.dumps(entry) + "\n")
+            count += 1
+        return count
+
+    def _load(self, side: str, index: int) -> Iterator[FileEntry]:
+        with open(self._path(side, index), encoding="utf-8") as f:
+            for line in f:
+                yield FileEntry(*json.loads(line))
+
+    def partition_differences(
+        self, index: int, mtime_tolerance: float = DEFAULT_MTIME_TOLERANCE
+    ) -> List[Difference]:
+        """Differences within one partition, remote entries are indexed by path"""
+        remote = {entry.path: entry for entry in self._load(REMOTE, index)}
+        differences = []
+        for local in self._load(LOCAL, index):
+            other = remote.pop(local.path, None)
+            if other is None:
+                differences.append(Difference(MISSING, local.path, local, None))
+            elif _differs(local, other, mtime_tolerance):
+                differences.append(Difference(CHANGED, local.path, local, other))
+        differences.extend(Difference(EXTRA, path, None, entry) for path, entry in remote.items())
+        return differences
+
+    def flush(self):
+        """Finish writing the partitions, before they are joined"""
+        for files in self._files.values():
+            for f in files:
+                f.close()
+
+    def differences(self, mtime_tolerance: float = DEFAULT_MTIME_TOLERANCE) -> Iterator[Difference]:
+        """Yield the differences of every partition, one partition in memory at a time"""
+        self.flush()
+        for index in range(self.partitions):
+            yield from self.partition_differences(index, mtime_tolerance)
+
+    def close(self):
+        """Remove the spilled partitions"""
+        self.flush()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def reconcile(
+    local: Iterable[FileEntry],
+    remote: Iterable[FileEntry],
+    partitions: int = DEFAULT_PARTITIONS,
+    mtime_tolerance: float = DEFAULT_MTIME_TOLERANCE,
+    directory: Optional[PathLike] = None,
+) -> Iterator[Difference]:
+    """
+    Yield the differences between two streams of entries joined on their
+    path, see :class:`PartitionedJoin`.
+
+    The local entries are spilled on a background thread while the remote
+    ones are read, so a directory scan and an API listing progress together.
+
+    Args:
+        local: Entries on disk, e.g. from :func:`scan_tree`
+        remote: Entries registered in Iconik, e.g. from :func:`storage_file_entry`
+        partitions: Number of partitions the entries are spilled to
+        mtime_tolerance: Seconds two modification times may differ by
+        directory: Where to spill the partitions
+
+    Returns:
+        Iterator of Difference, grouped by partition
+    """
+    with PartitionedJoin(partitions, directory) as join:
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pythonik-reconcile") as executor:
+            local_added = executor.submit(join.add, LOCAL, local)
+            join.add(REMOTE, remote)
+            local_added.result()
+        yield from join.differences(mtime_tolerance)
@@ -1,10 +1,14 @@
-from typing import Union, Dict, Any
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Dict, Any, Iterable, Iterator, List, Sequence, Tuple
 from typing import Optional
 
+from pythonik.hooks import RequestHooks
 from pythonik.models.assets.assets import Asset, AssetCreate, BulkDelete
 from pythonik.models.assets.segments import (
     BulkDeleteSegmentsBody,
     SegmentBody,
+    SegmentDetailResponse,
     SegmentListResponse,
     SegmentResponse,
 )
@@ -19,8 +23,12 @@ from pythonik.models.base import (
     PaginatedResponse,
     HistoryOperationType,
 )
+from pythonik.pagination import scroll_id_cursor
+from pythonik.ratelimit import RateLimiter
+from pythonik.specs.async_base import AsyncSpec
 from pythonik.specs.base import Spec
-from pythonik.specs.collection import CollectionSpec
+from pythonik.specs.collection import AsyncCollectionSpec, CollectionSpec
+from pythonik.specs.search import AsyncSearchSpec, SearchSpec
 
 BASE = "assets"
 DELETE_QUEUE = "delete_queue"
@@ -38,14 +46,32 @@ VERSIONS_FROM_ASSET_URL = BASE + "/{}/versions/from/assets/{}/"
 BULK_DELETE_URL = DELETE_QUEUE + "/bulk/"
 PURGE_ALL_URL = DELETE_QUEUE + "/purge/all/"
 BULK_DELETE_SEGMENTS_URL = SEGMENT_URL + "bulk/"
+# ids resolved by each search request of get_many
+GET_MANY_CHUNK_SIZE = 250
 
 
 class AssetSpec(Spec):
     server = "API/assets/"
 
-    def __init__(self, session, timeout=3, base_url: str = "https://app.iconik.io"):
-        self._collection_spec = CollectionSpec(session=session, timeout=timeout)
-        return super().__init__(session, timeout, base_url)
+    def __init__(
+        self,
+        session,
+        timeout=3,
+        base_url: str = "https://app.iconik.io",
+        hooks: Optional[RequestHooks] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self._collection_spec = CollectionSpec(
+            session=session, timeout=timeout, hooks=hooks, rate_limiter=rate_limiter
+        )
+        self._search_spec = SearchSpec(
+            session=session,
+            timeout=timeout,
+            base_url=base_url,
+            hooks=hooks,
+            rate_limiter=rate_limiter,
+        )
+        return super().__init__(session, timeout, base_url, hooks, rate_limiter)
 
     @property
     def collections(self) -> CollectionSpec:
@@ -149,6 +175,93 @@ class AssetSpec(Spec):
         resp = self._get(GET_URL.format(asset_id), **kwargs)
         return self.parse_response(resp, Asset)
 
+    @staticmethod
+    def _chunk_ids(
+        asset_ids: Iterable[str], chunk_size: int
+    ) -> Tuple[List[str], List[List[str]]]:
+        """Dedupe ids, keeping their order, and split them into chunks"""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        ids = list(dict.fromkeys(asset_ids))
+        return ids, [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+
+    def _search_ids(self, asset_ids: Sequence[str], include_fields: Optional[Sequence[str]]):
+        """Search a chunk of asset ids, see :meth:`get_many`"""
+        body = {
+            "doc_types": ["assets"],
+            "filter": {
+                "operator": "AND",
+                "terms": [{"name": "id", "value_in": list(asset_ids)}],
+            },
+        }
+        if include_fields is not None:
+            body["include_fields"] = list(dict.fromkeys(["id", *include_fields]))
+        return self._search_spec.search(
+            body,
+            per_page=len(asset_ids),
+            generate_signed_url=False,
+            save_search_history=False,
+        )
+
+    @staticmethod
+    def _assets_from_search(resp: Response) -> Dict[str, Asset]:
+        resp.response.raise_for_status()
+        return {
+            obj.id: Asset.model_validate(obj.model_dump(exclude_unset=True))
+            for obj in resp.data.objects or []
+        }
+
+    @staticmethod
+    def _merge_fetched(found: Dict[str, Asset], asset_ids: List[str], responses: Iterable[Response]):
+        """Add the assets fetched one by one, skipping the ones that don't exist"""
+        for asset_id, resp in zip(asset_ids, responses):
+            if resp.response.status_code == 404:
+                continue
+            resp.response.raise_for_status()
+            found[asset_id] = resp.data
+
+    def get_many(
+        self,
+        asset_ids: Iterable[str],
+        include_fields: Optional[Sequence[str]] = None,
+        chunk_size: int = GET_MANY_CHUNK_SIZE,
+        workers: int = 4,
+        fallback: bool = True,
+    ) -> Dict[str, Asset]:
+        """
+        Get many assets at once, with one search request per ``chunk_size``
+        ids instead of one GET per asset.
+
+        Ids the search index does not return (e.g. assets created moments ago
+        and not indexed yet) are fetched with concurrent :meth:`get` calls.
+
+        Args:
+            asset_ids: IDs of the assets, duplicates are fetched once
+            include_fields: Only transfer these fields of the searched assets,
+                fields left out keep the Asset model defaults. Assets fetched
+                by the fallback are always complete.
+            chunk_size: Number of ids resolved by each search request
+            workers: Maximum number of concurrent requests
+            fallback: Whether to GET the ids missing from the search results
+
+        Returns:
+            Dict of Asset keyed by asset ID, in the order of asset_ids. IDs
+            that don't exist are left out.
+
+        Raises:
+            ValueError: If chunk_size is lower than 1
+            requests.HTTPError: If a request fails
+        """
+        ids, chunks = self._chunk_ids(asset_ids, chunk_size)
+        found = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for resp in executor.map(lambda chunk: self._search_ids(chunk, include_fields), chunks):
+                found.update(self._assets_from_search(resp))
+            missing = [asset_id for asset_id in ids if asset_id not in found]
+            if fallback and missing:
+                self._merge_fetched(found, missing, executor.map(self.get, missing))
+        return {asset_id: found[asset_id] for asset_id in ids if asset_id in found}
+
     def create(
         self,
         body: Union[AssetCreate, Dict[str, Any]],
@@ -617,6 +730,38 @@ class AssetSpec(Spec):
         response = self._get(GET_SEGMENTS_URL.format(asset_id), params=params, **kwargs)
         return self.parse_response(response, SegmentListResponse)
 
+    def iter_segments(
+        self,
+        asset_id: str,
+        per_page: Optional[int] = None,
+        prefetch: int = 0,
+        **kwargs,
+    ) -> Iterator[SegmentDetailResponse]:
+        """
+        Lazily iterate over every segment of an asset using scroll pagination.
+
+        Args:
+            asset_id: The asset ID to get segments for
+            per_page: The number of items for each page
+            prefetch: Number of pages to fetch ahead on a background worker
+                while the caller processes the current page, 0 disables it
+            **kwargs: Filters and request kwargs passed to :meth:`get_segments`
+                for every page (e.g. ``segment_type="COMMENT"``)
+
+        Returns:
+            Iterator of SegmentDetailResponse
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+
+        def fetch(scroll_id):
+            return self.get_segments(
+                asset_id, per_page=per_page, scroll=True, scroll_id=scroll_id, **kwargs
+            )
+
+        return self._page_objects(self._walk_pages(fetch, scroll_id_cursor, prefetch))
+
     def list_all(self, **kwargs) -> Response:
         """
         Get list of assets.
@@ -644,6 +789,44 @@ class AssetSpec(Spec):
         resp = self._get(HISTORY_URL.format(asset_id), **kwargs)
         return self.parse_response(resp, PaginatedResponse)
 
+    def iter_all(self, **kwargs) -> Iterator[Asset]:
+        """
+        Lazily iterate over every asset, following the pagination of
+        :meth:`list_all`. Only one page is held in memory at a time.
+
+        Args:
+            **kwargs: Additional kwargs to pass to the first page request,
+                e.g. ``params={"per_page": 500}``
+                (``prefetch=N`` reads N pages ahead on a background worker,
+                ``parallel=N`` fetches N pages concurrently)
+
+        Returns:
+            Iterator of Asset
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_objects(self.list_all, object_model=Asset, **kwargs)
+
+    def iter_asset_history_entities(self, asset_id: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over every history entity of an asset, following the
+        pagination of :meth:`list_asset_history_entities`.
+
+        Args:
+            asset_id: ID of the asset
+            **kwargs: Additional kwargs to pass to the first page request
+                (``prefetch=N`` reads N pages ahead on a background worker,
+                ``parallel=N`` fetches N pages concurrently)
+
+        Returns:
+            Iterator of history entity dicts
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_objects(self.list_asset_history_entities, asset_id, **kwargs)
+
     def create_history_entity(
             self, asset_id: str,
             operation_description: str,
@@ -674,3 +857,93 @@ class AssetSpec(Spec):
         }
         resp = self._post(HISTORY_URL.format(asset_id), json=body, **kwargs)
         return self.parse_response(resp, None)
+
+
+class AsyncAssetSpec(AsyncSpec, AssetSpec):
+    """asyncio counterpart of :class:`AssetSpec`, every method is awaitable"""
+
+    def __init__(
+        self,
+        session,
+        timeout=3,
+        base_url: str = "https://app.iconik.io",
+        hooks: Optional[RequestHooks] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self._collection_spec = AsyncCollectionSpec(
+            session=session,
+            timeout=timeout,
+            base_url=base_url,
+            hooks=hooks,
+            rate_limiter=rate_limiter,
+        )
+        self._search_spec = AsyncSearchSpec(
+            session=session,
+            timeout=timeout,
+            base_url=base_url,
+            hooks=hooks,
+            rate_limiter=rate_limiter,
+        )
+        Spec.__init__(self, session, timeout, base_url, hooks, rate_limiter)
+
+    @property
+    def collections(self) -> AsyncCollectionSpec:
+        """
+        Access the collections API
+
+        Returns:
+            AsyncCollectionSpec: An instance of AsyncCollectionSpec for working with collections
+        """
+        return self._collection_spec
+
+    async def bulk_delete(
+        self,
+        body: Union[BulkDelete, Dict[str, Any]],
+        permanently_delete=False,
+        exclude_defaults: bool = True,
+        **kwargs,
+    ) -> Response:
+        """
+        Bulk delete objects.
+
+        See :meth:`AssetSpec.bulk_delete`.
+        """
+        json_data = self._prepare_model_data(body, exclude_defaults=exclude_defaults)
+        response = await self._post(BULK_DELETE_URL, json=json_data, **kwargs)
+        if permanently_delete:
+            response = (await self.permanently_delete()).response
+        return await self.parse_response(response, model=None)
+
+    async def get_many(
+        self,
+        asset_ids: Iterable[str],
+        include_fields: Optional[Sequence[str]] = None,
+        chunk_size: int = GET_MANY_CHUNK_SIZE,
+        workers: int = 4,
+        fallback: bool = True,
+    ) -> Dict[str, Asset]:
+        """
+        Get many assets at once.
+
+        See :meth:`AssetSpec.get_many`.
+        """
+        ids, chunks = self._chunk_ids(asset_ids, chunk_size)
+        limit = asyncio.Semaphore(workers)
+
+        async def bounded(request):
+            async with limit:
+                return await request
+
+        found = {}
+        responses = await asyncio.gather(
+            *(bounded(self._search_ids(chunk, include_fields)) for chunk in chunks)
+        )
+        for resp in responses:
+            found.update(self._assets_from_search(resp))
+        missing = [asset_id for asset_id in ids if asset_id not in found]
+        if fallback and missing:
+            responses = await asyncio.gather(
+                *(bounded(self.get(asset_id)) for asset_id in missing)
+            )
+            self._merge_fetched(found, missing, responses)
+        return {asset_id: found[asset_id] for asset_id in ids if asset_id in found}
@@ -0,0 +1,184 @@
+import asyncio
+import inspect
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Type
+
+from pydantic import BaseModel
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from pythonik.models.base import PaginatedResponse, Response as PythonikResponse
+from pythonik.pagination import NextCursor, afan_out_pages, awalk_pages, next_url_cursor
+from pythonik.specs.base import Spec
+
+
+def to_requests_response(response) -> Response:
+    """
+    Convert an ``httpx.Response`` into a ``requests.Response``.
+
+    The async specs return the same ``Response`` wrapper as the sync ones, so
+    callers can keep using ``.ok``, ``.json()`` and ``.raise_for_status()``
+    on ``Response.response`` regardless of which client produced it.
+    """
+    converted = Response()
+    converted.status_code = response.status_code
+    try:
+        converted._content = response.content
+    except RuntimeError:
+        # streamed body that was consumed chunk by chunk
+        converted._content = b""
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted.url = str(response.url)
+    converted.encoding = response.encoding
+    converted.reason = response.reason_phrase
+    try:
+        converted.elapsed = response.elapsed
+    except RuntimeError:
+        # elapsed is only known once the underlying stream has been closed
+        pass
+    return converted
+
+
+class _BufferStream:
+    """
+    Request body sending a buffer as a single chunk. httpx copies ``bytes``
+    content but streams async iterables as they are, so a memoryview over a
+    memory-mapped file reaches the socket without being copied.
+    """
+
+    def __init__(self, buffer: memoryview):
+        self.buffer = buffer
+
+    async def _chunks(self) -> AsyncIterator[memoryview]:
+        yield self.buffer
+
+    def __aiter__(self) -> AsyncIterator[memoryview]:
+        return self._chunks()
+
+
+def to_httpx_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Translate the requests-style kwargs the specs pass to ``send_request``
+    into their httpx equivalents.
+    """
+    kwargs = dict(kwargs)
+    data = kwargs.get("data")
+    if isinstance(data, memoryview):
+        kwargs["content"] = _BufferStream(kwargs.pop("data"))
+        # known length, so the body is not sent chunked
+        kwargs["headers"] = {"Content-Length": str(data.nbytes), **(kwargs.get("headers") or {})}
+    elif isinstance(data, (bytes, bytearray, str)):
+        kwargs["content"] = kwargs.pop("data")
+    return kwargs
+
+
+class AsyncSpec(Spec):
+    """
+    asyncio flavour of :class:`Spec` backed by an ``httpx.AsyncClient``.
+
+    ``send_request`` is a coroutine, and ``parse_response`` accepts either a
+    response or an awaitable resolving to one. This means the request-building
+    code of every sync spec method can be reused unchanged: on an async spec
+    ``self.parse_response(self._get(...), Model)`` simply returns a coroutine
+    resolving to the usual ``Response`` wrapper.
+
+    Methods that inspect the HTTP response before parsing it must be
+    overridden with an explicit ``async def`` in the async subclass. The
+    ``iter_*`` listing helpers return async iterators, to be consumed with
+    ``async for``.
+    """
+
+    @staticmethod
+    async def parse_response(
+        response, model: Optional[Type[BaseModel]] = None
+    ) -> PythonikResponse:
+        """
+        Await the response if needed, then parse it like :meth:`Spec.parse_response`
+
+        Args:
+            response: The HTTP response, or an awaitable resolving to one
+            model: The Pydantic model class to parse the response into
+        """
+        if inspect.isawaitable(response):
+            response = await response
+        return Spec.parse_response(response, model)
+
+    async def send_request(self, method, path, **kwargs) -> Response:
+        """
+        Send an http request to a particular URL with a particular method and arguments
+        """
+        url = self.gen_url(path)
+        request = self.session.build_request(
+            method, url, timeout=self.timeout, **to_httpx_kwargs(kwargs)
+        )
+        limiter = self.rate_limiter
+        if not limiter:
+            return await self._send(method, url, request)
+
+        attempt = 0
+        while True:
+            wait = limiter.reserve(method, url)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            response = await self._send(method, url, request)
+            if not limiter.should_retry(method, url, response, attempt):
+                return response
+            attempt += 1
+
+    async def _send(self, method, url, request) -> Response:
+        """Send a built request, reporting it to the hooks"""
+        hooks = self.hooks
+        if not hooks:
+            return to_requests_response(await self.session.send(request))
+
+        event = hooks.before_request(method, url, request.headers)
+        try:
+            response = to_requests_response(await self.session.send(request))
+        except Exception as e:
+            hooks.on_error(event, e)
+            raise
+        hooks.after_response(event, response)
+
+        return response
+
+    def paginate(
+        self, fetch_page: Callable[..., Any], *args, prefetch: int = 0, **kwargs
+    ) -> AsyncIterator[PythonikResponse]:
+        """
+        Lazily yield every page of a paginated listing, following next_url.
+
+        See :meth:`Spec.paginate`, use with ``async for``.
+        """
+        model = None
+
+        async def fetch(next_url):
+            nonlocal model
+            if next_url is None:
+                page = await fetch_page(*args, **kwargs)
+                model = type(page.data) if page.data is not None else PaginatedResponse
+                return page
+            return await self.parse_response(self._get(next_url), model)
+
+        return self._walk_pages(fetch, next_url_cursor, prefetch)
+
+    @staticmethod
+    def _fan_out_pages(
+        fetch_page_number: Callable[[int], Any], parallel: int
+    ) -> AsyncIterator[PythonikResponse]:
+        """Fetch numbered pages concurrently, see :func:`pythonik.pagination.afan_out_pages`"""
+        return afan_out_pages(fetch_page_number, parallel)
+
+    @staticmethod
+    def _walk_pages(
+        fetch_page: Callable[[Any], Any], next_cursor: NextCursor, prefetch: int = 0
+    ) -> AsyncIterator[PythonikResponse]:
+        """Walk pages from a cursor fetcher, see :func:`pythonik.pagination.awalk_pages`"""
+        return awalk_pages(fetch_page, next_cursor, prefetch)
+
+    @staticmethod
+    async def _page_objects(
+        pages: AsyncIterator[PythonikResponse], object_model: Optional[Type[BaseModel]] = None
+    ) -> AsyncIterator[Any]:
+        """Flatten an async iterator of pages into the objects they contain"""
+        async for page in pages:
+            for obj in page.data.objects or []:
+                yield object_model.model_validate(obj) if object_model else obj
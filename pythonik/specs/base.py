@@ -1,10 +1,13 @@
 from urllib.parse import urljoin
-from typing import Union, Type, Dict, Any, Optional
+from typing import Union, Type, Dict, Any, Optional, Callable, Iterator
 
 from pydantic import BaseModel
 from requests import Request, Response, Session
 
-from pythonik.models.base import Response as PythonikResponse
+from pythonik.hooks import RequestHooks
+from pythonik.models.base import PaginatedResponse, Response as PythonikResponse
+from pythonik.pagination import NextCursor, fan_out_pages, next_url_cursor, walk_pages
+from pythonik.ratelimit import RateLimiter
 
 class Spec:
     server: str = ""
@@ -15,9 +18,18 @@ class Spec:
     def set_class_attribute(cls, name, value):
         setattr(cls, name, value)
 
-    def __init__(self, session: Session, timeout: int = 3, base_url: str = "https://app.iconik.io"):
+    def __init__(
+        self,
+        session: Session,
+        timeout: int = 3,
+        base_url: str = "https://app.iconik.io",
+        hooks: Optional[RequestHooks] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
         self.session = session
         self.timeout = timeout
+        self.hooks = hooks
+        self.rate_limiter = rate_limiter
         self.set_class_attribute("base_url", base_url)
     
         
@@ -48,7 +60,6 @@ class Spec:
         """
         # try to populate the model
         if response.ok:
-            print(response.text)
             if model:
                 data = response.json()
                 model_instance = model.model_validate(data)
@@ -56,6 +67,143 @@ class Spec:
 
         return PythonikResponse(response=response, data=None)
 
+    def paginate(
+        self,
+        fetch_page: Callable[..., PythonikResponse],
+        *args,
+        prefetch: int = 0,
+        **kwargs,
+    ) -> Iterator[PythonikResponse]:
+        """
+        Lazily yield every page of a paginated listing, following next_url.
+
+        By default only one page is held in memory at a time, the next page is
+        requested when the caller asks for it. With ``prefetch`` the next pages
+        are fetched on a background thread while the caller processes the
+        current one.
+
+        Args:
+            fetch_page: Spec method returning the first page, e.g. ``self.list_all``
+            *args: Positional arguments for fetch_page
+            prefetch: Number of pages to read ahead, 0 disables read-ahead
+            **kwargs: Keyword arguments for fetch_page (e.g. ``params={"per_page": 500}``)
+
+        Returns:
+            Iterator of Response, one per page
+
+        Raises:
+            requests.HTTPError: If a page request fails
+
+        Example:
+            for page in client.assets().paginate(client.assets().list_all):
+                ...
+        """
+        model = None
+
+        def fetch(next_url):
+            nonlocal model
+            if next_url is None:
+                page = fetch_page(*args, **kwargs)
+                model = type(page.data) if page.data is not None else PaginatedResponse
+                return page
+            return self.parse_response(self._get(next_url), model)
+
+        return self._walk_pages(fetch, next_url_cursor, prefetch)
+
+    def fetch_all(
+        self,
+        fetch_page: Callable[..., PythonikResponse],
+        *args,
+        parallel: int = 4,
+        **kwargs,
+    ) -> Iterator[PythonikResponse]:
+        """
+        Yield every page of a page-number listing, fetching pages concurrently.
+
+        Page 1 is requested first to learn the page count, then the remaining
+        pages are requested ``parallel`` at a time through the ``page`` query
+        parameter. Pages are still yielded in page order.
+
+        Args:
+            fetch_page: Spec method returning a page, e.g. ``self.list_all``
+            *args: Positional arguments for fetch_page
+            parallel: Maximum number of concurrent page requests
+            **kwargs: Keyword arguments for fetch_page (e.g. ``params={"per_page": 500}``)
+
+        Returns:
+            Iterator of Response, one per page, in page order
+
+        Raises:
+            ValueError: If parallel is lower than 1
+            requests.HTTPError: If a page request fails
+
+        Example:
+            assets = client.assets()
+            for page in assets.fetch_all(assets.list_all, parallel=8):
+                ...
+        """
+        params = kwargs.pop("params", None) or {}
+
+        def fetch(number):
+            return fetch_page(*args, params={**params, "page": number}, **kwargs)
+
+        return self._fan_out_pages(fetch, parallel)
+
+    @staticmethod
+    def _fan_out_pages(
+        fetch_page_number: Callable[[int], PythonikResponse], parallel: int
+    ) -> Iterator[PythonikResponse]:
+        """Fetch numbered pages concurrently, see :func:`pythonik.pagination.fan_out_pages`"""
+        return fan_out_pages(fetch_page_number, parallel)
+
+    @staticmethod
+    def _walk_pages(
+        fetch_page: Callable[[Any], PythonikResponse],
+        next_cursor: NextCursor,
+        prefetch: int = 0,
+    ) -> Iterator[PythonikResponse]:
+        """Walk pages from a cursor fetcher, see :func:`pythonik.pagination.walk_pages`"""
+        return walk_pages(fetch_page, next_cursor, prefetch)
+
+    @staticmethod
+    def _page_objects(
+        pages: Iterator[PythonikResponse], object_model: Optional[Type[BaseModel]] = None
+    ) -> Iterator[Any]:
+        """Flatten an iterator of pages into the objects they contain"""
+        for page in pages:
+            for obj in page.data.objects or []:
+                yield object_model.model_validate(obj) if object_model else obj
+
+    def _iter_objects(
+        self,
+        fetch_page: Callable[..., PythonikResponse],
+        *args,
+        object_model: Optional[Type[BaseModel]] = None,
+        parallel: int = 0,
+        **kwargs,
+    ) -> Iterator[Any]:
+        """
+        Yield the objects of every page returned by :meth:`paginate`, or by
+        :meth:`fetch_all` when ``parallel`` is set
+
+        Args:
+            fetch_page: Spec method returning the first page
+            object_model: Optional model to validate each object into, for
+                listings whose page model leaves objects untyped
+            parallel: Number of pages to fetch concurrently, 0 follows
+                next_url one page at a time
+
+        Raises:
+            ValueError: If both parallel and prefetch are set
+        """
+        if parallel:
+            if kwargs.pop("prefetch", 0):
+                raise ValueError("prefetch and parallel cannot be combined")
+            pages = self.fetch_all(fetch_page, *args, parallel=parallel, **kwargs)
+        else:
+            pages = self.paginate(fetch_page, *args, **kwargs)
+        return self._page_objects(pages, object_model)
+
     @classmethod
     def gen_url(cls, path):
         url = urljoin(cls.server, f"{cls.api_version}/")
@@ -68,12 +216,35 @@ class Spec:
         """
 
         url = self.gen_url(path)
-        print(url)
         request = Request(
             method=method, url=url, headers=self.session.headers, **kwargs
         )
         prepped_request = self.session.prepare_request(request)
-        response = self.session.send(prepped_request, timeout=self.timeout)
+        limiter = self.rate_limiter
+        if not limiter:
+            return self._send(method, url, prepped_request)
+
+        attempt = 0
+        while True:
+            limiter.acquire(method, url)
+            response = self._send(method, url, prepped_request)
+            if not limiter.should_retry(method, url, response, attempt):
+                return response
+            attempt += 1
+
+    def _send(self, method, url, prepped_request) -> Response:
+        """Send a prepared request, reporting it to the hooks"""
+        hooks = self.hooks
+        if not hooks:
+            return self.session.send(prepped_request, timeout=self.timeout)
+
+        event = hooks.before_request(method, url, prepped_request.headers)
+        try:
+            response = self.session.send(prepped_request, timeout=self.timeout)
+        except Exception as e:
+            hooks.on_error(event, e)
+            raise
+        hooks.after_response(event, response)
 
         return response
 
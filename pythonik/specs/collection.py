@@ -1,5 +1,6 @@
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, Iterator
 
+from pythonik.specs.async_base import AsyncSpec
 from pythonik.specs.base import Spec
 from pythonik.models.base import Response
 from pythonik.models.assets.collections import (
@@ -107,6 +108,26 @@ class CollectionSpec(Spec):
         resp = self._get(GET_CONTENTS.format(collection_id), **kwargs)
         return self.parse_response(resp, CollectionContents)
 
+    def iter_contents(self, collection_id: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over every object in a collection, following the
+        pagination of :meth:`get_contents`. Only one page is held in memory
+        at a time.
+
+        Args:
+            collection_id: The ID of the collection
+            **kwargs: Additional kwargs to pass to the first page request
+                (``prefetch=N`` reads N pages ahead on a background worker,
+                ``parallel=N`` fetches N pages concurrently)
+
+        Returns:
+            Iterator of collection content dicts
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_objects(self.get_contents, collection_id, **kwargs)
+
     def create(
         self,
         body: Union[Collection, Dict[str, Any]],
@@ -166,3 +187,7 @@ class CollectionSpec(Spec):
             **kwargs,
         )
         return self.parse_response(response, AddContentResponse)
+
+
+class AsyncCollectionSpec(AsyncSpec, CollectionSpec):
+    """asyncio counterpart of :class:`CollectionSpec`, every method is awaitable"""
@@ -1,20 +1,56 @@
+import asyncio
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from urllib.parse import urlparse
 from xml.dom.minidom import parseString
 from functools import wraps
 import warnings
-from typing import Union, Dict, Any, Literal
+from typing import (
+    Union,
+    Callable,
+    Dict,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
 import requests
+from pydantic import BaseModel
 
 from pythonik.constants import (
     GCS_KEYFRAME_LOCATION_KEY,
     GCS_UPLOADID_KEY,
     S3_UPLOADID_KEY,
 )
-from pythonik.exceptions import UnexpectedStorageMethodForProxy
+from pythonik.downloads import (
+    DEFAULT_CHECKSUM_ALGORITHM,
+    DEFAULT_DOWNLOAD_PART_SIZE,
+    DOWNLOAD_CHUNK_SIZE,
+    DownloadState,
+    PartWriter,
+    content_range_size,
+    download_source,
+    download_state_path,
+    preallocate,
+    range_header,
+    verify_checksum,
+)
+from pythonik.exceptions import DownloadError, UnexpectedStorageMethodForProxy, UploadError
+from pythonik.hooks import RequestHooks
 from pythonik.models.base import Response, StorageMethod, PaginatedResponse
+from pythonik.models.files.bundle import AssetBundle
 from pythonik.models.files.file import (
     File,
+    FileStatus,
     FileSetsFilesResponse,
     Files,
     FileSet,
@@ -29,14 +65,64 @@ from pythonik.models.files.keyframe import (
     GCSKeyframeUploadResponse,
 )
 from pythonik.models.files.proxy import Proxies, Proxy
+from pythonik.ratelimit import RateLimiter
+from pythonik.reconcile import (
+    DEFAULT_MTIME_TOLERANCE,
+    DEFAULT_PARTITIONS,
+    DEFAULT_SCAN_WORKERS,
+    LOCAL,
+    REMOTE,
+    Difference,
+    PartitionedJoin,
+    reconcile,
+    scan_tree,
+    storage_file_entry,
+)
+from pythonik.transport import STORAGE_RETRY_STATUSES, new_storage_session
+from pythonik.uploads import (
+    DEFAULT_GCS_CHUNK_SIZE,
+    DEFAULT_PART_SIZE,
+    DEFAULT_URL_BATCH_SIZE,
+    GCS_RESUME_INCOMPLETE,
+    INGEST_CLOSE,
+    INGEST_CREATE,
+    INGEST_DONE,
+    INGEST_UPLOAD,
+    KeyframeIngestItem,
+    KeyframeIngestResult,
+    GCS_SESSION_GONE,
+    RESUMABLE_RETRY_STATUSES,
+    S3_MAX_PARTS,
+    S3_MIN_PART_SIZE,
+    Part,
+    PathLike,
+    ProxyIngestItem,
+    ProxyIngestResult,
+    ResumableState,
+    StreamSource,
+    UploadDigest,
+    check_gcs_chunk_size,
+    gcs_committed,
+    gcs_content_range,
+    iter_stream_parts,
+    map_part,
+    plan_parts,
+    resume_delay,
+    s3_complete_body,
+    s3_error,
+    s3_part_size,
+)
+from pythonik.specs.async_base import AsyncSpec, to_httpx_kwargs, to_requests_response
 from pythonik.specs.base import Spec, PythonikResponse
 from pythonik.models.files.storage import Storage, Storages
 from pythonik.models.files.format import Component, Formats, Format, FormatCreate
 
 GET_ASSET_PROXY_PATH = "assets/{}/proxies/{}/"
 GET_ASSET_PROXIES_PATH = "assets/{}/proxies/"
-GET_ASSET_PROXIES_MULTIPART_URL_PATH = GET_ASSET_PROXY_PATH + "multipart_url/part/"
-GET_ASSET_PROXIES_MULTIPART_COMPLETE_URL_PATH = GET_ASSET_PROXY_PATH + "multipart_url/"
+MULTIPART_URL_PART_SUFFIX = "multipart_url/part/"
+MULTIPART_URL_SUFFIX = "multipart_url/"
+GET_ASSET_PROXIES_MULTIPART_URL_PATH = GET_ASSET_PROXY_PATH + MULTIPART_URL_PART_SUFFIX
+GET_ASSET_PROXIES_MULTIPART_COMPLETE_URL_PATH = GET_ASSET_PROXY_PATH + MULTIPART_URL_SUFFIX
 GET_ASSETS_FORMATS_PATH = "assets/{}/formats/"
 GET_ASSETS_FORMAT_PATH = "assets/{}/formats/{}/"
 GET_ASSETS_FORMAT_COMPONENTS_PATH = "assets/{}/formats/{}/components"
@@ -47,6 +133,8 @@ GET_STORAGE_PATH = "storages/{}/"
 GET_STORAGES_PATH = "storages/"
 GET_ASSET_KEYFRAME = "assets/{}/keyframes/{}/"
 GET_ASSET_KEYFRAMES = "assets/{}/keyframes/"
+GET_ASSET_KEYFRAME_MULTIPART_URL_PATH = GET_ASSET_KEYFRAME + MULTIPART_URL_PART_SUFFIX
+GET_ASSET_KEYFRAME_MULTIPART_COMPLETE_URL_PATH = GET_ASSET_KEYFRAME + MULTIPART_URL_SUFFIX
 GET_ASSETS_FILE_PATH = "assets/{}/files/{}/"
 DELETE_ASSETS_FILE_SET_PATH = "assets/{}/file_sets/{}/"
 DELETE_ASSETS_FILE_PATH = "assets/{}/files/{}/"
@@ -54,6 +142,7 @@ GET_ASSETS_VERSION_FILE_SETS_PATH = "assets/{}/versions/{}/file_sets/"
 GET_ASSETS_VERSION_FILES_PATH = "assets/{}/versions/{}/files/"
 GET_ASSETS_VERSION_FORMATS_PATH = "assets/{}/versions/{}/formats/"
 GET_STORAGE_FILES_PATH = "storages/{}/files/"
+GET_STORAGE_FILE_PATH = "storages/{}/files/{}/"
 GET_ASSETS_FORMAT_COMPONENTS_LIST_PATH = "assets/{}/formats/{}/components/"
 GET_DELETE_QUEUE_OBJECT_TYPE_PATH = "delete_queue/{}/"
 CREATE_ASSET_FILE_MEDIAINFO_JOB_PATH = "assets/{}/files/{}/mediainfo"
@@ -63,6 +152,41 @@ CREATE_ASSET_FILE_TRANSCODE_JOB_PATH = "assets/{}/files/{}/keyframes"
 class FilesSpec(Spec):
     server = "API/files/"
 
+    def __init__(
+        self,
+        session,
+        timeout: int = 3,
+        base_url: str = "https://app.iconik.io",
+        hooks: Optional[RequestHooks] = None,
+        storage_session=None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        super().__init__(session, timeout, base_url, hooks, rate_limiter)
+        # object storage requests must not carry the Iconik auth headers
+        self._storage_session = storage_session
+
+    @property
+    def storage_session(self):
+        """
+        Session used for object storage (S3/GCS) traffic, the client's shared
+        one or, for a spec created on its own, a pooled session of its own
+        """
+        if self._storage_session is None:
+            self._storage_session = self._new_storage_session()
+        return self._storage_session
+
+    @staticmethod
+    def _new_storage_session():
+        return new_storage_session()
+
+    def _storage_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request to object storage through the storage session"""
+        data = kwargs.get("data")
+        if isinstance(data, memoryview) and not data:
+            # requests sends empty views chunked, object stores want a Content-Length
+            kwargs["data"] = b""
+        return self.storage_session.request(method, url, timeout=self.timeout, **kwargs)
+
     def create_asset_format_component(
         self,
         asset_id: str,
@@ -193,6 +317,23 @@ class FilesSpec(Spec):
         response = self._get(GET_ASSET_KEYFRAMES.format(asset_id), **kwargs)
         return self.parse_response(response, Keyframes)
 
+    def iter_asset_keyframes(self, asset_id: str, **kwargs) -> Iterator[Keyframe]:
+        """Lazily iterate over every keyframe of an asset, page by page
+
+        Args:
+            asset_id: The ID of the asset
+            **kwargs: Additional arguments to pass to the first page request
+                (``prefetch=N`` reads N pages ahead on a background worker,
+                ``parallel=N`` fetches N pages concurrently)
+
+        Returns:
+            Iterator of Keyframe
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_objects(self.get_asset_keyframes, asset_id, **kwargs)
+
     def create_asset_keyframe(
         self, asset_id: str, body: Union[Keyframe, Dict[str, Any]], exclude_defaults: bool = True, **kwargs
     ) -> Response:
@@ -287,56 +428,80 @@ class FilesSpec(Spec):
         )
         return self.parse_response(response, Keyframe)
 
-    def get_upload_id_for_keyframe(self, keyframe: Keyframe) -> PythonikResponse:
+    def _get_upload_start_request(
+        self, target: Union[Proxy, Keyframe]
+    ) -> Tuple[str, Dict[str, str]]:
         """
-        Get upload ID for keyframe. This ID is required to upload keyframe files.
+        Work out the storage URL and headers used to start an upload for a
+        proxy or a keyframe.
 
-        :return: PythonikResponse
-        :raises UnexpectedStorageMethodForProxy: When keyframe exists on an unsupported storage method (i.e. Pythonik cannot
-        automatically determine the upload ID)
+        :raises UnexpectedStorageMethodForProxy: When the object exists on an unsupported storage method
         """
         headers = {"Origin": self.base_url, "Referer": self.base_url}
-        if keyframe.storage_method == StorageMethod.S3:
-            upload_url = keyframe.multipart_upload_url
+        if target.storage_method == StorageMethod.S3:
+            upload_url = target.multipart_upload_url
             headers = {"Host": urlparse(upload_url).netloc, **headers}
-        elif keyframe.storage_method == StorageMethod.GCS:
-            upload_url = keyframe.upload_url
+        elif target.storage_method == StorageMethod.GCS:
+            upload_url = target.upload_url
             headers = {"X-Goog-Resumable": "start", **headers}
         else:
             # escape hatch
             supported_methods = [StorageMethod.S3, StorageMethod.GCS]
             raise UnexpectedStorageMethodForProxy(
-                f"Unexpected storage method: {keyframe.storage_method}."
+                f"Unexpected storage method: {target.storage_method}."
                 f" Pythonik supports {supported_methods}."
             )
+        return upload_url, headers
 
-        upload_url_response = requests.post(upload_url, headers=headers)
+    @staticmethod
+    def _parse_keyframe_upload_id(
+        keyframe: Keyframe, upload_url_response: requests.Response
+    ) -> PythonikResponse:
         if not upload_url_response.ok:
             return PythonikResponse(response=upload_url_response, data=None)
 
         if keyframe.storage_method == StorageMethod.S3:
-            raise NotImplementedError(
-                "Pythonik does not currently support creating keyframes on S3"
-            )
-            xml = parseString(upload_url_response.text)
-            key = xml.getElementsByTagName("Key")[0].firstChild.nodeValue
-            bucket = xml.getElementsByTagName("Bucket")[0].firstChild.nodeValue
-            upload_id = xml.getElementsByTagName(S3_UPLOADID_KEY)[
-                0
-            ].firstChild.nodeValue
-            data = upload_id
-        elif keyframe.storage_method == StorageMethod.GCS:
-            upload_id = upload_url_response.headers[GCS_UPLOADID_KEY]
-            location = upload_url_response.headers[GCS_KEYFRAME_LOCATION_KEY]
-            data = GCSKeyframeUploadResponse(upload_id=upload_id, location=location)
+            upload_id = FilesSpec._parse_s3_upload_id(upload_url_response)
+            return PythonikResponse(response=upload_url_response, data=upload_id)
+        upload_id = upload_url_response.headers[GCS_UPLOADID_KEY]
+        location = upload_url_response.headers[GCS_KEYFRAME_LOCATION_KEY]
+        data = GCSKeyframeUploadResponse(upload_id=upload_id, location=location)
+        return PythonikResponse(response=upload_url_response, data=data)
+
+    @staticmethod
+    def _parse_proxy_upload_id(
+        proxy: Proxy, upload_url_response: requests.Response
+    ) -> PythonikResponse:
+        if not upload_url_response.ok:
+            return PythonikResponse(response=upload_url_response, data=None)
+
+        if proxy.storage_method == StorageMethod.S3:
+            upload_id = FilesSpec._parse_s3_upload_id(upload_url_response)
         else:
-            supported_methods = [StorageMethod.S3, StorageMethod.GCS]
-            raise UnexpectedStorageMethodForProxy(
-                f"Unexpected storage method: {keyframe.storage_method}."
-                f" Pythonik supports {supported_methods}."
-            )
+            upload_id = upload_url_response.headers[GCS_UPLOADID_KEY]
 
-        return PythonikResponse(response=upload_url_response, data=data)
+        return PythonikResponse(response=upload_url_response, data=upload_id)
+
+    @staticmethod
+    def _parse_s3_upload_id(upload_url_response: requests.Response) -> str:
+        """UploadId of an S3 CreateMultipartUpload response"""
+        xml = parseString(upload_url_response.text)
+        # key = xml.getElementsByTagName("Key")[0].firstChild.nodeValue
+        # bucket = xml.getElementsByTagName("Bucket")[0].firstChild.nodeValue
+        return xml.getElementsByTagName(S3_UPLOADID_KEY)[0].firstChild.nodeValue
+
+    def get_upload_id_for_keyframe(self, keyframe: Keyframe) -> PythonikResponse:
+        """
+        Get upload ID for keyframe. This ID is required to upload keyframe files.
+
+        :return: PythonikResponse, with a GCSKeyframeUploadResponse as data on
+            GCS and the multipart upload ID on S3
+        :raises UnexpectedStorageMethodForProxy: When keyframe exists on an unsupported storage method (i.e. Pythonik cannot
+        automatically determine the upload ID)
+        """
+        upload_url, headers = self._get_upload_start_request(keyframe)
+        upload_url_response = self._storage_request("POST", upload_url, headers=headers)
+        return self._parse_keyframe_upload_id(keyframe, upload_url_response)
 
     def get_upload_id_for_proxy(self, asset_id: str, proxy_id: str) -> PythonikResponse:
         """
@@ -352,43 +517,13 @@ class FilesSpec(Spec):
             # bubble up the error for caller to handle
             return proxy_response
 
-        proxy = proxy_response.data
-        headers = {"Origin": self.base_url, "Referer": self.base_url}
-        if proxy.storage_method == StorageMethod.S3:
-            upload_url = proxy.multipart_upload_url
-            headers = {"Host": urlparse(upload_url).netloc, **headers}
-        elif proxy.storage_method == StorageMethod.GCS:
-            upload_url = proxy.upload_url
-            headers = {"X-Goog-Resumable": "start", **headers}
-        else:
-            # escape hatch
-            supported_methods = [StorageMethod.S3, StorageMethod.GCS]
-            raise UnexpectedStorageMethodForProxy(
-                f"Unexpected storage method: {proxy.storage_method}."
-                f" pythonik supports {supported_methods}."
-            )
-
-        upload_url_response = requests.post(upload_url, headers=headers)
-        if not upload_url_response.ok:
-            return PythonikResponse(response=upload_url_response, data=None)
-
-        if proxy.storage_method == StorageMethod.S3:
-            xml = parseString(upload_url_response.text)
-            # key = xml.getElementsByTagName("Key")[0].firstChild.nodeValue
-            # bucket = xml.getElementsByTagName("Bucket")[0].firstChild.nodeValue
-            upload_id = xml.getElementsByTagName(S3_UPLOADID_KEY)[
-                0
-            ].firstChild.nodeValue
-        elif proxy.storage_method == StorageMethod.GCS:
-            upload_id = upload_url_response.headers[GCS_UPLOADID_KEY]
-        else:
-            supported_methods = [StorageMethod.S3, StorageMethod.GCS]
-            raise UnexpectedStorageMethodForProxy(
-                f"Unexpected storage method: {proxy.storage_method}."
-                f" pythonik supports {supported_methods}."
-            )
+        return self._start_proxy_upload(proxy_response.data)
 
-        return PythonikResponse(response=upload_url_response, data=upload_id)
+    def _start_proxy_upload(self, proxy: Proxy) -> PythonikResponse:
+        """Start the storage upload of a proxy, returning its upload ID"""
+        upload_url, headers = self._get_upload_start_request(proxy)
+        upload_url_response = self._storage_request("POST", upload_url, headers=headers)
+        return self._parse_proxy_upload_id(proxy, upload_url_response)
 
     def get_s3_presigned_url(
         self, asset_id: str, proxy_id: str, upload_id: str, part_number: int,
@@ -407,17 +542,995 @@ class FilesSpec(Spec):
             params={"upload_id": upload_id, "parts_num": part_number},
             **kwargs
         )
+        return self.parse_response(response, S3MultipartUploadResponse)
 
-        if not response.ok:
+    def _get_s3_part_urls(
+        self,
+        asset_id: str,
+        object_id: str,
+        upload_id: str,
+        parts_num: int,
+        object_path: str = GET_ASSET_PROXY_PATH,
+    ) -> PythonikResponse:
+        """
+        The presigned URLs of parts 1 to parts_num of a multipart upload, for
+        the proxy or keyframe at object_path
+        """
+        response = self._get(
+            (object_path + MULTIPART_URL_PART_SUFFIX).format(asset_id, object_id),
+            params={"upload_id": upload_id, "parts_num": parts_num},
+        )
+        return self.parse_response(response, S3MultipartUploadResponse)
+
+    @staticmethod
+    def _new_part_urls(
+        listing: PythonikResponse, seen: Set[int], parts_num: int
+    ) -> List[Tuple[int, str]]:
+        """
+        The (part number, URL) pairs of a listing that were not seen yet, up
+        to part parts_num. Each window repeats the URLs of the previous ones,
+        and an API returning more URLs than requested saves the next windows.
+
+        Raises:
+            requests.HTTPError: If the request failed
+            UploadError: If the listing brings no new part URL
+        """
+        listing.response.raise_for_status()
+        urls = []
+        for obj in listing.data.objects:
+            if obj.number is not None and 1 <= obj.number <= parts_num and obj.number not in seen:
+                seen.add(obj.number)
+                urls.append((obj.number, obj.url))
+        if not urls:
+            missing = parts_num - len(seen)
+            raise UploadError(f"No presigned URL returned for {missing} remaining parts", listing.response)
+        return urls
+
+    def _iter_s3_part_urls(
+        self,
+        asset_id: str,
+        object_id: str,
+        upload_id: str,
+        parts_num: int,
+        batch_size: int,
+        object_path: str = GET_ASSET_PROXY_PATH,
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Yield the presigned URL of every part as the upload consumes them.
+
+        The endpoint only takes ``parts_num`` and returns the URLs of parts 1
+        to ``parts_num``, so URLs are requested in windows growing by
+        batch_size parts: each request is sent when the previous window is
+        used up, and URLs do not age while earlier parts upload.
+        """
+        seen: Set[int] = set()
+        window = 0
+        while len(seen) < parts_num:
+            window = min(parts_num, window + batch_size)
+            response = self._get_s3_part_urls(asset_id, object_id, upload_id, window, object_path)
+            yield from self._new_part_urls(response, seen, parts_num)
+
+    @staticmethod
+    def _hashed_part(path: PathLike, part: Part, digest: UploadDigest) -> memoryview:
+        """Map a part of the file and hash it, the mapped bytes being the ones sent"""
+        body = map_part(path, part)
+        digest.update(part.offset, body)
+        return body
+
+    def _put_s3_body(self, part: Part, body: memoryview, url: str) -> Tuple[int, str]:
+        """Upload one part to its presigned URL, returning its number and ETag"""
+        response = self._storage_request("PUT", url, data=body)
+        return self._part_etag(part, response)
+
+    @staticmethod
+    def _part_etag(part: Part, response: requests.Response) -> Tuple[int, str]:
+        if not response.ok or "ETag" not in response.headers:
+            raise UploadError(
+                f"Uploading part {part.number} failed with HTTP {response.status_code}", response
+            )
+        return part.number, response.headers["ETag"]
+
+    def _put_s3_parts(
+        self,
+        asset_id: str,
+        object_id: str,
+        upload_id: str,
+        path: PathLike,
+        parts: List[Part],
+        workers: int,
+        url_batch_size: int,
+        digest: UploadDigest,
+        object_path: str = GET_ASSET_PROXY_PATH,
+    ) -> Dict[int, str]:
+        """Upload the parts concurrently, returning the ETag of each part number"""
+        by_number = {part.number: part for part in parts}
+        etags: Dict[int, str] = {}
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pythonik-upload")
+        pending = set()
+        try:
+            for number, url in self._iter_s3_part_urls(
+                asset_id, object_id, upload_id, len(parts), url_batch_size, object_path
+            ):
+                part = by_number[number]
+                body = self._hashed_part(path, part, digest)
+                pending.add(executor.submit(self._put_s3_body, part, body, url))
+                # keep the queue short so URLs are not requested long before use
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    etags.update(future.result() for future in done)
+            etags.update(future.result() for future in wait(pending).done)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return etags
+
+    def _put_s3_stream(
+        self,
+        asset_id: str,
+        proxy_id: str,
+        upload_id: str,
+        parts: Iterator[Tuple[Part, memoryview]],
+        workers: int,
+        url_batch_size: int,
+        digest: UploadDigest,
+    ) -> Dict[int, str]:
+        """Upload parts as the stream produces them, returning the ETag of each part number"""
+        # the part count is unknown: windows of url_batch_size URLs are
+        # requested as parts are produced, up to the S3 maximum
+        urls = self._iter_s3_part_urls(asset_id, proxy_id, upload_id, S3_MAX_PARTS, url_batch_size)
+        known: Dict[int, str] = {}
+        etags: Dict[int, str] = {}
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pythonik-upload")
+        pending = set()
+        try:
+            for part, body in parts:
+                while part.number not in known:
+                    number, url = next(urls, (None, None))
+                    if number is None:
+                        raise UploadError(f"No presigned URL returned for part {part.number}")
+                    known[number] = url
+                digest.update(part.offset, body)
+                pending.add(executor.submit(self._put_s3_body, part, body, known.pop(part.number)))
+                # stop reading the stream while the storage is behind
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    etags.update(future.result() for future in done)
+            etags.update(future.result() for future in wait(pending).done)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return etags
+
+    def _finish_s3_upload(
+        self,
+        asset_id: str,
+        object_id: str,
+        upload_id: str,
+        etags: Dict[int, str],
+        object_path: str = GET_ASSET_PROXY_PATH,
+    ) -> PythonikResponse:
+        complete_url = self._get_s3_complete_url(object_path, asset_id, object_id, upload_id)
+        if not complete_url.response.ok:
+            return complete_url
+        response = self._complete_s3_upload(object_id, complete_url.data, etags)
+        return PythonikResponse(response=response, data=upload_id)
+
+    def _complete_s3_upload(self, object_id: str, complete_url: str, etags: Dict[int, str]) -> requests.Response:
+        response = self._storage_request(
+            "POST",
+            complete_url,
+            data=s3_complete_body(etags),
+            headers={"Content-Type": "application/xml"},
+        )
+        return self._check_s3_completion(object_id, response)
+
+    @staticmethod
+    def _check_s3_completion(object_id: str, response: requests.Response) -> requests.Response:
+        error = s3_error(response)
+        if error:
+            raise UploadError(f"Completing the upload of {object_id} failed: {error}", response)
+        return response
+
+    def upload_proxy_file(
+        self,
+        asset_id: str,
+        proxy_id: str,
+        path: PathLike,
+        part_size: int = DEFAULT_PART_SIZE,
+        workers: int = 4,
+        url_batch_size: int = DEFAULT_URL_BATCH_SIZE,
+        state_path: Optional[PathLike] = None,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        """
+        Upload a file as the content of a proxy.
+
+        On S3 the file is sent with a parallel multipart upload. On GCS it is
+        sent in chunks of ``part_size`` bytes through a resumable session, see
+        :meth:`upload_resumable`.
+
+        The file is split into parts of ``part_size`` bytes (grown if the file
+        would need more than 10,000 parts). Their presigned URLs are requested
+        ``url_batch_size`` parts ahead as the upload progresses, and up to
+        ``workers`` parts are uploaded at the same time. Failed part requests
+        are retried by the storage session. Once every part is stored, the
+        upload is completed with the collected ETags.
+
+        Memory use is bounded by ``workers * part_size``.
+
+        Args:
+            asset_id: Asset ID
+            proxy_id: ID of the proxy to upload, created beforehand
+            path: File to upload
+            part_size: Size of each part in bytes, at least 5 MiB
+            workers: Maximum number of parts uploaded concurrently
+            url_batch_size: Number of parts each request for presigned part
+                URLs reaches ahead. The endpoint returns the URLs of parts 1
+                to ``parts_num``, so each request asks for ``url_batch_size``
+                more parts than the previous one
+            state_path: GCS only, file recording the upload session so that
+                it can be resumed after a restart
+            hashes: hashlib objects (e.g. ``hashlib.md5()``) updated with
+                the uploaded bytes, to get the file checksum without reading
+                the file twice
+
+        Returns:
+            PythonikResponse wrapping the completion response, with the upload
+            ID as data. If an Iconik request fails, its response is returned
+            with no data instead.
+
+        Raises:
+            UnexpectedStorageMethodForProxy: If the proxy is neither on S3 nor GCS
+            UploadError: If a part or the completion is rejected by the storage
+
+        Example:
+            proxy = client.files().create_asset_proxy(asset_id, body=proxy_body).data
+            md5 = hashlib.md5()
+            client.files().upload_proxy_file(asset_id, proxy.id, "proxy.mp4", workers=8, hashes=[md5])
+            checksum = md5.hexdigest()
+        """
+        proxy_response = self.get_asset_proxy(asset_id, proxy_id)
+        if not proxy_response.response.ok:
+            return proxy_response
+        return self._upload_proxy(
+            asset_id, proxy_response.data, path, part_size, workers, url_batch_size, state_path, hashes
+        )
+
+    def _upload_proxy(
+        self,
+        asset_id: str,
+        proxy: Proxy,
+        path: PathLike,
+        part_size: int = DEFAULT_PART_SIZE,
+        workers: int = 4,
+        url_batch_size: int = DEFAULT_URL_BATCH_SIZE,
+        state_path: Optional[PathLike] = None,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        """Upload the content of an already fetched proxy, see :meth:`upload_proxy_file`"""
+        if proxy.storage_method != StorageMethod.S3:
+            return self.upload_resumable(
+                proxy, path, chunk_size=part_size, state_path=state_path, hashes=hashes
+            )
+
+        proxy_id = proxy.id
+        started = self._start_proxy_upload(proxy)
+        if not started.response.ok:
+            return started
+        upload_id = started.data
+
+        size = os.path.getsize(path)
+        parts = plan_parts(size, s3_part_size(size, part_size))
+        etags = self._put_s3_parts(
+            asset_id, proxy_id, upload_id, path, parts, workers, url_batch_size, UploadDigest(hashes)
+        )
+        return self._finish_s3_upload(asset_id, proxy_id, upload_id, etags)
+
+    def bulk_ingest_proxies(
+        self,
+        items: Iterable[ProxyIngestItem],
+        concurrency: int = 8,
+        workers: int = 2,
+        part_size: int = DEFAULT_PART_SIZE,
+        close: bool = True,
+        on_result: Optional[Callable[[ProxyIngestResult], None]] = None,
+    ) -> List[ProxyIngestResult]:
+        """
+        Create and upload proxies for many assets concurrently.
+
+        Each item goes through ``create_asset_proxy``, the upload of its file
+        (S3 multipart or GCS resumable) and, with ``close``, setting the
+        proxy status to CLOSED. The proxy returned by the creation is used
+        for the upload directly, without fetching it again.
+
+        Up to ``concurrency`` items are in flight at once, each uploading up
+        to ``workers`` parts at a time, so at most ``concurrency * workers``
+        transfers run together. Items are read from ``items`` as slots free
+        up, so a generator over a large backlog is not loaded in memory.
+        Size the client's ``pool_maxsize`` to ``concurrency`` and its
+        storage session to ``concurrency * workers`` connections.
+
+        A failing item does not stop the others: its result records the
+        stage that failed and why.
+
+        Args:
+            items: Proxies to create and upload
+            concurrency: Maximum number of items processed at once
+            workers: Maximum number of parts uploaded at once per item
+            part_size: Size of each part (S3) or chunk (GCS) in bytes
+            close: Set the status of each uploaded proxy to CLOSED
+            on_result: Called with each result as soon as its item is done,
+                e.g. to record progress
+
+        Returns:
+            One ProxyIngestResult per item, in the order of items
+
+        Example:
+            items = [ProxyIngestItem(asset_id, path, Proxy(name="proxy.mp4")) for asset_id, path in backlog]
+            failed = [r for r in client.files().bulk_ingest_proxies(items, concurrency=16) if not r.ok]
+        """
+        return self._run_bulk(
+            lambda item: self._ingest_proxy(item, workers, part_size, close),
+            items,
+            concurrency,
+            on_result,
+        )
+
+    @staticmethod
+    def _run_bulk(
+        process: Callable[[Any], Any],
+        items: Iterable[Any],
+        concurrency: int,
+        on_result: Optional[Callable[[Any], None]],
+    ) -> List[Any]:
+        """Run process over items on up to concurrency threads, returning the results in order"""
+        results: Dict[int, Any] = {}
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pythonik-ingest")
+        pending = {}
+
+        def collect(done):
+            for future in done:
+                result = future.result()
+                results[pending.pop(future)] = result
+                if on_result is not None:
+                    on_result(result)
+
+        try:
+            for index, item in enumerate(items):
+                pending[executor.submit(process, item)] = index
+                if len(pending) >= concurrency * 2:
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            collect(wait(pending).done)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return [results[index] for index in sorted(results)]
+
+    def _ingest_proxy(
+        self, item: ProxyIngestItem, workers: int, part_size: int, close: bool
+    ) -> ProxyIngestResult:
+        """Create, upload and close one proxy, reporting the stage it reached"""
+        result = ProxyIngestResult(item=item, stage=INGEST_CREATE)
+        try:
+            created = self.create_asset_proxy(item.asset_id, body=item.proxy)
+            if not self._ingest_step(result, created):
+                return result
+            result.proxy = created.data
+
+            result.stage = INGEST_UPLOAD
+            uploaded = self._upload_proxy(
+                item.asset_id, created.data, item.path, part_size=part_size, workers=workers
+            )
+            if not self._ingest_step(result, uploaded):
+                return result
+            result.upload_id = uploaded.data
+
+            if close:
+                result.stage = INGEST_CLOSE
+                closed = self.update_asset_proxy(
+                    item.asset_id, created.data.id, {"status": FileStatus.CLOSED.value}
+                )
+                if not self._ingest_step(result, closed):
+                    return result
+            result.stage = INGEST_DONE
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            result.response = getattr(e, "response", None)
+        return result
+
+    @staticmethod
+    def _ingest_step(
+        result: Union[ProxyIngestResult, KeyframeIngestResult], step: PythonikResponse
+    ) -> bool:
+        """Record a failed Iconik or storage response on the result"""
+        if step.response.ok:
+            return True
+        result.error = f"HTTP {step.response.status_code}"
+        result.response = step.response
+        return False
+
+    def upload_proxy_stream(
+        self,
+        asset_id: str,
+        proxy_id: str,
+        source: StreamSource,
+        part_size: int = DEFAULT_PART_SIZE,
+        workers: int = 4,
+        url_batch_size: int = DEFAULT_URL_BATCH_SIZE,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        """
+        Upload a proxy from a stream whose size is not known in advance, such
+        as a pipe, a generator or a file a transcoder is still writing.
+
+        Each part is uploaded as soon as ``part_size`` bytes have been read,
+        while the rest of the stream is still being produced, and the upload
+        is completed when the stream ends. Wrap a file that is still being
+        written in :class:`pythonik.uploads.GrowingFile` so that reads wait for
+        the producer instead of stopping at the current end of the file.
+
+        Reading pauses while ``workers * 2`` parts are waiting to be uploaded,
+        so memory use stays bounded whatever the stream length. As S3 allows
+        at most 10,000 parts, the stream can be at most ``part_size * 10000``
+        bytes long.
+
+        Args:
+            asset_id: Asset ID
+            proxy_id: ID of the proxy to upload, created beforehand
+            source: Binary file object or iterable of byte chunks
+            part_size: Size of each part in bytes, at least 5 MiB
+            workers: Maximum number of parts uploaded concurrently
+            url_batch_size: Number of parts each request for presigned part
+                URLs reaches ahead. The endpoint returns the URLs of parts 1
+                to ``parts_num``, so each request asks for ``url_batch_size``
+                more parts than the previous one
+            hashes: hashlib objects updated with the uploaded bytes
+
+        Returns:
+            PythonikResponse wrapping the completion response, with the upload
+            ID as data. If an Iconik request fails, its response is returned
+            with no data instead.
+
+        Raises:
+            UnexpectedStorageMethodForProxy: If the proxy is not stored on S3
+            UploadError: If a part or the completion is rejected by the
+                storage, or the stream is too long for part_size
+
+        Example:
+            process = subprocess.Popen(["ffmpeg", ..., "proxy.mp4"])
+            source = GrowingFile("proxy.mp4", finished=lambda: process.poll() is not None)
+            client.files().upload_proxy_stream(asset_id, proxy_id, source)
+        """
+        proxy_response = self.get_asset_proxy(asset_id, proxy_id)
+        if not proxy_response.response.ok:
+            return proxy_response
+        self._require_s3(proxy_response.data)
+
+        started = self._start_proxy_upload(proxy_response.data)
+        if not started.response.ok:
+            return started
+        upload_id = started.data
+
+        parts = iter_stream_parts(source, max(part_size, S3_MIN_PART_SIZE))
+        etags = self._put_s3_stream(
+            asset_id, proxy_id, upload_id, parts, workers, url_batch_size, UploadDigest(hashes)
+        )
+        return self._finish_s3_upload(asset_id, proxy_id, upload_id, etags)
+
+    @staticmethod
+    def _require_s3(proxy: Proxy):
+        if proxy.storage_method != StorageMethod.S3:
+            raise UnexpectedStorageMethodForProxy(
+                f"Unexpected storage method: {proxy.storage_method}."
+                f" Streaming uploads require {StorageMethod.S3}."
+            )
+
+    def _start_gcs_session(
+        self, target: Union[Proxy, Keyframe], size: int, mtime_ns: int
+    ) -> Tuple[requests.Response, Optional[ResumableState]]:
+        """Open a resumable session, returning the response and, on success, its state"""
+        upload_url, headers = self._get_upload_start_request(target)
+        response = self._storage_request("POST", upload_url, headers=headers)
+        return response, self._gcs_session_state(response, size, mtime_ns)
+
+    @staticmethod
+    def _gcs_session_state(
+        response: requests.Response, size: int, mtime_ns: int
+    ) -> Optional[ResumableState]:
+        if not response.ok or GCS_KEYFRAME_LOCATION_KEY not in response.headers:
+            return None
+        return ResumableState(
+            session_uri=response.headers[GCS_KEYFRAME_LOCATION_KEY],
+            upload_id=response.headers.get(GCS_UPLOADID_KEY, ""),
+            size=size,
+            mtime_ns=mtime_ns,
+        )
+
+    @staticmethod
+    def _require_gcs(target: Union[Proxy, Keyframe]):
+        if target.storage_method != StorageMethod.GCS:
+            raise UnexpectedStorageMethodForProxy(
+                f"Unexpected storage method: {target.storage_method}."
+                f" Resumable uploads require {StorageMethod.GCS}."
+            )
+
+    @staticmethod
+    def _gcs_chunk_request(
+        path: PathLike, offset: Optional[int], chunk_size: int, size: int, digest: UploadDigest
+    ) -> Dict[str, Any]:
+        """Request kwargs sending the chunk at offset, or querying the status when offset is None"""
+        if offset is None:
+            data = b""
+        else:
+            data = map_part(path, Part(0, offset, min(chunk_size, size - offset)))
+            # a session resumed from a state file starts past bytes not hashed yet
+            digest.catch_up(path, offset)
+            digest.update(offset, data)
+        content_range = gcs_content_range(offset or 0, len(data), size)
+        return {"data": data, "headers": {"Content-Range": content_range}}
+
+    @staticmethod
+    def _gcs_progress(response: requests.Response) -> Optional[int]:
+        """
+        Interpret the answer to a chunk or a status query.
+
+        Returns:
+            The persisted offset to continue from, or None when the upload is complete
+
+        Raises:
+            UploadError: If the session is gone or the storage rejected the
+                chunk, retryable statuses raise with ``retryable`` set
+        """
+        status = response.status_code
+        if status in (200, 201):
+            return None
+        if status == GCS_RESUME_INCOMPLETE:
+            return gcs_committed(response)
+        raise UploadError(
+            f"Resumable upload failed with HTTP {status}",
+            response,
+            retryable=status in RESUMABLE_RETRY_STATUSES,
+        )
+
+    def _drive_gcs_upload(
+        self,
+        state: ResumableState,
+        path: PathLike,
+        offset: Optional[int],
+        chunk_size: int,
+        max_retries: int,
+        digest: UploadDigest,
+    ) -> requests.Response:
+        """
+        Send the file from offset through the session, or first ask GCS what
+        it has persisted when offset is None. After a connection error or a
+        retryable status the persisted offset is queried and the upload
+        resumes from there.
+        """
+        failures = 0
+        while True:
+            try:
+                response = self._storage_request(
+                    "PUT",
+                    state.session_uri,
+                    allow_redirects=False,
+                    **self._gcs_chunk_request(path, offset, chunk_size, state.size, digest),
+                )
+                offset = self._gcs_progress(response)
+            except (requests.ConnectionError, requests.Timeout, UploadError) as e:
+                if isinstance(e, UploadError) and not e.retryable:
+                    raise
+                failures += 1
+                if failures > max_retries:
+                    raise UploadError(
+                        f"Resumable upload failed after {max_retries} retries: {e}",
+                        getattr(e, "response", None),
+                    ) from e
+                time.sleep(resume_delay(failures))
+                offset = None
+                continue
+            if offset is None:
+                return response
+            failures = 0
+
+    def upload_resumable(
+        self,
+        target: Union[Proxy, Keyframe],
+        path: PathLike,
+        chunk_size: int = DEFAULT_GCS_CHUNK_SIZE,
+        state_path: Optional[PathLike] = None,
+        max_retries: int = 5,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        """
+        Upload a file to a GCS proxy or keyframe through a chunked resumable session.
+
+        The file is streamed in chunks of ``chunk_size`` bytes, so memory use
+        is bounded by one chunk. When a chunk fails (connection reset,
+        timeout, 429 or 5xx), the offset GCS has persisted is queried and the
+        upload continues from there instead of starting over.
+
+        With ``state_path``, the session URI is saved there when the session
+        starts. A later call with the same file and state_path resumes the
+        session, even from another process, as long as the file has not
+        changed. The state file is removed once the upload completes.
+
+        Args:
+            target: Proxy or Keyframe stored on GCS, with its upload_url
+            path: File to upload
+            chunk_size: Bytes per request, a multiple of 256 KiB
+            state_path: File recording the session so it can be resumed later
+            max_retries: Consecutive failed attempts tolerated before giving up
+            hashes: hashlib objects updated with the uploaded bytes
+
+        Returns:
+            PythonikResponse wrapping the final storage response, with the
+            upload ID as data. If the session cannot be started, the storage
+            response is returned with no data.
+
+        Raises:
+            ValueError: If chunk_size is not a multiple of 256 KiB
+            UnexpectedStorageMethodForProxy: If the target is not stored on GCS
+            UploadError: If the session expired or the upload kept failing
+
+        Example:
+            proxy = client.files().get_asset_proxy(asset_id, proxy_id).data
+            client.files().upload_resumable(proxy, "proxy.mp4", state_path="proxy.mp4.upload")
+        """
+        check_gcs_chunk_size(chunk_size)
+        self._require_gcs(target)
+        stat = os.stat(path)
+        digest = UploadDigest(hashes)
+
+        state = ResumableState.load(state_path, stat.st_size, stat.st_mtime_ns) if state_path else None
+        if state is not None:
+            try:
+                response = self._drive_gcs_upload(state, path, None, chunk_size, max_retries, digest)
+                ResumableState.clear(state_path)
+                return PythonikResponse(response=response, data=state.upload_id)
+            except UploadError as e:
+                if e.response is None or e.response.status_code not in GCS_SESSION_GONE:
+                    raise
+                # the saved session expired, start over
+
+        response, state = self._start_gcs_session(target, stat.st_size, stat.st_mtime_ns)
+        if state is None:
             return PythonikResponse(response=response, data=None)
+        if state_path:
+            state.save(state_path)
+        response = self._drive_gcs_upload(state, path, 0, chunk_size, max_retries, digest)
+        if state_path:
+            ResumableState.clear(state_path)
+        return PythonikResponse(response=response, data=state.upload_id)
+
+    def upload_keyframe_file(
+        self,
+        asset_id: str,
+        keyframe_id: str,
+        path: PathLike,
+        chunk_size: int = DEFAULT_GCS_CHUNK_SIZE,
+        state_path: Optional[PathLike] = None,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        """
+        Upload a file as the content of a keyframe.
 
-        return self.parse_response(response, S3MultipartUploadResponse)
+        On GCS the file goes through a resumable session, see
+        :meth:`upload_resumable`. On S3 it is sent as a multipart upload,
+        usually of a single part as keyframe images are small, and completed
+        with the part ETags.
+
+        Args:
+            asset_id: Asset ID
+            keyframe_id: ID of the keyframe to upload, created beforehand
+            path: File to upload
+            chunk_size: Bytes per request, a multiple of 256 KiB. On S3 the
+                part size, at least 5 MiB
+            state_path: GCS only, file recording the session so it can be
+                resumed later
+            hashes: hashlib objects updated with the uploaded bytes
+
+        Returns:
+            PythonikResponse with the upload ID as data, or the failed keyframe
+            lookup response
+
+        Raises:
+            UnexpectedStorageMethodForProxy: If the keyframe is neither on S3 nor GCS
+            UploadError: If the storage rejected the upload
+        """
+        keyframe_response = self.get_asset_keyframe(asset_id, keyframe_id)
+        if not keyframe_response.response.ok:
+            return keyframe_response
+        return self._upload_keyframe(
+            asset_id, keyframe_response.data, path, chunk_size, state_path, hashes
+        )
+
+    def _upload_keyframe(
+        self,
+        asset_id: str,
+        keyframe: Keyframe,
+        path: PathLike,
+        chunk_size: int = DEFAULT_GCS_CHUNK_SIZE,
+        state_path: Optional[PathLike] = None,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        """Upload the content of an already fetched keyframe, see :meth:`upload_keyframe_file`"""
+        if keyframe.storage_method != StorageMethod.S3:
+            return self.upload_resumable(
+                keyframe, path, chunk_size=chunk_size, state_path=state_path, hashes=hashes
+            )
+
+        started = self.get_upload_id_for_keyframe(keyframe)
+        if not started.response.ok:
+            return started
+        upload_id = started.data
+
+        size = os.path.getsize(path)
+        parts = plan_parts(size, s3_part_size(size, chunk_size))
+        etags = self._put_s3_parts(
+            asset_id,
+            keyframe.id,
+            upload_id,
+            path,
+            parts,
+            1,
+            DEFAULT_URL_BATCH_SIZE,
+            UploadDigest(hashes),
+            GET_ASSET_KEYFRAME,
+        )
+        return self._finish_s3_upload(asset_id, keyframe.id, upload_id, etags, GET_ASSET_KEYFRAME)
+
+    def bulk_upload_keyframes(
+        self,
+        items: Iterable[KeyframeIngestItem],
+        concurrency: int = 16,
+        chunk_size: int = DEFAULT_GCS_CHUNK_SIZE,
+        close: bool = True,
+        on_result: Optional[Callable[[KeyframeIngestResult], None]] = None,
+    ) -> List[KeyframeIngestResult]:
+        """
+        Create and upload many keyframes concurrently, such as the frames of
+        a storyboard.
+
+        Each item goes through ``create_asset_keyframe``, the upload of its
+        image (GCS resumable session or S3 multipart upload) and, with
+        ``close``, setting the keyframe status to CLOSED. The keyframe
+        returned by the creation is used for the upload directly, without
+        fetching it again, so each frame costs three Iconik requests and
+        its storage requests, and up to ``concurrency`` frames are in
+        flight at once instead of one after the other.
+
+        A failing item does not stop the others: its result records the
+        stage that failed and why, see :meth:`bulk_ingest_proxies`.
+
+        Args:
+            items: Keyframes to create and upload
+            concurrency: Maximum number of keyframes processed at once
+            chunk_size: GCS chunk size, a multiple of 256 KiB, or S3 part size
+            close: Set the status of each uploaded keyframe to CLOSED
+            on_result: Called with each result as soon as its item is done
+
+        Returns:
+            One KeyframeIngestResult per item, in the order of items
+
+        Example:
+            items = [
+                KeyframeIngestItem(asset_id, path, Keyframe(name=path.name, type="STORYBOARD"))
+                for path in sorted(frames_dir.glob("*.jpg"))
+            ]
+            failed = [r for r in client.files().bulk_upload_keyframes(items) if not r.ok]
+        """
+        return self._run_bulk(
+            lambda item: self._ingest_keyframe(item, chunk_size, close),
+            items,
+            concurrency,
+            on_result,
+        )
+
+    def _ingest_keyframe(
+        self, item: KeyframeIngestItem, chunk_size: int, close: bool
+    ) -> KeyframeIngestResult:
+        """Create, upload and close one keyframe, reporting the stage it reached"""
+        result = KeyframeIngestResult(item=item, stage=INGEST_CREATE)
+        try:
+            created = self.create_asset_keyframe(item.asset_id, body=item.keyframe)
+            if not self._ingest_step(result, created):
+                return result
+            result.keyframe = created.data
+
+            result.stage = INGEST_UPLOAD
+            uploaded = self._upload_keyframe(
+                item.asset_id, created.data, item.path, chunk_size=chunk_size
+            )
+            if not self._ingest_step(result, uploaded):
+                return result
+            result.upload_id = uploaded.data
+
+            if close:
+                result.stage = INGEST_CLOSE
+                closed = self.partial_update_keyframe(
+                    item.asset_id, created.data.id, {"status": FileStatus.CLOSED.value}
+                )
+                if not self._ingest_step(result, closed):
+                    return result
+            result.stage = INGEST_DONE
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            result.response = getattr(e, "response", None)
+        return result
+
+    def download(
+        self,
+        source: Union[str, File, Proxy, Keyframe],
+        dest: PathLike,
+        part_size: int = DEFAULT_DOWNLOAD_PART_SIZE,
+        workers: int = 4,
+        checksum: Optional[str] = None,
+        checksum_algorithm: str = DEFAULT_CHECKSUM_ALGORITHM,
+        resume: bool = True,
+        max_retries: int = 3,
+    ) -> PythonikResponse:
+        """
+        Download a file, proxy or keyframe with concurrent HTTP Range requests.
+
+        The destination is preallocated to the object size and every part is
+        written into its place through a memory map, by up to ``workers``
+        parallel requests. The parts already written are recorded in a
+        ``<dest>.download`` sidecar, so an interrupted download resumes with
+        the missing parts only, as long as the object has not changed. When
+        the storage does not support ranges, the body is downloaded in a
+        single stream.
+
+        Args:
+            source: Signed URL, or a File, Proxy or Keyframe with a ``url``
+            dest: Path of the file to write
+            part_size: Size of each ranged request in bytes
+            workers: Maximum number of parts downloaded concurrently
+            checksum: Expected hex digest of the file, defaults to the
+                ``checksum`` of a File
+            checksum_algorithm: hashlib algorithm of the checksum
+            resume: Continue a previous download of dest when possible
+            max_retries: Attempts per part after a connection error, a
+                truncated body or a throttling or server error
+
+        Returns:
+            PythonikResponse wrapping the first storage response, with the
+            destination path as data
+
+        Raises:
+            ValueError: If source has no download URL
+            DownloadError: If the storage rejects a request, a part keeps
+                failing or the checksum does not match
+
+        Example:
+            file = client.files().get_asset_files(asset_id, generate_signed_url=True).data.objects[0]
+            client.files().download(file, "/restore/master.mov", workers=8)
+        """
+        url, known_checksum = download_source(source)
+        checksum = checksum or known_checksum
+
+        size = None
+        with self._storage_request("GET", url, headers={"Range": "bytes=0-0"}, stream=True) as probe:
+            if probe.status_code == 200:
+                # ranges not supported, take the body as it comes
+                with open(dest, "wb") as f:
+                    for chunk in probe.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+            else:
+                size = self._download_size(probe)
+        if size is not None:
+            self._download_parts(
+                url, dest, size, probe.headers.get("ETag", ""), part_size, workers, resume, max_retries
+            )
+
+        if checksum:
+            verify_checksum(dest, checksum, checksum_algorithm)
+        return PythonikResponse(response=probe, data=os.fspath(dest))
+
+    @staticmethod
+    def _download_size(probe: requests.Response) -> int:
+        """Object size from the answer to the first byte range, an empty object answers 416"""
+        size = content_range_size(probe)
+        if probe.status_code not in (206, 416) or size is None:
+            raise DownloadError(f"Download failed with HTTP {probe.status_code}", probe)
+        return size
+
+    @staticmethod
+    def _download_state(
+        dest: PathLike, size: int, etag: str, part_size: int, resume: bool
+    ) -> DownloadState:
+        """State of a previous download of dest to continue, or a new one for a preallocated dest"""
+        state_path = download_state_path(dest)
+        if resume and os.path.exists(dest) and os.path.getsize(dest) == size:
+            state = DownloadState.load(state_path, size, etag, part_size)
+            if state is not None:
+                return state
+        state = DownloadState(size=size, etag=etag, part_size=part_size)
+        preallocate(dest, size)
+        state.save(state_path)
+        return state
+
+    @staticmethod
+    def _part_response_error(part: Part, response) -> Optional[DownloadError]:
+        if response.status_code == 206 and response.headers.get("Content-Range", "").startswith(
+            f"bytes {part.offset}-"
+        ):
+            return None
+        return DownloadError(
+            f"Downloading part {part.number} failed with HTTP {response.status_code}",
+            response,
+            retryable=response.status_code in STORAGE_RETRY_STATUSES,
+        )
+
+    def _download_parts(
+        self,
+        url: str,
+        dest: PathLike,
+        size: int,
+        etag: str,
+        part_size: int,
+        workers: int,
+        resume: bool,
+        max_retries: int,
+    ):
+        state = self._download_state(dest, size, etag, part_size, resume)
+        state_path = download_state_path(dest)
+        parts = [
+            part
+            for part in plan_parts(size, part_size)
+            if part.length and part.number not in state.done
+        ]
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pythonik-download")
+        try:
+            futures = [
+                executor.submit(self._download_part, url, dest, part, max_retries) for part in parts
+            ]
+            for future in as_completed(futures):
+                state.done.append(future.result())
+                state.save(state_path)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        DownloadState.clear(state_path)
+
+    def _download_part(self, url: str, dest: PathLike, part: Part, max_retries: int) -> int:
+        """Download one part into its place in dest, returning its number"""
+        failures = 0
+        while True:
+            try:
+                with self._storage_request(
+                    "GET", url, headers={"Range": range_header(part)}, stream=True
+                ) as response:
+                    error = self._part_response_error(part, response)
+                    if error is not None:
+                        raise error
+                    with PartWriter(dest, part) as writer:
+                        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                            writer.write(chunk)
+                return part.number
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+                DownloadError,
+            ) as e:
+                if isinstance(e, DownloadError) and not e.retryable:
+                    raise
+                failures += 1
+                if failures > max_retries:
+                    raise DownloadError(
+                        f"Downloading part {part.number} failed after {max_retries} retries: {e}",
+                        getattr(e, "response", None),
+                    ) from e
+                time.sleep(resume_delay(failures))
 
     def get_s3_complete_url(
         self, asset_id: str, proxy_id: str, upload_id: str, **kwargs
     ) -> PythonikResponse:
+        return self._get_s3_complete_url(GET_ASSET_PROXY_PATH, asset_id, proxy_id, upload_id, **kwargs)
+
+    def _get_s3_complete_url(
+        self, object_path: str, asset_id: str, object_id: str, upload_id: str, **kwargs
+    ) -> PythonikResponse:
+        """URL completing the multipart upload of the proxy or keyframe at object_path"""
         response = self._get(
-            GET_ASSET_PROXIES_MULTIPART_COMPLETE_URL_PATH.format(asset_id, proxy_id),
+            (object_path + MULTIPART_URL_SUFFIX).format(asset_id, object_id),
             params={"upload_id": upload_id, "type": "complete_url"},
             **kwargs
         )
@@ -430,6 +1543,23 @@ class FilesSpec(Spec):
 
         return self.parse_response(resp, Proxies)
 
+    def iter_asset_proxies(self, asset_id: str, **kwargs) -> Iterator[Proxy]:
+        """Lazily iterate over every proxy of an asset, page by page
+
+        Args:
+            asset_id: The ID of the asset
+            **kwargs: Additional arguments to pass to the first page request
+                (``prefetch=N`` reads N pages ahead on a background worker,
+                ``parallel=N`` fetches N pages concurrently)
+
+        Returns:
+            Iterator of Proxy
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_objects(self.get_asset_proxies, asset_id, **kwargs)
+
     def create_asset_format(
         self, asset_id: str, body: Union[FormatCreate, Dict[str, Any]], exclude_defaults: bool = True, **kwargs
     ) -> Response:
@@ -537,6 +1667,23 @@ class FilesSpec(Spec):
         resp = self._get(GET_ASSETS_FILE_SETS_PATH.format(asset_id), **kwargs)
         return self.parse_response(resp, FileSets)
 
+    def iter_asset_file_sets(self, asset_id: str, **kwargs) -> Iterator[FileSet]:
+        """Lazily iterate over every file set of an asset, page by page
+
+        Args:
+            asset_id: The ID of the asset
+            **kwargs: Additional arguments to pass to the first page request
+                (``prefetch=N`` reads N pages ahead on a background worker,
+                ``parallel=N`` fetches N pages concurrently)
+
+        Returns:
+            Iterator of FileSet
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_objects(self.get_asset_filesets, asset_id, **kwargs)
+
     def get_asset_formats(self, asset_id: str, **kwargs) -> Response:
         """Get all formats associated with an asset
         
@@ -550,6 +1697,23 @@ class FilesSpec(Spec):
         resp = self._get(GET_ASSETS_FORMATS_PATH.format(asset_id), **kwargs)
         return self.parse_response(resp, Formats)
 
+    def iter_asset_formats(self, asset_id: str, **kwargs) -> Iterator[Format]:
+        """Lazily iterate over every format of an asset, page by page
+
+        Args:
+            asset_id: The ID of the asset
+            **kwargs: Additional arguments to pass to the first page request
+                (``prefetch=N`` reads N pages ahead on a background worker,
+                ``parallel=N`` fetches N pages concurrently)
+
+        Returns:
+            Iterator of Format
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_objects(self.get_asset_formats, asset_id, **kwargs)
+
     def get_asset_format(self, asset_id: str, format_id: str, **kwargs) -> Response:
         """Get a specific format for an asset
         
@@ -577,6 +1741,23 @@ class FilesSpec(Spec):
         resp = self._get(GET_ASSETS_FILES_PATH.format(asset_id), **kwargs)
         return self.parse_response(resp, Files)
 
+    def iter_asset_files(self, asset_id: str, **kwargs) -> Iterator[File]:
+        """Lazily iterate over every file of an asset, page by page
+
+        Args:
+            asset_id: The ID of the asset
+            **kwargs: Additional arguments to pass to the first page request
+                (``prefetch=N`` reads N pages ahead on a background worker,
+                ``parallel=N`` fetches N pages concurrently)
+
+        Returns:
+            Iterator of File
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_objects(self.get_asset_files, asset_id, **kwargs)
+
     def get_storage(self, storage_id: str, **kwargs):
         """Get metadata for a specific storage
         
@@ -901,6 +2082,37 @@ class FilesSpec(Spec):
         )
         return self.parse_response(resp, Files)
 
+    def partial_update_storage_file(
+        self,
+        storage_id: str,
+        file_id: str,
+        body: Union[File, Dict[str, Any]],
+        exclude_defaults: bool = True,
+        **kwargs,
+    ) -> Response:
+        """
+        Partially update a file of a storage using PATCH, e.g. the size and
+        status of a GROWING file
+
+        Args:
+            storage_id: The ID of the storage
+            file_id: The ID of the file to update
+            body: Fields to update, either as File model or dict
+            exclude_defaults: Whether to exclude default values when dumping
+                Pydantic models
+            **kwargs: Additional arguments to pass to the request
+
+        Returns:
+            Response(model=File)
+        """
+        json_data = self._prepare_model_data(body, exclude_defaults=exclude_defaults)
+        resp = self._patch(
+            GET_STORAGE_FILE_PATH.format(storage_id, file_id),
+            json=json_data,
+            **kwargs,
+        )
+        return self.parse_response(resp, File)
+
     def list_asset_format_components(
         self, asset_id: str, format_id: str, **kwargs
     ) -> Response:
@@ -921,6 +2133,110 @@ class FilesSpec(Spec):
         )
         return self.parse_response(resp, PaginatedResponse)
 
+    def get_asset_bundle(
+        self,
+        asset_id: str,
+        version_id: Optional[str] = None,
+        components: bool = True,
+        workers: int = 8,
+    ) -> AssetBundle:
+        """
+        Get the formats, file sets, files, proxies and keyframes of an asset
+        in one call.
+
+        The five listings are requested concurrently, and the components of
+        each format as soon as the formats have arrived, so the whole asset
+        is known after about two round trips instead of six to ten requests
+        made one after the other. Every page of each listing is read.
+
+        Args:
+            asset_id: ID of the asset
+            version_id: Only include this version, through the version
+                listings of formats, file sets and files. Proxies and
+                keyframes are filtered on their version_id.
+            components: Replace the components embedded in each format with
+                those listed by :meth:`list_asset_format_components`
+            workers: Maximum number of concurrent requests
+
+        Returns:
+            AssetBundle, whose helpers link files to their file set and
+            format
+
+        Raises:
+            requests.HTTPError: If a request fails
+
+        Example:
+            bundle = client.files().get_asset_bundle(asset_id)
+            for file in bundle.files:
+                print(file.name, bundle.file_set_of(file).name, bundle.format_of(file).name)
+        """
+        listings = self._bundle_listings(asset_id, version_id)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pythonik-bundle") as executor:
+            pending = {
+                name: executor.submit(self._collect_objects, *listing) for name, listing in listings.items()
+            }
+            formats = pending.pop("formats").result()
+            if components:
+                fetched = [
+                    executor.submit(
+                        self._collect_objects,
+                        self.list_asset_format_components,
+                        asset_id,
+                        fmt.id,
+                        object_model=Component,
+                    )
+                    for fmt in formats
+                ]
+                for fmt, future in zip(formats, fetched):
+                    fmt.components = future.result()
+            listed = {name: future.result() for name, future in pending.items()}
+        return self._asset_bundle(asset_id, version_id, formats, listed)
+
+    def _bundle_listings(
+        self, asset_id: str, version_id: Optional[str]
+    ) -> Dict[str, Tuple[Any, ...]]:
+        """The listing method and arguments of each part of an asset bundle"""
+        if version_id:
+            return {
+                "formats": (self.get_asset_formats_by_version, asset_id, version_id),
+                "file_sets": (self.get_asset_file_sets_by_version, asset_id, version_id),
+                "files": (self.get_asset_files_by_version, asset_id, version_id),
+                "proxies": (self.get_asset_proxies, asset_id),
+                "keyframes": (self.get_asset_keyframes, asset_id),
+            }
+        return {
+            "formats": (self.get_asset_formats, asset_id),
+            "file_sets": (self.get_asset_filesets, asset_id),
+            "files": (self.get_asset_files, asset_id),
+            "proxies": (self.get_asset_proxies, asset_id),
+            "keyframes": (self.get_asset_keyframes, asset_id),
+        }
+
+    def _collect_objects(
+        self, fetch_page: Callable[..., PythonikResponse], *args, object_model: Optional[Type[BaseModel]] = None
+    ) -> List[Any]:
+        """Every object of a paginated listing"""
+        return list(self._iter_objects(fetch_page, *args, object_model=object_model))
+
+    @staticmethod
+    def _asset_bundle(
+        asset_id: str, version_id: Optional[str], formats: List[Format], listed: Dict[str, List[Any]]
+    ) -> AssetBundle:
+        proxies, keyframes = listed["proxies"], listed["keyframes"]
+        if version_id:
+            # these listings are not scoped to a version
+            proxies = [proxy for proxy in proxies if proxy.version_id == version_id]
+            keyframes = [keyframe for keyframe in keyframes if keyframe.version_id == version_id]
+        return AssetBundle(
+            asset_id=asset_id,
+            version_id=version_id,
+            formats=formats,
+            file_sets=listed["file_sets"],
+            files=listed["files"],
+            proxies=proxies,
+            keyframes=keyframes,
+        )
+
     def list_storage_files(self, storage_id: str, **kwargs) -> Response:
         """
         Get all files on a storage, or files in a storage folder.
@@ -935,14 +2251,91 @@ class FilesSpec(Spec):
         resp = self._get(GET_STORAGE_FILES_PATH.format(storage_id), **kwargs)
         return self.parse_response(resp, Files)
 
+    def iter_storage_files(self, storage_id: str, **kwargs) -> Iterator[File]:
+        """
+        Lazily iterate over every file on a storage (or in a storage folder),
+        following the pagination of :meth:`list_storage_files`.
+
+        Args:
+            storage_id: The ID of the storage
+            **kwargs: Additional arguments to pass to the first page request
+                (``prefetch=N`` reads N pages ahead on a background worker,
+                ``parallel=N`` fetches N pages concurrently)
+
+        Returns:
+            Iterator of File
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_objects(self.list_storage_files, storage_id, **kwargs)
+
+    def reconcile_storage(
+        self,
+        storage_id: str,
+        root: PathLike,
+        workers: int = DEFAULT_SCAN_WORKERS,
+        partitions: int = DEFAULT_PARTITIONS,
+        mtime_tolerance: float = DEFAULT_MTIME_TOLERANCE,
+        spill_directory: Optional[PathLike] = None,
+        **kwargs,
+    ) -> Iterator[Difference]:
+        """
+        Compare a mounted storage with the files Iconik has registered on it.
+
+        The local tree is walked with concurrent directory listings
+        (:func:`pythonik.reconcile.scan_tree`) while the storage files are
+        streamed page by page from :meth:`iter_storage_files`. Both are
+        spilled to disk in partitions by path and joined one partition at a
+        time, so memory stays bounded for tens of millions of files.
+
+        Args:
+            storage_id: The ID of the storage
+            root: Local mount point of the storage root
+            workers: Maximum number of directories listed concurrently
+            partitions: Number of partitions the entries are spilled to
+            mtime_tolerance: Seconds modification times may differ by
+            spill_directory: Where to spill the partitions, by default the
+                system temporary directory
+            **kwargs: Additional arguments to pass to the first page request,
+                ``prefetch`` defaults to 2 pages
+
+        Returns:
+            Iterator of Difference: ``missing`` files are on disk but not in
+            Iconik, ``extra`` ones in Iconik but not on disk, and ``changed``
+            ones have a different size or modification time
+
+        Raises:
+            requests.HTTPError: If a page request fails
+
+        Example:
+            for diff in client.files().reconcile_storage(storage_id, "/mnt/media"):
+                if diff.kind == MISSING:
+                    client.files().create_storage_file(storage_id, body=...)
+        """
+        kwargs.setdefault("prefetch", 2)
+        remote = (
+            entry
+            for entry in map(storage_file_entry, self.iter_storage_files(storage_id, **kwargs))
+            if entry is not None
+        )
+        return reconcile(
+            scan_tree(root, workers), remote, partitions, mtime_tolerance, spill_directory
+        )
+
     def _get_deleted_object_type(
-        self, object_type: Literal["file_sets", "formats"], **kwargs
+        self,
+        object_type: Literal["file_sets", "formats"],
+        model: Optional[Type[BaseModel]] = None,
+        **kwargs,
     ) -> Response:
         """
         Get deleted object type.
 
         Args:
             object_type: The type of object to retrieve
+            model: Model to parse the response into, the raw response is
+                returned by default
             **kwargs: Additional arguments to pass to the request
 
         Returns:
@@ -954,7 +2347,7 @@ class FilesSpec(Spec):
         if object_type not in ["file_sets", "formats"]:
             raise ValueError("object_type must be one of file_sets or formats")
         resp = self._get(GET_DELETE_QUEUE_OBJECT_TYPE_PATH.format(object_type), **kwargs)
-        return self.parse_response(resp, None)
+        return self.parse_response(resp, model)
 
     def get_deleted_file_sets(self, **kwargs) -> Response:
         """
@@ -983,6 +2376,44 @@ class FilesSpec(Spec):
         """
         return self._get_deleted_object_type("formats", **kwargs)
 
+    def iter_deleted_file_sets(self, **kwargs) -> Iterator[FileSet]:
+        """
+        Lazily iterate over every file set in the delete queue, page by page.
+
+        Args:
+            **kwargs: Additional arguments to pass to the first page request
+                (``prefetch=N`` reads N pages ahead on a background worker,
+                ``parallel=N`` fetches N pages concurrently)
+
+        Returns:
+            Iterator of FileSet
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_objects(
+            self._get_deleted_object_type, "file_sets", model=FileSets, **kwargs
+        )
+
+    def iter_deleted_formats(self, **kwargs) -> Iterator[Format]:
+        """
+        Lazily iterate over every format in the delete queue, page by page.
+
+        Args:
+            **kwargs: Additional arguments to pass to the first page request
+                (``prefetch=N`` reads N pages ahead on a background worker,
+                ``parallel=N`` fetches N pages concurrently)
+
+        Returns:
+            Iterator of Format
+
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_objects(
+            self._get_deleted_object_type, "formats", model=Formats, **kwargs
+        )
+
     def create_mediainfo_job(
         self,
         asset_id: str,
@@ -1036,3 +2467,789 @@ class FilesSpec(Spec):
             **kwargs,
         )
         return self.parse_response(resp, None)
+
+
+class AsyncFilesSpec(AsyncSpec, FilesSpec):
+    """asyncio counterpart of :class:`FilesSpec`, every method is awaitable"""
+
+    @staticmethod
+    def _new_storage_session():
+        import httpx
+
+        return httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(retries=4), follow_redirects=True)
+
+    async def delete_asset_file_set(
+        self, asset_id: str, file_set_id: str, keep_source: bool = False, **kwargs
+    ) -> Response:
+        """
+        Delete asset's file set, file entries, and actual files
+
+        See :meth:`FilesSpec.delete_asset_file_set`.
+        """
+        params = {"keep_source": keep_source} if keep_source else None
+        response = await self._delete(
+            DELETE_ASSETS_FILE_SET_PATH.format(asset_id, file_set_id),
+            params=params,
+            **kwargs
+        )
+        if response.status_code == 204:
+            return await self.parse_response(response, model=None)
+        return await self.parse_response(response, FileSet)
+
+    async def _storage_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request to object storage through the storage session"""
+        response = await self.storage_session.request(
+            method, url, timeout=self.timeout, **to_httpx_kwargs(kwargs)
+        )
+        return to_requests_response(response)
+
+    async def get_upload_id_for_keyframe(self, keyframe: Keyframe) -> PythonikResponse:
+        """
+        Get upload ID for keyframe. This ID is required to upload keyframe files.
+
+        See :meth:`FilesSpec.get_upload_id_for_keyframe`.
+        """
+        upload_url, headers = self._get_upload_start_request(keyframe)
+        upload_url_response = await self._storage_request("POST", upload_url, headers=headers)
+        return self._parse_keyframe_upload_id(keyframe, upload_url_response)
+
+    async def get_upload_id_for_proxy(self, asset_id: str, proxy_id: str) -> PythonikResponse:
+        """
+        Get upload ID for proxy. This ID is required to upload proxy files.
+
+        See :meth:`FilesSpec.get_upload_id_for_proxy`.
+        """
+        proxy_response = await self.get_asset_proxy(asset_id, proxy_id)
+        if not proxy_response.response.ok:
+            # bubble up the error for caller to handle
+            return proxy_response
+
+        return await self._start_proxy_upload(proxy_response.data)
+
+    async def _start_proxy_upload(self, proxy: Proxy) -> PythonikResponse:
+        upload_url, headers = self._get_upload_start_request(proxy)
+        upload_url_response = await self._storage_request("POST", upload_url, headers=headers)
+        return self._parse_proxy_upload_id(proxy, upload_url_response)
+
+    async def _iter_s3_part_urls(
+        self,
+        asset_id: str,
+        object_id: str,
+        upload_id: str,
+        parts_num: int,
+        batch_size: int,
+        object_path: str = GET_ASSET_PROXY_PATH,
+    ) -> AsyncIterator[Tuple[int, str]]:
+        seen: Set[int] = set()
+        window = 0
+        while len(seen) < parts_num:
+            window = min(parts_num, window + batch_size)
+            response = await self._get_s3_part_urls(asset_id, object_id, upload_id, window, object_path)
+            for item in self._new_part_urls(response, seen, parts_num):
+                yield item
+
+    async def _put_s3_body(self, part: Part, body: memoryview, url: str) -> Tuple[int, str]:
+        response = await self._storage_request("PUT", url, data=body)
+        return self._part_etag(part, response)
+
+    async def _put_s3_parts(
+        self,
+        asset_id: str,
+        object_id: str,
+        upload_id: str,
+        path: PathLike,
+        parts: List[Part],
+        workers: int,
+        url_batch_size: int,
+        digest: UploadDigest,
+        object_path: str = GET_ASSET_PROXY_PATH,
+    ) -> Dict[int, str]:
+        by_number = {part.number: part for part in parts}
+        slots = asyncio.Semaphore(workers)
+        errors: List[BaseException] = []
+
+        async def put(part, body, url):
+            try:
+                return await self._put_s3_body(part, body, url)
+            except BaseException as e:
+                errors.append(e)
+                raise
+            finally:
+                slots.release()
+
+        tasks = []
+        try:
+            async for number, url in self._iter_s3_part_urls(
+                asset_id, object_id, upload_id, len(parts), url_batch_size, object_path
+            ):
+                await slots.acquire()
+                if errors:
+                    raise errors[0]
+                part = by_number[number]
+                # mapped and hashed in file order, off the event loop
+                body = await asyncio.to_thread(self._hashed_part, path, part, digest)
+                tasks.append(asyncio.ensure_future(put(part, body, url)))
+            return dict(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _complete_s3_upload(
+        self, object_id: str, complete_url: str, etags: Dict[int, str]
+    ) -> requests.Response:
+        response = await self._storage_request(
+            "POST",
+            complete_url,
+            data=s3_complete_body(etags),
+            headers={"Content-Type": "application/xml"},
+        )
+        return self._check_s3_completion(object_id, response)
+
+    async def upload_proxy_file(
+        self,
+        asset_id: str,
+        proxy_id: str,
+        path: PathLike,
+        part_size: int = DEFAULT_PART_SIZE,
+        workers: int = 4,
+        url_batch_size: int = DEFAULT_URL_BATCH_SIZE,
+        state_path: Optional[PathLike] = None,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        """
+        Upload a file as the content of a proxy.
+
+        See :meth:`FilesSpec.upload_proxy_file`, S3 parts are uploaded by up
+        to ``workers`` concurrent tasks.
+        """
+        proxy_response = await self.get_asset_proxy(asset_id, proxy_id)
+        if not proxy_response.response.ok:
+            return proxy_response
+        return await self._upload_proxy(
+            asset_id, proxy_response.data, path, part_size, workers, url_batch_size, state_path, hashes
+        )
+
+    async def _upload_proxy(
+        self,
+        asset_id: str,
+        proxy: Proxy,
+        path: PathLike,
+        part_size: int = DEFAULT_PART_SIZE,
+        workers: int = 4,
+        url_batch_size: int = DEFAULT_URL_BATCH_SIZE,
+        state_path: Optional[PathLike] = None,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        if proxy.storage_method != StorageMethod.S3:
+            return await self.upload_resumable(
+                proxy, path, chunk_size=part_size, state_path=state_path, hashes=hashes
+            )
+
+        proxy_id = proxy.id
+        started = await self._start_proxy_upload(proxy)
+        if not started.response.ok:
+            return started
+        upload_id = started.data
+
+        size = os.path.getsize(path)
+        parts = plan_parts(size, s3_part_size(size, part_size))
+        etags = await self._put_s3_parts(
+            asset_id, proxy_id, upload_id, path, parts, workers, url_batch_size, UploadDigest(hashes)
+        )
+        return await self._finish_s3_upload(asset_id, proxy_id, upload_id, etags)
+
+    async def _finish_s3_upload(
+        self,
+        asset_id: str,
+        object_id: str,
+        upload_id: str,
+        etags: Dict[int, str],
+        object_path: str = GET_ASSET_PROXY_PATH,
+    ) -> PythonikResponse:
+        complete_url = await self._get_s3_complete_url(object_path, asset_id, object_id, upload_id)
+        if not complete_url.response.ok:
+            return complete_url
+        response = await self._complete_s3_upload(object_id, complete_url.data, etags)
+        return PythonikResponse(response=response, data=upload_id)
+
+    @staticmethod
+    def _next_hashed_part(
+        parts: Iterator[Tuple[Part, memoryview]], digest: UploadDigest
+    ) -> Optional[Tuple[Part, memoryview]]:
+        item = next(parts, None)
+        if item is not None:
+            digest.update(item[0].offset, item[1])
+        return item
+
+    async def _put_s3_stream(
+        self,
+        asset_id: str,
+        proxy_id: str,
+        upload_id: str,
+        parts: Iterator[Tuple[Part, memoryview]],
+        workers: int,
+        url_batch_size: int,
+        digest: UploadDigest,
+    ) -> Dict[int, str]:
+        urls = self._iter_s3_part_urls(asset_id, proxy_id, upload_id, S3_MAX_PARTS, url_batch_size)
+        known: Dict[int, str] = {}
+        slots = asyncio.Semaphore(workers)
+        errors: List[BaseException] = []
+
+        async def put(part, body, url):
+            try:
+                return await self._put_s3_body(part, body, url)
+            except BaseException as e:
+                errors.append(e)
+                raise
+            finally:
+                slots.release()
+
+        tasks = []
+        try:
+            while True:
+                # the source blocks while it waits for data
+                item = await asyncio.to_thread(self._next_hashed_part, parts, digest)
+                if item is None:
+                    break
+                part, body = item
+                while part.number not in known:
+                    try:
+                        number, url = await urls.__anext__()
+                    except StopAsyncIteration:
+                        raise UploadError(f"No presigned URL returned for part {part.number}")
+                    known[number] = url
+                await slots.acquire()
+                if errors:
+                    raise errors[0]
+                tasks.append(asyncio.ensure_future(put(part, body, known.pop(part.number))))
+            return dict(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def bulk_ingest_proxies(
+        self,
+        items: Iterable[ProxyIngestItem],
+        concurrency: int = 8,
+        workers: int = 2,
+        part_size: int = DEFAULT_PART_SIZE,
+        close: bool = True,
+        on_result: Optional[Callable[[ProxyIngestResult], None]] = None,
+    ) -> List[ProxyIngestResult]:
+        """
+        Create and upload proxies for many assets concurrently.
+
+        See :meth:`FilesSpec.bulk_ingest_proxies`, items are processed by up
+        to ``concurrency`` tasks.
+        """
+        return await self._run_bulk(
+            lambda item: self._ingest_proxy(item, workers, part_size, close),
+            items,
+            concurrency,
+            on_result,
+        )
+
+    @staticmethod
+    async def _run_bulk(
+        process: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        concurrency: int,
+        on_result: Optional[Callable[[Any], None]],
+    ) -> List[Any]:
+        results: Dict[int, Any] = {}
+        slots = asyncio.Semaphore(concurrency)
+        errors: List[BaseException] = []
+
+        async def ingest(index, item):
+            try:
+                result = await process(item)
+                results[index] = result
+                if on_result is not None:
+                    on_result(result)
+            except BaseException as e:
+                errors.append(e)
+                raise
+            finally:
+                slots.release()
+
+        # finished tasks are dropped, so a large backlog does not pile up
+        tasks = set()
+        try:
+            for index, item in enumerate(items):
+                await slots.acquire()
+                if errors:
+                    raise errors[0]
+                task = asyncio.ensure_future(ingest(index, item))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+            if errors:
+                raise errors[0]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return [results[index] for index in sorted(results)]
+
+    async def _ingest_proxy(
+        self, item: ProxyIngestItem, workers: int, part_size: int, close: bool
+    ) -> ProxyIngestResult:
+        result = ProxyIngestResult(item=item, stage=INGEST_CREATE)
+        try:
+            created = await self.create_asset_proxy(item.asset_id, body=item.proxy)
+            if not self._ingest_step(result, created):
+                return result
+            result.proxy = created.data
+
+            result.stage = INGEST_UPLOAD
+            uploaded = await self._upload_proxy(
+                item.asset_id, created.data, item.path, part_size=part_size, workers=workers
+            )
+            if not self._ingest_step(result, uploaded):
+                return result
+            result.upload_id = uploaded.data
+
+            if close:
+                result.stage = INGEST_CLOSE
+                closed = await self.update_asset_proxy(
+                    item.asset_id, created.data.id, {"status": FileStatus.CLOSED.value}
+                )
+                if not self._ingest_step(result, closed):
+                    return result
+            result.stage = INGEST_DONE
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            result.response = getattr(e, "response", None)
+        return result
+
+    async def upload_proxy_stream(
+        self,
+        asset_id: str,
+        proxy_id: str,
+        source: StreamSource,
+        part_size: int = DEFAULT_PART_SIZE,
+        workers: int = 4,
+        url_batch_size: int = DEFAULT_URL_BATCH_SIZE,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        """
+        Upload a proxy from a stream whose size is not known in advance.
+
+        See :meth:`FilesSpec.upload_proxy_stream`, the source is read on a
+        worker thread and parts are uploaded by up to ``workers`` concurrent
+        tasks.
+        """
+        proxy_response = await self.get_asset_proxy(asset_id, proxy_id)
+        if not proxy_response.response.ok:
+            return proxy_response
+        self._require_s3(proxy_response.data)
+
+        started = await self._start_proxy_upload(proxy_response.data)
+        if not started.response.ok:
+            return started
+        upload_id = started.data
+
+        parts = iter_stream_parts(source, max(part_size, S3_MIN_PART_SIZE))
+        etags = await self._put_s3_stream(
+            asset_id, proxy_id, upload_id, parts, workers, url_batch_size, UploadDigest(hashes)
+        )
+        return await self._finish_s3_upload(asset_id, proxy_id, upload_id, etags)
+
+    async def _start_gcs_session(
+        self, target: Union[Proxy, Keyframe], size: int, mtime_ns: int
+    ) -> Tuple[requests.Response, Optional[ResumableState]]:
+        upload_url, headers = self._get_upload_start_request(target)
+        response = await self._storage_request("POST", upload_url, headers=headers)
+        return response, self._gcs_session_state(response, size, mtime_ns)
+
+    async def _drive_gcs_upload(
+        self,
+        state: ResumableState,
+        path: PathLike,
+        offset: Optional[int],
+        chunk_size: int,
+        max_retries: int,
+        digest: UploadDigest,
+    ) -> requests.Response:
+        import httpx
+
+        failures = 0
+        while True:
+            try:
+                request = await asyncio.to_thread(
+                    self._gcs_chunk_request, path, offset, chunk_size, state.size, digest
+                )
+                response = await self._storage_request("PUT", state.session_uri, **request)
+                offset = self._gcs_progress(response)
+            except (httpx.TransportError, UploadError) as e:
+                if isinstance(e, UploadError) and not e.retryable:
+                    raise
+                failures += 1
+                if failures > max_retries:
+                    raise UploadError(
+                        f"Resumable upload failed after {max_retries} retries: {e}",
+                        getattr(e, "response", None),
+                    ) from e
+                await asyncio.sleep(resume_delay(failures))
+                offset = None
+                continue
+            if offset is None:
+                return response
+            failures = 0
+
+    async def upload_resumable(
+        self,
+        target: Union[Proxy, Keyframe],
+        path: PathLike,
+        chunk_size: int = DEFAULT_GCS_CHUNK_SIZE,
+        state_path: Optional[PathLike] = None,
+        max_retries: int = 5,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        """
+        Upload a file to a GCS proxy or keyframe through a chunked resumable session.
+
+        See :meth:`FilesSpec.upload_resumable`.
+        """
+        check_gcs_chunk_size(chunk_size)
+        self._require_gcs(target)
+        stat = os.stat(path)
+        digest = UploadDigest(hashes)
+
+        state = ResumableState.load(state_path, stat.st_size, stat.st_mtime_ns) if state_path else None
+        if state is not None:
+            try:
+                response = await self._drive_gcs_upload(state, path, None, chunk_size, max_retries, digest)
+                ResumableState.clear(state_path)
+                return PythonikResponse(response=response, data=state.upload_id)
+            except UploadError as e:
+                if e.response is None or e.response.status_code not in GCS_SESSION_GONE:
+                    raise
+
+        response, state = await self._start_gcs_session(target, stat.st_size, stat.st_mtime_ns)
+        if state is None:
+            return PythonikResponse(response=response, data=None)
+        if state_path:
+            state.save(state_path)
+        response = await self._drive_gcs_upload(state, path, 0, chunk_size, max_retries, digest)
+        if state_path:
+            ResumableState.clear(state_path)
+        return PythonikResponse(response=response, data=state.upload_id)
+
+    async def upload_keyframe_file(
+        self,
+        asset_id: str,
+        keyframe_id: str,
+        path: PathLike,
+        chunk_size: int = DEFAULT_GCS_CHUNK_SIZE,
+        state_path: Optional[PathLike] = None,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        """Upload a file as the content of a keyframe, see :meth:`FilesSpec.upload_keyframe_file`"""
+        keyframe_response = await self.get_asset_keyframe(asset_id, keyframe_id)
+        if not keyframe_response.response.ok:
+            return keyframe_response
+        return await self._upload_keyframe(
+            asset_id, keyframe_response.data, path, chunk_size, state_path, hashes
+        )
+
+    async def _upload_keyframe(
+        self,
+        asset_id: str,
+        keyframe: Keyframe,
+        path: PathLike,
+        chunk_size: int = DEFAULT_GCS_CHUNK_SIZE,
+        state_path: Optional[PathLike] = None,
+        hashes: Iterable[Any] = (),
+    ) -> PythonikResponse:
+        if keyframe.storage_method != StorageMethod.S3:
+            return await self.upload_resumable(
+                keyframe, path, chunk_size=chunk_size, state_path=state_path, hashes=hashes
+            )
+
+        started = await self.get_upload_id_for_keyframe(keyframe)
+        if not started.response.ok:
+            return started
+        upload_id = started.data
+
+        size = os.path.getsize(path)
+        parts = plan_parts(size, s3_part_size(size, chunk_size))
+        etags = await self._put_s3_parts(
+            asset_id,
+            keyframe.id,
+            upload_id,
+            path,
+            parts,
+            1,
+            DEFAULT_URL_BATCH_SIZE,
+            UploadDigest(hashes),
+            GET_ASSET_KEYFRAME,
+        )
+        return await self._finish_s3_upload(
+            asset_id, keyframe.id, upload_id, etags, GET_ASSET_KEYFRAME
+        )
+
+    async def bulk_upload_keyframes(
+        self,
+        items: Iterable[KeyframeIngestItem],
+        concurrency: int = 16,
+        chunk_size: int = DEFAULT_GCS_CHUNK_SIZE,
+        close: bool = True,
+        on_result: Optional[Callable[[KeyframeIngestResult], None]] = None,
+    ) -> List[KeyframeIngestResult]:
+        """
+        Create and upload many keyframes concurrently.
+
+        See :meth:`FilesSpec.bulk_upload_keyframes`, keyframes are processed
+        by up to ``concurrency`` tasks.
+        """
+        return await self._run_bulk(
+            lambda item: self._ingest_keyframe(item, chunk_size, close),
+            items,
+            concurrency,
+            on_result,
+        )
+
+    async def _ingest_keyframe(
+        self, item: KeyframeIngestItem, chunk_size: int, close: bool
+    ) -> KeyframeIngestResult:
+        result = KeyframeIngestResult(item=item, stage=INGEST_CREATE)
+        try:
+            created = await self.create_asset_keyframe(item.asset_id, body=item.keyframe)
+            if not self._ingest_step(result, created):
+                return result
+            result.keyframe = created.data
+
+            result.stage = INGEST_UPLOAD
+            uploaded = await self._upload_keyframe(
+                item.asset_id, created.data, item.path, chunk_size=chunk_size
+            )
+            if not self._ingest_step(result, uploaded):
+                return result
+            result.upload_id = uploaded.data
+
+            if close:
+                result.stage = INGEST_CLOSE
+                closed = await self.partial_update_keyframe(
+                    item.asset_id, created.data.id, {"status": FileStatus.CLOSED.value}
+                )
+                if not self._ingest_step(result, closed):
+                    return result
+            result.stage = INGEST_DONE
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            result.response = getattr(e, "response", None)
+        return result
+
+    async def download(
+        self,
+        source: Union[str, File, Proxy, Keyframe],
+        dest: PathLike,
+        part_size: int = DEFAULT_DOWNLOAD_PART_SIZE,
+        workers: int = 4,
+        checksum: Optional[str] = None,
+        checksum_algorithm: str = DEFAULT_CHECKSUM_ALGORITHM,
+        resume: bool = True,
+        max_retries: int = 3,
+    ) -> PythonikResponse:
+        """
+        Download a file, proxy or keyframe with concurrent HTTP Range requests.
+
+        See :meth:`FilesSpec.download`, parts are downloaded by up to
+        ``workers`` concurrent tasks.
+        """
+        url, known_checksum = download_source(source)
+        checksum = checksum or known_checksum
+
+        size = None
+        async with self.storage_session.stream(
+            "GET", url, headers={"Range": "bytes=0-0"}, timeout=self.timeout
+        ) as probe:
+            if probe.status_code == 200:
+                with open(dest, "wb") as f:
+                    async for chunk in probe.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        await asyncio.to_thread(f.write, chunk)
+            else:
+                await probe.aread()
+                size = self._download_size(to_requests_response(probe))
+        if size is not None:
+            await self._download_parts(
+                url, dest, size, probe.headers.get("ETag", ""), part_size, workers, resume, max_retries
+            )
+
+        if checksum:
+            await asyncio.to_thread(verify_checksum, dest, checksum, checksum_algorithm)
+        return PythonikResponse(response=to_requests_response(probe), data=os.fspath(dest))
+
+    async def _download_parts(
+        self,
+        url: str,
+        dest: PathLike,
+        size: int,
+        etag: str,
+        part_size: int,
+        workers: int,
+        resume: bool,
+        max_retries: int,
+    ):
+        state = await asyncio.to_thread(self._download_state, dest, size, etag, part_size, resume)
+        state_path = download_state_path(dest)
+        parts = [
+            part
+            for part in plan_parts(size, part_size)
+            if part.length and part.number not in state.done
+        ]
+        slots = asyncio.Semaphore(workers)
+
+        async def get(part):
+            async with slots:
+                return await self._download_part(url, dest, part, max_retries)
+
+        tasks = [asyncio.ensure_future(get(part)) for part in parts]
+        try:
+            for done in asyncio.as_completed(tasks):
+                state.done.append(await done)
+                await asyncio.to_thread(state.save, state_path)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        DownloadState.clear(state_path)
+
+    async def _download_part(self, url: str, dest: PathLike, part: Part, max_retries: int) -> int:
+        import httpx
+
+        failures = 0
+        while True:
+            try:
+                async with self.storage_session.stream(
+                    "GET", url, headers={"Range": range_header(part)}, timeout=self.timeout
+                ) as response:
+                    error = self._part_response_error(part, response)
+                    if error is not None:
+                        await response.aread()
+                        error.response = to_requests_response(response)
+                        raise error
+                    writer = await asyncio.to_thread(PartWriter, dest, part)
+                    try:
+                        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            await asyncio.to_thread(writer.write, chunk)
+                    except BaseException:
+                        # nothing is flushed, releasing the map doesn't block
+                        writer.close(complete=False)
+                        raise
+                    await asyncio.to_thread(writer.close)
+                return part.number
+            except (httpx.TransportError, DownloadError) as e:
+                if isinstance(e, DownloadError) and not e.retryable:
+                    raise
+                failures += 1
+                if failures > max_retries:
+                    raise DownloadError(
+                        f"Downloading part {part.number} failed after {max_retries} retries: {e}",
+                        getattr(e, "response", None),
+                    ) from e
+                await asyncio.sleep(resume_delay(failures))
+
+    async def get_s3_complete_url(
+        self, asset_id: str, proxy_id: str, upload_id: str, **kwargs
+    ) -> PythonikResponse:
+        return await self._get_s3_complete_url(
+            GET_ASSET_PROXY_PATH, asset_id, proxy_id, upload_id, **kwargs
+        )
+
+    async def reconcile_storage(
+        self,
+        storage_id: str,
+        root: PathLike,
+        workers: int = DEFAULT_SCAN_WORKERS,
+        partitions: int = DEFAULT_PARTITIONS,
+        mtime_tolerance: float = DEFAULT_MTIME_TOLERANCE,
+        spill_directory: Optional[PathLike] = None,
+        **kwargs,
+    ) -> AsyncIterator[Difference]:
+        """
+        Compare a mounted storage with the files Iconik has registered on it.
+
+        See :meth:`FilesSpec.reconcile_storage`, use with ``async for``. The
+        local tree is walked and the partitions are joined on worker threads.
+        """
+        kwargs.setdefault("prefetch", 2)
+        with PartitionedJoin(partitions, spill_directory) as join:
+            local_added = asyncio.ensure_future(
+                asyncio.to_thread(join.add, LOCAL, scan_tree(root, workers))
+            )
+            try:
+                async for file in self.iter_storage_files(storage_id, **kwargs):
+                    entry = storage_file_entry(file)
+                    if entry is not None:
+                        join.add(REMOTE, [entry])
+            finally:
+                # the thread cannot be interrupted, wait for it before cleaning up
+                await asyncio.gather(local_added, return_exceptions=True)
+            local_added.result()
+            join.flush()
+            for index in range(partitions):
+                differences = await asyncio.to_thread(
+                    join.partition_differences, index, mtime_tolerance
+                )
+                for difference in differences:
+                    yield difference
+
+    async def get_asset_bundle(
+        self,
+        asset_id: str,
+        version_id: Optional[str] = None,
+        components: bool = True,
+        workers: int = 8,
+    ) -> AssetBundle:
+        """
+        Get the formats, file sets, files, proxies and keyframes of an asset
+        in one call.
+
+        See :meth:`FilesSpec.get_asset_bundle`, at most ``workers`` listings
+        are read at once.
+        """
+        limit = asyncio.Semaphore(workers)
+
+        async def collect(fetch_page, *args, object_model=None):
+            async with limit:
+                return [
+                    obj async for obj in self._iter_objects(fetch_page, *args, object_model=object_model)
+                ]
+
+        async def formats_with_components(listing):
+            formats = await collect(*listing)
+            if components:
+                fetched = await asyncio.gather(
+                    *(
+                        collect(self.list_asset_format_components, asset_id, fmt.id, object_model=Component)
+                        for fmt in formats
+                    )
+                )
+                for fmt, format_components in zip(formats, fetched):
+                    fmt.components = format_components
+            return formats
+
+        listings = self._bundle_listings(asset_id, version_id)
+        formats_listing = listings.pop("formats")
+        names = list(listings)
+        formats, *results = await asyncio.gather(
+            formats_with_components(formats_listing), *(collect(*listings[name]) for name in names)
+        )
+        return self._asset_bundle(asset_id, version_id, formats, dict(zip(names, results)))
+
+    async def _get_s3_complete_url(
+        self, object_path: str, asset_id: str, object_id: str, upload_id: str, **kwargs
+    ) -> PythonikResponse:
+        response = await self._get(
+            (object_path + MULTIPART_URL_SUFFIX).format(asset_id, object_id),
+            params={"upload_id": upload_id, "type": "complete_url"},
+            **kwargs
+        )
+        if not response.ok:
+            return PythonikResponse(response=response, data=None)
+        return PythonikResponse(response=response, data=response.json()["complete_url"])
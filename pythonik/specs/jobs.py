@@ -4,6 +4,7 @@ from typing import Union, Dict, Any
 from pythonik.models.base import Response
 from pythonik.models.jobs.job_body import JobBody
 from pythonik.models.jobs.job_response import JobResponse
+from pythonik.specs.async_base import AsyncSpec
 from pythonik.specs.base import Spec
 
 
@@ -67,3 +68,7 @@ class JobSpec(Spec):
         )
 
         return self.parse_response(resp, JobResponse)
+
+
+class AsyncJobSpec(AsyncSpec, JobSpec):
+    """asyncio counterpart of :class:`JobSpec`, every method is awaitable"""
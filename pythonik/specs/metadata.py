@@ -19,6 +19,7 @@ from pythonik.models.metadata.fields import (
     FieldResponse,
     FieldListResponse,
 )
+from pythonik.specs.async_base import AsyncSpec
 from pythonik.specs.base import Spec
 from typing import Literal, Union, Dict, Any, List, Optional
 
@@ -85,9 +86,15 @@ class MetadataSpec(Spec):
             else self.gen_url(f"{object_type}/{object_id}/")
         )
         resp = self._get(url, **kwargs)
+        return self._parse_view_metadata(resp, intercept_404)
 
+    @staticmethod
+    def _parse_view_metadata(
+        resp, intercept_404: ViewMetadata | bool = False
+    ) -> Response:
+        """Parse a view metadata response, applying intercept_404 if requested"""
         if intercept_404 and resp.status_code == 404:
-            parsed_response = self.parse_response(resp, ViewMetadata)
+            parsed_response = Spec.parse_response(resp, ViewMetadata)
             parsed_response.data = intercept_404
             parsed_response.response.raise_for_status_404 = (
                 parsed_response.response.raise_for_status
@@ -99,7 +106,7 @@ class MetadataSpec(Spec):
             )
             return parsed_response
 
-        return self.parse_response(resp, ViewMetadata)
+        return Spec.parse_response(resp, ViewMetadata)
 
     def get_asset_metadata(
         self,
@@ -804,3 +811,33 @@ class MetadataSpec(Spec):
             Response: An empty response, expecting HTTP 204 No Content on success.
         """
         return self.delete_field(field_name, **kwargs)
+
+
+class AsyncMetadataSpec(AsyncSpec, MetadataSpec):
+    """asyncio counterpart of :class:`MetadataSpec`, every method is awaitable"""
+
+    async def get_object_metadata(
+        self,
+        object_type: Literal["assets", "collections", "segments"],
+        object_id: str,
+        view_id: str = None,
+        intercept_404: ViewMetadata | bool = False,
+        **kwargs,
+    ) -> Response:
+        """
+        Get object metadata by object type, object ID and view ID.
+
+        See :meth:`MetadataSpec.get_object_metadata`.
+        """
+        if object_type not in ["assets", "collections", "segments"]:
+            raise ValueError(
+                "object_type must be one of assets, collections, or segments"
+            )
+
+        url = (
+            self.gen_url(f"{object_type}/{object_id}/views/{view_id}/")
+            if view_id is not None
+            else self.gen_url(f"{object_type}/{object_id}/")
+        )
+        resp = await self._get(url, **kwargs)
+        return self._parse_view_metadata(resp, intercept_404)
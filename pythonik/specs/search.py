@@ -1,12 +1,76 @@
-from typing import Union, Dict, Any, Optional
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import Union, Dict, Any, Iterator, List, Optional, Sequence, Tuple
 
+from pythonik.export import Destination, export_objects, open_writer, project
 from pythonik.models.base import Response
 from pythonik.models.search.search_body import SearchBody
-from pythonik.models.search.search_response import SearchResponse
+from pythonik.models.search.search_response import Object, SearchResponse
+from pythonik.pagination import amerge_iterators, merge_iterators, search_after_cursor
+from pythonik.specs.async_base import AsyncSpec
 from pythonik.specs.base import Spec
 
 
 SEARCH_PATH = "search/"
+# default sort for cursor pagination, id breaks ties between equal dates
+STABLE_SORT = [
+    {"name": "date_created", "order": "asc"},
+    {"name": "id", "order": "asc"},
+]
+SCAN_FIELD = "date_created"
+
+DateLike = Union[datetime, str]
+
+
+def _to_millis(value: DateLike) -> int:
+    """Epoch milliseconds of a datetime or ISO 8601 string, naive values are UTC"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return math.floor(value.timestamp() * 1000)
+
+
+def _format_millis(millis: int) -> str:
+    """ISO 8601 UTC string with millisecond precision"""
+    value = datetime.fromtimestamp(millis / 1000, tz=timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{millis % 1000:03d}Z"
+
+
+def _split_range(low: int, high: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split the inclusive millisecond range [low, high] into at most ``parts``
+    disjoint inclusive ranges covering it entirely: each range ends 1ms
+    before the next one starts.
+    """
+    span = high - low + 1
+    parts = max(1, min(parts, span))
+    bounds = [low + span * i // parts for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(parts)]
+
+
+def _replan(
+    pending: List[Tuple[int, int]],
+    totals: List[int],
+    threshold: int,
+    planned: List[Tuple[int, int]],
+) -> List[Tuple[int, int]]:
+    """
+    Keep the counted ranges small enough in ``planned``, drop empty ones and
+    return the halves of the ranges holding more than ``threshold`` objects
+    """
+    oversized = []
+    for (low, high), total in zip(pending, totals):
+        if not total:
+            continue
+        if total > threshold and high > low:
+            oversized.extend(_split_range(low, high, 2))
+        else:
+            planned.append((low, high))
+    return oversized
 
 
 class SearchSpec(Spec):
@@ -75,3 +139,470 @@ class SearchSpec(Spec):
             **kwargs,
         )
         return self.parse_response(resp, SearchResponse)
+
+    def search_pages(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        per_page: Optional[int] = None,
+        prefetch: int = 0,
+        exclude_defaults: bool = True,
+        **kwargs,
+    ) -> Iterator[Response]:
+        """
+        Lazily walk every page of a search using search_after pagination.
+
+        Each page is requested with the ``_sort`` values of the last object of
+        the previous page as ``search_after``, until an empty (or short) page
+        is returned. The search body must define a ``sort``; include a unique
+        field such as ``id`` in it so pages never overlap.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model or dict.
+                A ``search_after`` already present resumes from that position.
+            per_page: The number of documents for each page.
+            prefetch: Number of pages to fetch ahead on a background worker
+                while the caller processes the current page, 0 disables it.
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body.
+            **kwargs: Additional arguments passed to :meth:`search` for every
+                page (e.g. ``generate_signed_url=False``).
+
+        Returns:
+            Iterator of Response with SearchResponse data model, one per page.
+
+        Raises:
+            ValueError: If the search body has no sort
+            requests.HTTPError: If a page request fails
+        """
+        body = self._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
+        if not body.get("sort"):
+            raise ValueError("search_after pagination requires a sort in the search body")
+
+        def fetch(search_after):
+            page_body = dict(body)
+            if search_after is not None:
+                page_body["search_after"] = search_after
+            return self.search(page_body, per_page=per_page, **kwargs)
+
+        def next_cursor(data):
+            if per_page and len(data.objects or []) < per_page:
+                return None
+            return search_after_cursor(data)
+
+        return self._walk_pages(fetch, next_cursor, prefetch)
+
+    @staticmethod
+    def _with_stable_sort(body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return a copy of body whose sort totally orders the results: the
+        default date_created/id sort if it has none, or its sort with an
+        ``id`` tiebreaker appended.
+        """
+        body = dict(body)
+        sort = [dict(item) for item in body.get("sort") or []]
+        if not sort:
+            sort = [dict(item) for item in STABLE_SORT]
+        elif not any(item.get("name") == "id" for item in sort):
+            sort.append({"name": "id", "order": "asc"})
+        body["sort"] = sort
+        return body
+
+    def iter_search(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        per_page: Optional[int] = None,
+        prefetch: int = 0,
+        exclude_defaults: bool = True,
+        **kwargs,
+    ) -> Iterator[Object]:
+        """
+        Lazily iterate over every object matching a search, however many
+        there are, using search_after cursors instead of deep ``page=N``
+        requests.
+
+        The sort of the body is made stable first: ``date_created`` then
+        ``id`` if it has none, otherwise an ``id`` tiebreaker is appended, so
+        objects sharing a sort value are never skipped or repeated across
+        pages.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model or dict.
+            per_page: The number of documents for each page.
+            prefetch: Number of pages to fetch ahead on a background worker
+                while the caller processes the current page, 0 disables it.
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body.
+            **kwargs: Additional arguments passed to :meth:`search` for every
+                page (e.g. ``generate_signed_url=False``).
+
+        Returns:
+            Iterator of search result Object
+
+        Raises:
+            requests.HTTPError: If a page request fails
+
+        Example:
+            body = SearchBody(doc_types=["assets"], query="status:ACTIVE")
+            for obj in client.search().iter_search(body, per_page=500):
+                ...
+        """
+        body = self._with_stable_sort(
+            self._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
+        )
+        pages = self.search_pages(body, per_page=per_page, prefetch=prefetch, **kwargs)
+        return self._page_objects(pages)
+
+    @staticmethod
+    def _range_body(body: Dict[str, Any], low: int, high: int) -> Dict[str, Any]:
+        """Restrict body to objects whose date_created is in the inclusive ms range"""
+        term = {
+            "name": SCAN_FIELD,
+            "range": {"min": _format_millis(low), "max": _format_millis(high)},
+        }
+        scoped = {"operator": "AND", "terms": [term]}
+        if body.get("filter"):
+            scoped["filters"] = [body["filter"]]
+        return {**body, "filter": scoped}
+
+    @staticmethod
+    def _count_body(body: Dict[str, Any]) -> Dict[str, Any]:
+        return {**body, "include_fields": ["id"], "sort": [dict(STABLE_SORT[0])]}
+
+    @staticmethod
+    def _edge_body(body: Dict[str, Any], order: str) -> Dict[str, Any]:
+        return {
+            **body,
+            "include_fields": ["id", SCAN_FIELD],
+            "sort": [{"name": SCAN_FIELD, "order": order}],
+        }
+
+    @staticmethod
+    def _first_date(resp: Response) -> Optional[int]:
+        resp.response.raise_for_status()
+        objects = resp.data.objects
+        if not objects or not objects[0].date_created:
+            return None
+        return _to_millis(objects[0].date_created)
+
+    @staticmethod
+    def _total(resp: Response) -> int:
+        resp.response.raise_for_status()
+        return resp.data.total or 0
+
+    def _search_quietly(self, body: Dict[str, Any]) -> Response:
+        return self.search(
+            body, per_page=1, generate_signed_url=False, save_search_history=False
+        )
+
+    def _edge_date(self, body: Dict[str, Any], order: str) -> Optional[int]:
+        return self._first_date(self._search_quietly(self._edge_body(body, order)))
+
+    def _count(self, body: Dict[str, Any], low: int, high: int) -> int:
+        return self._total(self._search_quietly(self._count_body(self._range_body(body, low, high))))
+
+    def plan_scan(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        partitions: int = 8,
+        max_partition_size: Optional[int] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        workers: Optional[int] = None,
+        exclude_defaults: bool = True,
+    ) -> List[Tuple[str, str]]:
+        """
+        Split the results of a search into disjoint ``date_created`` ranges of
+        similar size, for :meth:`scan`.
+
+        The ``[start, end]`` interval is cut into ``partitions`` equal time
+        ranges, each ending 1ms before the next one starts. Every range is
+        counted, empty ones are dropped and those holding more than
+        ``max_partition_size`` objects are halved until they fit, so bursts
+        of ingest don't end up in a single partition.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model or dict.
+            partitions: Number of initial time ranges.
+            max_partition_size: Re-split ranges holding more objects than
+                this. Defaults to twice the average partition size.
+            start: Lowest date_created to scan, defaults to the oldest match.
+            end: Highest date_created to scan, defaults to the newest match.
+            workers: Number of concurrent count requests, defaults to partitions.
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body.
+
+        Returns:
+            Sorted list of inclusive (min, max) date_created bounds as ISO 8601
+            strings, empty if nothing matches.
+
+        Raises:
+            ValueError: If partitions is lower than 1
+            requests.HTTPError: If a search request fails
+        """
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1")
+        body = self._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
+        low = _to_millis(start) if start is not None else self._edge_date(body, "asc")
+        high = _to_millis(end) if end is not None else self._edge_date(body, "desc")
+        if low is None or high is None or high < low:
+            return []
+
+        total = self._count(body, low, high)
+        threshold = max_partition_size or 2 * max(1, math.ceil(total / partitions))
+        planned = []
+        pending = _split_range(low, high, partitions)
+        with ThreadPoolExecutor(max_workers=workers or partitions) as executor:
+            while pending:
+                totals = list(executor.map(lambda r: self._count(body, *r), pending))
+                pending = _replan(pending, totals, threshold, planned)
+        return [(_format_millis(low), _format_millis(high)) for low, high in sorted(planned)]
+
+    def _scan_partition(
+        self, body: Dict[str, Any], bounds: Tuple[str, str], per_page: Optional[int], kwargs
+    ):
+        low, high = (_to_millis(bound) for bound in bounds)
+        return self.search_pages(
+            self._with_stable_sort(self._range_body(body, low, high)), per_page=per_page, **kwargs
+        )
+
+    def scan(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        partitions: int = 8,
+        workers: Optional[int] = None,
+        max_partition_size: Optional[int] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        per_page: Optional[int] = None,
+        exclude_defaults: bool = True,
+        **kwargs,
+    ) -> Iterator[Object]:
+        """
+        Stream every object matching a search by scanning disjoint
+        ``date_created`` partitions concurrently, one search_after cursor per
+        partition.
+
+        The partitions come from :meth:`plan_scan`; they cover the scanned
+        interval without overlapping, so every matching object is yielded
+        exactly once. Objects are yielded as partitions produce them, not in
+        sort order. Objects created after the scan started may or may not be
+        included, pass ``end`` to scan a fixed window.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model or dict.
+            partitions: Number of initial time ranges, see :meth:`plan_scan`.
+            workers: Number of partitions scanned at the same time, defaults
+                to partitions.
+            max_partition_size: See :meth:`plan_scan`.
+            start: Lowest date_created to scan, defaults to the oldest match.
+            end: Highest date_created to scan, defaults to the newest match.
+            per_page: The number of documents for each page.
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body.
+            **kwargs: Additional arguments passed to :meth:`search` for every
+                page (e.g. ``generate_signed_url=False``).
+
+        Returns:
+            Iterator of search result Object
+
+        Raises:
+            ValueError: If partitions or workers is lower than 1
+            requests.HTTPError: If a search request fails
+
+        Example:
+            body = SearchBody(doc_types=["assets"])
+            for obj in client.search().scan(body, partitions=16, per_page=500,
+                                            generate_signed_url=False):
+                ...
+        """
+        body = self._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
+        workers = workers or partitions
+        ranges = self.plan_scan(
+            body,
+            partitions=partitions,
+            max_partition_size=max_partition_size,
+            start=start,
+            end=end,
+            workers=workers,
+        )
+        factories = [
+            partial(self._scan_partition, body, bounds, per_page, kwargs) for bounds in ranges
+        ]
+        return self._page_objects(merge_iterators(factories, workers, buffer=2 * workers))
+
+    @staticmethod
+    def _export_body(body: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+        """Only transfer the exported fields"""
+        if fields is None:
+            return body
+        return {**body, "include_fields": list(fields)}
+
+    def export(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        destination: Destination,
+        format: str = "ndjson",
+        fields: Optional[Sequence[str]] = None,
+        per_page: int = 500,
+        partitions: Optional[int] = None,
+        exclude_defaults: bool = True,
+        **kwargs,
+    ) -> int:
+        """
+        Stream every object matching a search into an NDJSON, CSV or Parquet
+        file, one page at a time, without accumulating results in memory.
+
+        Args:
+            search_body: Search parameters, either as SearchBody model or dict.
+            destination: Path, or an open file (text for ndjson/csv, binary
+                for parquet).
+            format: One of ``ndjson``, ``csv`` or ``parquet`` (requires the
+                optional ``pyarrow`` dependency).
+            fields: Columns to export. They are sent as ``include_fields`` so
+                only these fields are transferred; dotted names such as
+                ``metadata.Description`` reach into nested values. All the
+                returned fields are exported by default, with CSV and
+                Parquet columns inferred from the first rows: pass
+                ``fields`` when hits have different fields.
+            per_page: The number of documents for each page.
+            partitions: Export with a parallel :meth:`scan` over this many
+                partitions instead of a single cursor; rows are then not in
+                sort order.
+            exclude_defaults: Whether to exclude default values when dumping Pydantic models for the request body.
+            **kwargs: Additional arguments passed to :meth:`search` for every
+                page (defaults to ``generate_signed_url=False``).
+
+        Returns:
+            Number of exported rows
+
+        Raises:
+            ValueError: If format is not supported
+            requests.HTTPError: If a search request fails
+            ExportError: If a CSV or Parquet row has a column or a type the
+                inferred columns do not have
+
+        Example:
+            client.search().export(
+                SearchBody(doc_types=["assets"]), "assets.csv", format="csv",
+                fields=["id", "title", "date_created"],
+            )
+        """
+        body = self._export_body(
+            self._prepare_model_data(search_body, exclude_defaults=exclude_defaults), fields
+        )
+        kwargs.setdefault("generate_signed_url", False)
+        if partitions:
+            objects = self.scan(body, partitions=partitions, per_page=per_page, **kwargs)
+        else:
+            objects = self.iter_search(body, per_page=per_page, **kwargs)
+        return export_objects(objects, destination, format, fields)
+
+
+class AsyncSearchSpec(AsyncSpec, SearchSpec):
+    """asyncio counterpart of :class:`SearchSpec`, every method is awaitable"""
+
+    async def _edge_date(self, body: Dict[str, Any], order: str) -> Optional[int]:
+        return self._first_date(await self._search_quietly(self._edge_body(body, order)))
+
+    async def _count(self, body: Dict[str, Any], low: int, high: int) -> int:
+        return self._total(
+            await self._search_quietly(self._count_body(self._range_body(body, low, high)))
+        )
+
+    async def plan_scan(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        partitions: int = 8,
+        max_partition_size: Optional[int] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        workers: Optional[int] = None,
+        exclude_defaults: bool = True,
+    ) -> List[Tuple[str, str]]:
+        """See :meth:`SearchSpec.plan_scan`"""
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1")
+        body = self._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
+        low = _to_millis(start) if start is not None else await self._edge_date(body, "asc")
+        high = _to_millis(end) if end is not None else await self._edge_date(body, "desc")
+        if low is None or high is None or high < low:
+            return []
+
+        total = await self._count(body, low, high)
+        threshold = max_partition_size or 2 * max(1, math.ceil(total / partitions))
+        limit = asyncio.Semaphore(workers or partitions)
+
+        async def count(bounds):
+            async with limit:
+                return await self._count(body, *bounds)
+
+        planned = []
+        pending = _split_range(low, high, partitions)
+        while pending:
+            totals = await asyncio.gather(*(count(bounds) for bounds in pending))
+            pending = _replan(pending, totals, threshold, planned)
+        return [(_format_millis(low), _format_millis(high)) for low, high in sorted(planned)]
+
+    async def scan(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        partitions: int = 8,
+        workers: Optional[int] = None,
+        max_partition_size: Optional[int] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        per_page: Optional[int] = None,
+        exclude_defaults: bool = True,
+        **kwargs,
+    ):
+        """See :meth:`SearchSpec.scan`, use with ``async for``"""
+        body = self._prepare_model_data(search_body, exclude_defaults=exclude_defaults)
+        workers = workers or partitions
+        ranges = await self.plan_scan(
+            body,
+            partitions=partitions,
+            max_partition_size=max_partition_size,
+            start=start,
+            end=end,
+            workers=workers,
+        )
+        factories = [
+            partial(self._scan_partition, body, bounds, per_page, kwargs) for bounds in ranges
+        ]
+        async for page in amerge_iterators(factories, workers, buffer=2 * workers):
+            for obj in page.data.objects or []:
+                yield obj
+
+    async def export(
+        self,
+        search_body: Union[SearchBody, Dict[str, Any]],
+        destination: Destination,
+        format: str = "ndjson",
+        fields: Optional[Sequence[str]] = None,
+        per_page: int = 500,
+        partitions: Optional[int] = None,
+        exclude_defaults: bool = True,
+        **kwargs,
+    ) -> int:
+        """
+        See :meth:`SearchSpec.export`. Rows are handed to the writer a page
+        at a time in a worker thread, so file IO and Parquet flushes don't
+        block the event loop.
+        """
+        body = self._export_body(
+            self._prepare_model_data(search_body, exclude_defaults=exclude_defaults), fields
+        )
+        kwargs.setdefault("generate_signed_url", False)
+        if partitions:
+            objects = self.scan(body, partitions=partitions, per_page=per_page, **kwargs)
+        else:
+            objects = self.iter_search(body, per_page=per_page, **kwargs)
+        writer = await asyncio.to_thread(open_writer, destination, format, fields)
+        try:
+            rows = []
+            async for obj in objects:
+                rows.append(project(obj, fields))
+                if len(rows) >= per_page:
+                    await asyncio.to_thread(writer.write_rows, rows)
+                    rows = []
+            if rows:
+                await asyncio.to_thread(writer.write_rows, rows)
+        finally:
+            await asyncio.to_thread(writer.close)
+        return writer.rows
@@ -1,5 +1,7 @@
 import uuid
 import datetime
+import pytest
+import requests
 import requests_mock
 
 from pythonik.client import PythonikClient
@@ -38,6 +40,7 @@ from pythonik.specs.assets import (
     VERSIONS_FROM_ASSET_URL,
     BULK_DELETE_SEGMENTS_URL,
 )
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
 
 
 def test_partial_update_asset():
@@ -489,3 +492,46 @@ def test_get_segments():
         assert "per_page=5" in last_request.url
         assert "segment_type=MARKER" in last_request.url
         assert "time_start_milliseconds__gte=500" in last_request.url
+
+
+def test_get_many_searches_in_chunks_and_falls_back():
+    with requests_mock.Mocker() as m:
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        assets = client.assets()
+        indexed = [str(uuid.uuid4()) for _ in range(5)]
+        not_indexed = str(uuid.uuid4())
+        deleted = str(uuid.uuid4())
+
+        def respond(request, context):
+            ids = request.json()["filter"]["terms"][0]["value_in"]
+            return {
+                "objects": [{"id": i, "title": f"title {i}"} for i in ids if i in indexed],
+                "total": len(ids),
+            }
+
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json=respond)
+        m.get(AssetSpec.gen_url(GET_URL.format(not_indexed)), json=Asset(id=not_indexed, title="fresh").model_dump())
+        m.get(AssetSpec.gen_url(GET_URL.format(deleted)), status_code=404, json={})
+
+        requested = [not_indexed] + indexed + [indexed[0], deleted]
+        result = assets.get_many(requested, chunk_size=2, include_fields=["title"])
+
+        assert list(result) == [not_indexed] + indexed
+        assert all(isinstance(asset, Asset) for asset in result.values())
+        assert result[indexed[1]].title == f"title {indexed[1]}"
+        assert result[not_indexed].title == "fresh"
+
+        searches = [call for call in m.request_history if call.method == "POST"]
+        assert len(searches) == 4  # 7 unique ids in chunks of 2
+        assert searches[0].qs["generate_signed_url"] == ["false"]
+        assert searches[0].json()["include_fields"] == ["id", "title"]
+        assert len([call for call in m.request_history if call.method == "GET"]) == 2
+
+
+def test_get_many_raises_on_search_error():
+    with requests_mock.Mocker() as m:
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        assets = client.assets()
+        m.post(SearchSpec.gen_url(SEARCH_PATH), status_code=500, json={})
+        with pytest.raises(requests.HTTPError):
+            assets.get_many(["a"])
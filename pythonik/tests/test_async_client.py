@@ -0,0 +1,349 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from pythonik.client import AsyncPythonikClient
+from pythonik.hooks import RequestHooks
+from pythonik.models.assets.assets import Asset, BulkDelete, BulkDeleteObjectType
+from pythonik.models.assets.collections import Collection, CustomOrderStatus
+from pythonik.models.base import Response, Status
+from pythonik.models.files.file import FileSet
+from pythonik.models.files.format import Format
+from pythonik.models.files.proxy import Proxy
+from pythonik.models.jobs.job_body import JobBody
+from pythonik.models.jobs.job_response import JobResponse
+from pythonik.models.metadata.views import ViewMetadata
+from pythonik.models.search.search_body import SearchBody
+from pythonik.models.search.search_response import SearchResponse
+from pythonik.specs.assets import (
+    BULK_DELETE_URL,
+    GET_URL,
+    PURGE_ALL_URL,
+    AsyncAssetSpec,
+)
+from pythonik.specs.collection import GET_URL as COLLECTION_GET_URL
+from pythonik.specs.collection import AsyncCollectionSpec
+from pythonik.specs.files import (
+    DELETE_ASSETS_FILE_SET_PATH,
+    GET_ASSET_PROXIES_MULTIPART_COMPLETE_URL_PATH,
+    GET_ASSET_PROXY_PATH,
+    AsyncFilesSpec,
+)
+from pythonik.specs.jobs import CREATE_JOB_PATH, AsyncJobSpec
+from pythonik.specs.metadata import AsyncMetadataSpec
+from pythonik.specs.search import SEARCH_PATH, AsyncSearchSpec
+
+httpx = pytest.importorskip("httpx")
+
+
+def make_session(routes, calls=None):
+    """Build an httpx.AsyncClient answering from a {(method, url): response} dict"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url).split("?")[0]
+        if calls is not None:
+            calls.append(request)
+        status, body, headers = routes[(request.method, url)]
+        if isinstance(body, str):
+            return httpx.Response(status, text=body, headers=headers)
+        return httpx.Response(status, json=body, headers=headers)
+
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+        headers={"App-ID": "app", "Auth-Token": "token"},
+    )
+
+
+def test_async_client_builds_async_specs():
+    async def run():
+        async with AsyncPythonikClient(
+            app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3
+        ) as client:
+            assert isinstance(client.assets(), AsyncAssetSpec)
+            assert isinstance(client.assets().collections, AsyncCollectionSpec)
+            assert isinstance(client.collections(), AsyncCollectionSpec)
+            assert isinstance(client.files(), AsyncFilesSpec)
+            assert isinstance(client.metadata(), AsyncMetadataSpec)
+            assert isinstance(client.search(), AsyncSearchSpec)
+            assert isinstance(client.jobs(), AsyncJobSpec)
+            assert "Auth-Token" not in client.storage_session.headers
+        assert client.session.is_closed
+
+    asyncio.run(run())
+
+
+def test_async_get_asset():
+    asset_id = str(uuid.uuid4())
+    model = Asset(id=asset_id, title="async asset")
+    calls = []
+    session = make_session(
+        {("GET", AsyncAssetSpec.gen_url(GET_URL.format(asset_id))): (200, model.model_dump(), None)},
+        calls,
+    )
+
+    async def run():
+        return await AsyncAssetSpec(session, timeout=3).get(asset_id)
+
+    result = asyncio.run(run())
+    assert isinstance(result, Response)
+    assert result.response.ok
+    assert isinstance(result.data, Asset)
+    assert result.data.id == asset_id
+    assert calls[0].headers["Auth-Token"] == "token"
+
+
+def test_async_concurrent_requests():
+    asset_ids = [str(uuid.uuid4()) for _ in range(50)]
+    routes = {
+        ("GET", AsyncAssetSpec.gen_url(GET_URL.format(asset_id))): (
+            200,
+            Asset(id=asset_id).model_dump(),
+            None,
+        )
+        for asset_id in asset_ids
+    }
+    spec = AsyncAssetSpec(make_session(routes), timeout=3)
+
+    async def run():
+        return await asyncio.gather(*(spec.get(asset_id) for asset_id in asset_ids))
+
+    results = asyncio.run(run())
+    assert [result.data.id for result in results] == asset_ids
+
+
+def test_async_hooks():
+    asset_id = str(uuid.uuid4())
+    session = make_session(
+        {("GET", AsyncAssetSpec.gen_url(GET_URL.format(asset_id))): (200, Asset(id=asset_id).model_dump(), None)}
+    )
+    hooks = RequestHooks()
+    events = []
+    hooks.register("post_response", events.append)
+
+    async def run():
+        return await AsyncAssetSpec(session, timeout=3, hooks=hooks).get(asset_id)
+
+    asyncio.run(run())
+    assert events[0].endpoint == "/API/assets/v1/assets/{}/"
+    assert events[0].status_code == 200
+    assert events[0].bytes_in > 0
+
+
+def test_async_error_response_has_no_data():
+    asset_id = str(uuid.uuid4())
+    session = make_session(
+        {("GET", AsyncAssetSpec.gen_url(GET_URL.format(asset_id))): (404, {"errors": ["nope"]}, None)}
+    )
+
+    async def run():
+        return await AsyncAssetSpec(session, timeout=3).get(asset_id)
+
+    result = asyncio.run(run())
+    assert not result.response.ok
+    assert result.response.status_code == 404
+    assert result.data is None
+
+
+def test_async_bulk_delete_permanently():
+    calls = []
+    session = make_session(
+        {
+            ("POST", AsyncAssetSpec.gen_url(BULK_DELETE_URL)): (202, {}, None),
+            ("POST", AsyncAssetSpec.gen_url(PURGE_ALL_URL)): (202, {}, None),
+        },
+        calls,
+    )
+    body = BulkDelete(object_ids=["a"], object_type=BulkDeleteObjectType.ASSETS)
+
+    async def run():
+        return await AsyncAssetSpec(session, timeout=3).bulk_delete(
+            body, permanently_delete=True
+        )
+
+    result = asyncio.run(run())
+    assert result.response.status_code == 202
+    assert [str(call.url) for call in calls] == [
+        AsyncAssetSpec.gen_url(BULK_DELETE_URL),
+        AsyncAssetSpec.gen_url(PURGE_ALL_URL),
+    ]
+
+
+def test_async_collection_and_job_and_search():
+    collection_id = str(uuid.uuid4())
+    collection = Collection(
+        id=collection_id,
+        title="c",
+        status=Status.ACTIVE,
+        custom_order_status=CustomOrderStatus.ENABLED,
+    )
+    job = JobBody(title="job")
+    search_body = SearchBody(doc_types=["assets"])
+    calls = []
+    session = make_session(
+        {
+            ("GET", AsyncCollectionSpec.gen_url(COLLECTION_GET_URL.format(collection_id))): (
+                200,
+                json.loads(collection.model_dump_json()),
+                None,
+            ),
+            ("POST", AsyncJobSpec.gen_url(CREATE_JOB_PATH)): (200, job.model_dump(), None),
+            ("POST", AsyncSearchSpec.gen_url(SEARCH_PATH)): (
+                200,
+                {"objects": [{"id": "x", "title": "found"}], "total": 1},
+                None,
+            ),
+        },
+        calls,
+    )
+
+    async def run():
+        return await asyncio.gather(
+            AsyncCollectionSpec(session, timeout=3).get(collection_id),
+            AsyncJobSpec(session, timeout=3).create(job),
+            AsyncSearchSpec(session, timeout=3).search(
+                search_body, per_page=5, generate_signed_url=False
+            ),
+        )
+
+    collection_res, job_res, search_res = asyncio.run(run())
+    assert collection_res.data.id == collection_id
+    assert isinstance(job_res.data, JobResponse)
+    assert isinstance(search_res.data, SearchResponse)
+    assert search_res.data.objects[0].title == "found"
+    search_call = [call for call in calls if call.method == "POST" and "search" in str(call.url)][0]
+    assert search_call.url.params["per_page"] == "5"
+    assert json.loads(search_call.content) == {"doc_types": ["assets"]}
+
+
+def test_async_metadata_intercept_404():
+    asset_id = str(uuid.uuid4())
+    view_id = str(uuid.uuid4())
+    url = AsyncMetadataSpec.gen_url(f"assets/{asset_id}/views/{view_id}/")
+    session = make_session({("GET", url): (404, {"errors": ["no metadata"]}, None)})
+    default = ViewMetadata()
+
+    async def run():
+        return await AsyncMetadataSpec(session, timeout=3).get_asset_metadata(
+            asset_id, view_id, intercept_404=default
+        )
+
+    result = asyncio.run(run())
+    assert result.data is default
+    result.response.raise_for_status()  # disabled by intercept_404
+    with pytest.raises(Exception):
+        result.response.raise_for_status_404()
+
+
+def test_async_delete_file_set_204():
+    asset_id = str(uuid.uuid4())
+    file_set_id = str(uuid.uuid4())
+    url = AsyncFilesSpec.gen_url(DELETE_ASSETS_FILE_SET_PATH.format(asset_id, file_set_id))
+    session = make_session({("DELETE", url): (204, "", None)})
+
+    async def run():
+        return await AsyncFilesSpec(session, timeout=3).delete_asset_file_set(
+            asset_id, file_set_id
+        )
+
+    result = asyncio.run(run())
+    assert result.response.status_code == 204
+    assert result.data is None
+
+    session = make_session(
+        {("DELETE", url): (200, FileSet(id=file_set_id, status="DELETED").model_dump(), None)}
+    )
+    result = asyncio.run(run())
+    assert isinstance(result.data, FileSet)
+
+
+def test_async_get_upload_id_for_proxy_uses_storage_session():
+    asset_id = str(uuid.uuid4())
+    proxy_id = str(uuid.uuid4())
+    upload_url = "https://storage.googleapis.com/bucket/object.mp4"
+    proxy = Proxy(
+        asset_id=asset_id, id=proxy_id, upload_url=upload_url, storage_method="GCS"
+    )
+    api_calls = []
+    storage_calls = []
+    session = make_session(
+        {
+            ("GET", AsyncFilesSpec.gen_url(GET_ASSET_PROXY_PATH.format(asset_id, proxy_id))): (
+                200,
+                proxy.model_dump(),
+                None,
+            ),
+            ("GET", AsyncFilesSpec.gen_url(
+                GET_ASSET_PROXIES_MULTIPART_COMPLETE_URL_PATH.format(asset_id, proxy_id)
+            )): (200, {"complete_url": "https://complete"}, None),
+        },
+        api_calls,
+    )
+    storage_session = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: storage_calls.append(request)
+            or httpx.Response(200, headers={"X-GUploader-UploadID": "upload-123"})
+        )
+    )
+    spec = AsyncFilesSpec(session, timeout=3, storage_session=storage_session)
+
+    async def run():
+        upload = await spec.get_upload_id_for_proxy(asset_id, proxy_id)
+        complete = await spec.get_s3_complete_url(asset_id, proxy_id, upload.data)
+        return upload, complete
+
+    upload, complete = asyncio.run(run())
+    assert upload.data == "upload-123"
+    assert complete.data == "https://complete"
+    assert storage_calls[0].headers["X-Goog-Resumable"] == "start"
+    assert "Auth-Token" not in storage_calls[0].headers
+
+
+def test_async_get_many():
+    indexed = [str(uuid.uuid4()) for _ in range(3)]
+    missing = str(uuid.uuid4())
+
+    def handler(request):
+        if request.method == "POST":
+            ids = json.loads(request.content)["filter"]["terms"][0]["value_in"]
+            return httpx.Response(200, json={"objects": [{"id": i} for i in ids if i in indexed]})
+        return httpx.Response(200, json=Asset(id=missing).model_dump())
+
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    spec = AsyncAssetSpec(session, timeout=3)
+
+    async def run():
+        return await spec.get_many(indexed + [missing], chunk_size=2)
+
+    result = asyncio.run(run())
+    assert list(result) == indexed + [missing]
+
+
+def test_async_get_asset_bundle():
+    asset_id = str(uuid.uuid4())
+    base = AsyncFilesSpec.gen_url(f"assets/{asset_id}/")
+    listings = {
+        "formats/": [Format(id="original").model_dump()],
+        "formats/original/components/": [{"id": "video", "type": "VIDEO"}],
+        "file_sets/": [FileSet(id="fs-1", format_id="original").model_dump()],
+        "files/": [{"id": "f-1", "file_set_id": "fs-1", "format_id": "original"}],
+        "proxies/": [Proxy(id="proxy-1").model_dump()],
+        "keyframes/": [],
+    }
+    requested = []
+
+    def handler(request):
+        path = str(request.url)[len(base):]
+        requested.append(path)
+        return httpx.Response(200, json={"objects": listings[path]})
+
+    spec = AsyncFilesSpec(httpx.AsyncClient(transport=httpx.MockTransport(handler)), timeout=3)
+
+    bundle = asyncio.run(spec.get_asset_bundle(asset_id))
+    assert sorted(requested) == sorted(listings)
+    assert bundle.formats[0].components[0].id == "video"
+    assert bundle.format_of(bundle.files[0]).id == "original"
+    assert bundle.file_set_of(bundle.files[0]).id == "fs-1"
+    assert [proxy.id for proxy in bundle.proxies] == ["proxy-1"]
+    assert bundle.keyframes == []
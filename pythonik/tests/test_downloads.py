@@ -0,0 +1,230 @@
+import asyncio
+import hashlib
+import os
+import threading
+
+import pytest
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.downloads import (
+    DownloadState,
+    PartWriter,
+    content_range_size,
+    download_source,
+    download_state_path,
+)
+from pythonik.exceptions import DownloadError
+from pythonik.models.files.file import File
+from pythonik.models.files.proxy import Proxy
+from pythonik.specs.files import AsyncFilesSpec
+from pythonik.uploads import MiB
+
+URL = "https://bucket.s3.us-west-2.amazonaws.com/master.mov?X-Amz-Signature=sig"
+PART = MiB
+
+
+@pytest.fixture(autouse=True)
+def no_resume_backoff(monkeypatch):
+    monkeypatch.setattr("pythonik.uploads.RESUME_BACKOFF", 0)
+
+
+def parse_range(header):
+    start, end = header[len("bytes=") :].split("-")
+    return int(start), int(end)
+
+
+class FakeStorage:
+    """Serves data with Range support, answering the listed statuses first for some ranges"""
+
+    def __init__(self, data, etag='"v1"'):
+        self.data = data
+        self.etag = etag
+        # range start -> statuses (or "short" for a truncated body) to answer first
+        self.failures = {}
+        self.ranges = []
+
+    def get(self, request, context):
+        start, end = parse_range(request.headers["Range"])
+        self.ranges.append((start, end))
+        context.headers["ETag"] = self.etag
+        failures = self.failures.get(start)
+        failure = failures.pop(0) if failures else None
+        if not self.data:
+            context.status_code = 416
+            context.headers["Content-Range"] = "bytes */0"
+            return b""
+        end = min(end, len(self.data) - 1)
+        context.status_code = 206
+        context.headers["Content-Range"] = f"bytes {start}-{end}/{len(self.data)}"
+        if failure == "short":
+            return self.data[start:end]
+        if failure:
+            context.status_code = failure
+            return b""
+        return self.data[start : end + 1]
+
+
+def test_download_helpers():
+    class Response:
+        headers = {"Content-Range": "bytes 0-0/1234"}
+
+    assert content_range_size(Response) == 1234
+    Response.headers = {"Content-Range": "bytes */0"}
+    assert content_range_size(Response) == 0
+    Response.headers = {}
+    assert content_range_size(Response) is None
+
+    assert download_source(URL) == (URL, None)
+    assert download_source(File(url=URL, checksum="abc")) == (URL, "abc")
+    with pytest.raises(ValueError, match="generate_signed_url"):
+        download_source(Proxy(url=None))
+
+
+def test_download(tmp_path):
+    data = os.urandom(3 * PART + 123)
+    dest = tmp_path / "master.mov"
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    storage = FakeStorage(data)
+    with requests_mock.Mocker() as m:
+        m.get(URL, content=storage.get)
+        result = files.download(
+            File(url=URL, checksum=hashlib.md5(data).hexdigest()), dest, part_size=PART, workers=3
+        )
+
+    assert result.data == str(dest)
+    assert dest.read_bytes() == data
+    assert not os.path.exists(download_state_path(dest))
+    assert "Auth-Token" not in m.request_history[0].headers
+    assert sorted(storage.ranges[1:]) == [
+        (0, PART - 1),
+        (PART, 2 * PART - 1),
+        (2 * PART, 3 * PART - 1),
+        (3 * PART, 3 * PART + 122),
+    ]
+
+
+def test_download_retries_truncated_and_failed_parts(tmp_path):
+    data = os.urandom(2 * PART)
+    dest = tmp_path / "master.mov"
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    storage = FakeStorage(data)
+    storage.failures = {PART: ["short", 503]}
+    with requests_mock.Mocker() as m:
+        m.get(URL, content=storage.get)
+        files.download(URL, dest, part_size=PART)
+
+    assert dest.read_bytes() == data
+    assert storage.ranges.count((PART, 2 * PART - 1)) == 3
+
+
+def test_download_resumes_missing_parts(tmp_path):
+    data = os.urandom(4 * PART)
+    dest = tmp_path / "master.mov"
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    storage = FakeStorage(data)
+    storage.failures = {2 * PART: [403]}
+    with requests_mock.Mocker() as m:
+        m.get(URL, content=storage.get)
+        with pytest.raises(DownloadError) as error:
+            files.download(URL, dest, part_size=PART, workers=1)
+        assert error.value.response.status_code == 403
+
+        state = DownloadState.load(download_state_path(dest), len(data), '"v1"', PART)
+        assert sorted(state.done) == [1, 2]
+
+        storage.ranges = []
+        files.download(URL, dest, part_size=PART, workers=1)
+
+    assert dest.read_bytes() == data
+    # the probe and the two missing parts only
+    assert storage.ranges == [(0, 0), (2 * PART, 3 * PART - 1), (3 * PART, 4 * PART - 1)]
+
+
+def test_download_restarts_when_the_object_changed(tmp_path):
+    data = os.urandom(2 * PART)
+    dest = tmp_path / "master.mov"
+    dest.write_bytes(bytes(len(data)))
+    DownloadState(size=len(data), etag='"v0"', part_size=PART, done=[1]).save(download_state_path(dest))
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        m.get(URL, content=FakeStorage(data, etag='"v1"').get)
+        files.download(URL, dest, part_size=PART)
+
+    assert dest.read_bytes() == data
+
+
+def test_download_checksum_mismatch(tmp_path):
+    dest = tmp_path / "master.mov"
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        m.get(URL, content=FakeStorage(os.urandom(1000)).get)
+        with pytest.raises(DownloadError, match="Checksum mismatch"):
+            files.download(File(url=URL, checksum="0" * 32), dest)
+
+
+def test_download_without_range_support(tmp_path):
+    data = os.urandom(1000)
+    dest = tmp_path / "master.mov"
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        m.get(URL, content=data)
+        result = files.download(URL, dest, checksum=hashlib.md5(data).hexdigest())
+
+    assert result.response.status_code == 200
+    assert dest.read_bytes() == data
+    assert m.call_count == 1
+
+
+def test_download_empty_object(tmp_path):
+    dest = tmp_path / "empty.mov"
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        m.get(URL, content=FakeStorage(b"").get)
+        files.download(URL, dest)
+
+    assert dest.read_bytes() == b""
+    assert m.call_count == 1
+
+
+def test_async_download(tmp_path, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    threads = set()
+
+    class RecordingPartWriter(PartWriter):
+        def write(self, chunk):
+            threads.add(threading.get_ident())
+            super().write(chunk)
+
+    monkeypatch.setattr("pythonik.specs.files.PartWriter", RecordingPartWriter)
+    data = os.urandom(3 * PART + 5)
+    dest = tmp_path / "master.mov"
+    storage = FakeStorage(data)
+    storage.failures = {PART: [503]}
+
+    class Context:
+        def __init__(self):
+            self.headers = {}
+            self.status_code = 200
+
+    def handler(request):
+        context = Context()
+        body = storage.get(request, context)
+        return httpx.Response(context.status_code, headers=context.headers, content=body)
+
+    transport = httpx.MockTransport(handler)
+    spec = AsyncFilesSpec(
+        httpx.AsyncClient(transport=transport),
+        timeout=3,
+        storage_session=httpx.AsyncClient(transport=transport),
+    )
+
+    result = asyncio.run(
+        spec.download(URL, dest, part_size=PART, checksum=hashlib.md5(data).hexdigest())
+    )
+    assert result.data == str(dest)
+    assert result.response.status_code == 206
+    assert dest.read_bytes() == data
+    assert not os.path.exists(download_state_path(dest))
+    # the parts are written in worker threads, not on the event loop
+    assert threads and threading.get_ident() not in threads
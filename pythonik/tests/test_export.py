@@ -0,0 +1,191 @@
+import csv
+import io
+import json
+import uuid
+
+import pytest
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.exceptions import ExportError
+from pythonik.export import CSVWriter, ParquetWriter, export_objects, open_writer, project
+from pythonik.models.search.search_body import SearchBody
+from pythonik.models.search.search_response import Object
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+def mock_search(m, hits, per_page_default=10):
+    def respond(request, context):
+        after = request.json().get("search_after")
+        per_page = int(request.qs.get("per_page", [per_page_default])[0])
+        start = 0 if after is None else int(after[1]) + 1
+        return {"objects": hits[start:start + per_page], "total": len(hits)}
+
+    m.post(SearchSpec.gen_url(SEARCH_PATH), json=respond)
+
+
+def make_hits(count):
+    return [
+        {
+            "id": str(i),
+            "title": f"asset {i}",
+            "metadata": {"Description": [f"desc {i}"]},
+            "_sort": ["2024-01-01", str(i)],
+        }
+        for i in range(count)
+    ]
+
+
+def test_project_only_keeps_returned_fields():
+    obj = Object.model_validate({"id": "1", "title": "t", "_sort": [1, "1"], "metadata": {"a": 1}})
+    assert project(obj) == {"id": "1", "title": "t", "metadata": {"a": 1}}
+    assert project(obj, ["id", "metadata.a", "metadata.b", "status"]) == {
+        "id": "1",
+        "metadata.a": 1,
+        "metadata.b": None,
+        "status": None,
+    }
+
+
+def test_export_ndjson_streams_pages():
+    with requests_mock.Mocker() as m:
+        search = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3).search()
+        mock_search(m, make_hits(5))
+        out = io.StringIO()
+
+        rows = search.export(SearchBody(doc_types=["assets"]), out, per_page=2)
+
+        assert rows == 5
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [line["id"] for line in lines] == ["0", "1", "2", "3", "4"]
+        assert "sort" not in lines[0]
+        assert m.call_count == 3
+        assert m.request_history[0].qs["generate_signed_url"] == ["false"]
+
+
+def test_async_export_writes_off_the_event_loop():
+    import asyncio
+    import threading
+
+    httpx = pytest.importorskip("httpx")
+    from pythonik.specs.search import AsyncSearchSpec
+
+    hits = make_hits(5)
+
+    def handler(request):
+        after = json.loads(request.content).get("search_after")
+        per_page = int(request.url.params["per_page"])
+        start = 0 if after is None else int(after[1]) + 1
+        return httpx.Response(200, json={"objects": hits[start:start + per_page], "total": len(hits)})
+
+    class RecordingIO(io.StringIO):
+        threads = set()
+
+        def write(self, text):
+            self.threads.add(threading.get_ident())
+            return super().write(text)
+
+    spec = AsyncSearchSpec(None, timeout=3)
+    spec.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    out = RecordingIO()
+
+    rows = asyncio.run(spec.export(SearchBody(doc_types=["assets"]), out, per_page=2))
+
+    assert rows == 5
+    assert [json.loads(line)["id"] for line in out.getvalue().splitlines()] == ["0", "1", "2", "3", "4"]
+    assert out.threads and threading.get_ident() not in out.threads
+
+
+def test_export_csv_projects_fields(tmp_path):
+    with requests_mock.Mocker() as m:
+        search = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3).search()
+        mock_search(m, make_hits(3))
+        path = tmp_path / "assets.csv"
+
+        rows = search.export(
+            SearchBody(doc_types=["assets"]),
+            path,
+            format="csv",
+            fields=["id", "title", "metadata.Description"],
+        )
+
+        assert rows == 3
+        assert m.request_history[0].json()["include_fields"] == [
+            "id",
+            "title",
+            "metadata.Description",
+        ]
+        with open(path, newline="") as f:
+            written = list(csv.DictReader(f))
+        assert written[1] == {"id": "1", "title": "asset 1", "metadata.Description": '["desc 1"]'}
+
+
+def sparse_hits():
+    return [
+        {"id": "1", "title": "a"},
+        {"id": "2"},
+        {"id": "3", "title": "c", "metadata": {"Description": ["late"]}},
+    ]
+
+
+def test_csv_writer_uses_first_row_columns():
+    out = io.StringIO()
+    with CSVWriter(out) as writer:
+        writer.write_rows(sparse_hits()[:2])
+        with pytest.raises(ExportError, match="metadata"):
+            writer.write(sparse_hits()[2])
+    assert out.getvalue().splitlines() == ["id,title", "1,a", "2,"]
+
+
+def test_export_csv_with_fields_keeps_sparse_columns():
+    out = io.StringIO()
+    rows = export_objects(sparse_hits(), out, format="csv", fields=["id", "metadata.Description"])
+    assert rows == 3
+    assert out.getvalue().splitlines() == [
+        "id,metadata.Description",
+        "1,",
+        "2,",
+        '3,"[""late""]"',
+    ]
+
+
+def test_export_unknown_format():
+    with pytest.raises(ValueError):
+        open_writer(io.StringIO(), format="xml")
+
+
+def test_export_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "assets.parquet"
+    objects = [Object.model_validate(hit) for hit in make_hits(25)]
+
+    rows = export_objects(objects, path, format="parquet", fields=["id", "title", "status"])
+
+    table = pq.read_table(path)
+    assert rows == 25
+    assert table.column_names == ["id", "title", "status"]
+    assert table.column("id").to_pylist() == [str(i) for i in range(25)]
+
+
+def test_parquet_writer_infers_columns_from_the_first_row_group():
+    pq = pytest.importorskip("pyarrow.parquet")
+    out = io.BytesIO()
+    with ParquetWriter(out, row_group_size=3) as writer:
+        writer.write_rows(sparse_hits())
+    out.seek(0)
+    assert pq.read_table(out).to_pylist() == [
+        {"id": "1", "title": "a", "metadata": None},
+        {"id": "2", "title": None, "metadata": None},
+        {"id": "3", "title": "c", "metadata": '{"Description":["late"]}'},
+    ]
+
+
+def test_parquet_writer_rejects_rows_that_do_not_fit_the_schema():
+    pytest.importorskip("pyarrow.parquet")
+    with pytest.raises(ExportError, match="from row 3 has columns missing.*metadata"):
+        with ParquetWriter(io.BytesIO(), row_group_size=2) as writer:
+            writer.write_rows(sparse_hits())
+
+    with pytest.raises(ExportError, match="from row 2 does not match"):
+        with ParquetWriter(io.BytesIO(), fields=["id", "size"], row_group_size=1) as writer:
+            writer.write_rows([{"id": "1", "size": 10}, {"id": "2", "size": "large"}])
@@ -2,6 +2,7 @@ import uuid
 from enum import Enum
 
 import pytest
+import requests
 import requests_mock
 
 from pythonik.client import PythonikClient
@@ -38,6 +39,7 @@ from pythonik.specs.files import (
     DELETE_ASSETS_FILE_SET_PATH,
     GET_ASSETS_FILE_SET_FILES_PATH,
     GET_ASSETS_FORMAT_COMPONENTS_PATH,
+    GET_ASSETS_FORMAT_COMPONENTS_LIST_PATH,
     GET_ASSET_PROXIES_MULTIPART_URL_PATH,
     GET_ASSETS_FILE_PATH,
     GET_ASSETS_VERSION_FILE_SETS_PATH,
@@ -377,6 +379,35 @@ def test_get_proxy_upload_id(storage_method, exception):
         client.files().get_upload_id_for_proxy(asset_id, proxy_id)
 
 
+def test_upload_id_uses_client_storage_session():
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+    files = client.files()
+    assert files.storage_session is client.storage_session
+    assert client.files().storage_session is files.storage_session
+
+    asset_id = str(uuid.uuid4())
+    proxy_id = str(uuid.uuid4())
+    upload_url = generate_mock_gcs_upload_url(str(uuid.uuid4()), "proxy.mp4")
+    proxy = Proxy(
+        asset_id=asset_id,
+        id=proxy_id,
+        upload_url=upload_url,
+        storage_method=StorageMethod.GCS,
+    )
+    with requests_mock.Mocker() as m:
+        m.get(
+            FilesSpec.gen_url(GET_ASSET_PROXY_PATH.format(asset_id, proxy_id)),
+            json=proxy.model_dump(),
+        )
+        m.post(upload_url, headers={"X-GUploader-UploadID": "upload-id"})
+        result = files.get_upload_id_for_proxy(asset_id, proxy_id)
+
+    assert result.data == "upload-id"
+    storage_request = m.request_history[-1]
+    assert "Auth-Token" not in storage_request.headers
+    assert "App-ID" not in storage_request.headers
+
+
 def test_get_s3_presigned_url():
     with requests_mock.Mocker() as m:
         app_id = str(uuid.uuid4())
@@ -855,3 +886,86 @@ def test_get_asset_files_by_version():
             generate_signed_url=False,
             content_disposition="attachment",
         )
+
+
+def test_get_asset_bundle():
+    asset_id = str(uuid.uuid4())
+    client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+    files_url = FilesSpec.gen_url(GET_ASSETS_FILES_PATH.format(asset_id))
+    formats = [Format(id="original", name="ORIGINAL"), Format(id="ppro", name="PPRO_PROJECT")]
+    file_sets = [FileSet(id="fs-1", format_id="original"), FileSet(id="fs-2", format_id="ppro")]
+    with requests_mock.Mocker() as m:
+        m.get(
+            FilesSpec.gen_url(GET_ASSETS_FORMATS_PATH.format(asset_id)),
+            json=Formats(objects=formats).model_dump(),
+        )
+        for fmt in formats:
+            m.get(
+                FilesSpec.gen_url(GET_ASSETS_FORMAT_COMPONENTS_LIST_PATH.format(asset_id, fmt.id)),
+                json={"objects": [{"id": f"{fmt.id}-video", "type": "VIDEO", "metadata": {}}]},
+            )
+        m.get(
+            FilesSpec.gen_url(GET_ASSETS_FILE_SETS_PATH.format(asset_id)),
+            json=FileSets(objects=file_sets).model_dump(),
+        )
+        # the files span two pages
+        m.get(
+            files_url,
+            [
+                {"json": {"objects": [{"id": "f-1", "file_set_id": "fs-1", "format_id": "original"}],
+                          "next_url": files_url + "?page=2"}},
+                {"json": {"objects": [{"id": "f-2", "file_set_id": "fs-2", "format_id": "ppro"}]}},
+            ],
+        )
+        m.get(
+            FilesSpec.gen_url(GET_ASSET_PROXIES_PATH.format(asset_id)),
+            json=Proxies(objects=[Proxy(id="proxy-1")]).model_dump(),
+        )
+        m.get(
+            FilesSpec.gen_url(GET_ASSET_KEYFRAMES.format(asset_id)),
+            json=Keyframes(objects=[Keyframe(id="keyframe-1")]).model_dump(),
+        )
+        bundle = client.files().get_asset_bundle(asset_id)
+
+    assert [fmt.id for fmt in bundle.formats] == ["original", "ppro"]
+    assert bundle.formats[1].components == [Component(id="ppro-video", type="VIDEO", metadata={})]
+    assert [file.id for file in bundle.files] == ["f-1", "f-2"]
+    assert [proxy.id for proxy in bundle.proxies] == ["proxy-1"]
+    assert [keyframe.id for keyframe in bundle.keyframes] == ["keyframe-1"]
+    file = bundle.files[1]
+    assert bundle.file_set_of(file).id == "fs-2"
+    assert bundle.format_of(bundle.file_set_of(file)).name == "PPRO_PROJECT"
+    assert bundle.files_of("fs-1") == [bundle.files[0]]
+    assert bundle.file_sets_of("original") == [bundle.file_sets[0]]
+
+
+def test_get_asset_bundle_of_a_version():
+    asset_id, version_id = str(uuid.uuid4()), str(uuid.uuid4())
+    client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+    with requests_mock.Mocker() as m:
+        m.get(FilesSpec.gen_url(GET_ASSETS_VERSION_FORMATS_PATH.format(asset_id, version_id)), json={"objects": []})
+        m.get(FilesSpec.gen_url(GET_ASSETS_VERSION_FILE_SETS_PATH.format(asset_id, version_id)), json={"objects": []})
+        m.get(FilesSpec.gen_url(GET_ASSETS_VERSION_FILES_PATH.format(asset_id, version_id)), json={"objects": []})
+        m.get(
+            FilesSpec.gen_url(GET_ASSET_PROXIES_PATH.format(asset_id)),
+            json=Proxies(objects=[Proxy(id="old", version_id="v0"), Proxy(id="new", version_id=version_id)]).model_dump(),
+        )
+        m.get(FilesSpec.gen_url(GET_ASSET_KEYFRAMES.format(asset_id)), json={"objects": []})
+        bundle = client.files().get_asset_bundle(asset_id, version_id=version_id)
+
+    assert bundle.version_id == version_id
+    assert [proxy.id for proxy in bundle.proxies] == ["new"]
+    assert m.call_count == 5
+
+
+def test_get_asset_bundle_raises_on_failed_listing():
+    asset_id = str(uuid.uuid4())
+    client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+    with requests_mock.Mocker() as m:
+        m.get(FilesSpec.gen_url(GET_ASSETS_FORMATS_PATH.format(asset_id)), json={"objects": []})
+        m.get(FilesSpec.gen_url(GET_ASSETS_FILE_SETS_PATH.format(asset_id)), json={"objects": []})
+        m.get(FilesSpec.gen_url(GET_ASSETS_FILES_PATH.format(asset_id)), status_code=403, json={})
+        m.get(FilesSpec.gen_url(GET_ASSET_PROXIES_PATH.format(asset_id)), json={"objects": []})
+        m.get(FilesSpec.gen_url(GET_ASSET_KEYFRAMES.format(asset_id)), json={"objects": []})
+        with pytest.raises(requests.HTTPError):
+            client.files().get_asset_bundle(asset_id)
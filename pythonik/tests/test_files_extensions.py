@@ -49,6 +49,28 @@ def test_create_storage_file():
         assert result.data.total == 1
 
 
+def test_partial_update_storage_file():
+    """Test updating the size and status of a file of a storage."""
+    with requests_mock.Mocker() as m:
+        storage_id = str(uuid.uuid4())
+        file_id = str(uuid.uuid4())
+
+        mock_address = (
+            f"https://app.iconik.io/API/files/v1/storages/{storage_id}/files/{file_id}/"
+        )
+        m.patch(mock_address, json={"id": file_id, "size": 2048, "status": "CLOSED"})
+
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+        result = client.files().partial_update_storage_file(
+            storage_id, file_id, {"size": 2048, "status": FileStatus.CLOSED.value}
+        )
+
+        assert result.response.ok
+        assert isinstance(result.data, File)
+        assert result.data.status == FileStatus.CLOSED
+        assert m.last_request.json() == {"size": 2048, "status": "CLOSED"}
+
+
 def test_fetch_asset_format_components():
     """Test fetching components for a format in an asset."""
     with requests_mock.Mocker() as m:
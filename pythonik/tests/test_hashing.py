@@ -0,0 +1,32 @@
+import hashlib
+import os
+
+from pythonik.hashing import file_digests, hash_files
+
+
+def test_file_digests(tmp_path):
+    path = tmp_path / "master.mov"
+    data = os.urandom(3 * 1024 * 1024 + 17)
+    path.write_bytes(data)
+
+    digests = file_digests(path, ("md5", "sha256"), buffer_size=1024 * 1024)
+    assert digests == {
+        "md5": hashlib.md5(data).hexdigest(),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+    assert file_digests(path)["md5"] == hashlib.md5(data).hexdigest()
+
+
+def test_hash_files(tmp_path):
+    contents = {}
+    for i in range(6):
+        path = tmp_path / f"file{i}.bin"
+        contents[str(path)] = os.urandom(i * 1000)
+        path.write_bytes(contents[str(path)])
+
+    digests = hash_files(list(contents), algorithms=("md5", "sha256"), processes=2)
+    assert digests == {
+        path: {"md5": hashlib.md5(data).hexdigest(), "sha256": hashlib.sha256(data).hexdigest()}
+        for path, data in contents.items()
+    }
+    assert hash_files([]) == {}
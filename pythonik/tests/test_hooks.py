@@ -0,0 +1,107 @@
+import json
+import uuid
+
+import pytest
+import requests
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.hooks import RequestHooks, endpoint_template
+from pythonik.models.assets.assets import Asset
+from pythonik.specs.assets import GET_URL, AssetSpec
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+def test_endpoint_template_collapses_ids():
+    asset_id = str(uuid.uuid4())
+    segment_id = str(uuid.uuid4())
+    url = AssetSpec.gen_url(f"assets/{asset_id}/segments/{segment_id}/") + "?page=2"
+    assert endpoint_template(url) == "/API/assets/v1/assets/{}/segments/{}/"
+
+
+def test_no_stdout_on_requests(capsys):
+    with requests_mock.Mocker() as m:
+        asset_id = str(uuid.uuid4())
+        m.get(AssetSpec.gen_url(GET_URL.format(asset_id)), json=Asset(id=asset_id).model_dump())
+
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+        client.assets().get(asset_id)
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+
+
+def test_hooks_receive_request_events():
+    with requests_mock.Mocker() as m:
+        asset_id = str(uuid.uuid4())
+        body = {"objects": [], "total": 0}
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json=body)
+        m.get(AssetSpec.gen_url(GET_URL.format(asset_id)), status_code=404, json={})
+
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+        pre, post = [], []
+        client.hooks.register("pre_request", pre.append)
+
+        @client.hooks.on("post_response")
+        def record(event):
+            post.append(event)
+
+        client.search().search({"doc_types": ["assets"]})
+        client.assets().get(asset_id)
+
+    assert len(pre) == 2
+    search_event, get_event = post
+    assert search_event is pre[0]
+    assert search_event.method == "POST"
+    assert search_event.endpoint == "/API/search/v1/search/"
+    assert search_event.status_code == 200
+    assert search_event.bytes_out == len(b'{"doc_types": ["assets"]}')
+    assert search_event.bytes_in == len(json.dumps(body))
+    assert search_event.elapsed >= 0
+    assert get_event.endpoint == "/API/assets/v1/assets/{}/"
+    assert get_event.status_code == 404
+    assert get_event.error is None
+
+
+def test_error_hook_called_and_exception_reraised():
+    with requests_mock.Mocker() as m:
+        asset_id = str(uuid.uuid4())
+        m.get(
+            AssetSpec.gen_url(GET_URL.format(asset_id)),
+            exc=requests.exceptions.ConnectTimeout,
+        )
+
+        hooks = RequestHooks()
+        errors = []
+        hooks.register("error", errors.append)
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3, hooks=hooks)
+
+        with pytest.raises(requests.exceptions.ConnectTimeout):
+            client.assets().get(asset_id)
+
+    assert len(errors) == 1
+    assert isinstance(errors[0].error, requests.exceptions.ConnectTimeout)
+    assert errors[0].status_code is None
+
+
+def test_failing_hook_does_not_break_request():
+    with requests_mock.Mocker() as m:
+        asset_id = str(uuid.uuid4())
+        m.get(AssetSpec.gen_url(GET_URL.format(asset_id)), json=Asset(id=asset_id).model_dump())
+
+        client = PythonikClient(app_id="app", auth_token="token", timeout=3)
+        client.hooks.register("post_response", lambda event: 1 / 0)
+        result = client.assets().get(asset_id)
+
+    assert result.data.id == asset_id
+
+
+def test_register_unknown_stage():
+    hooks = RequestHooks()
+    assert not hooks
+    with pytest.raises(ValueError):
+        hooks.register("after", print)
+    hook = hooks.register("pre_request", print)
+    assert hooks
+    hooks.unregister("pre_request", hook)
+    assert not hooks
@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.loader import AsyncBatchLoader, BatchLoader, asset_loader, metadata_loader
+from pythonik.models.metadata.views import ViewMetadata
+from pythonik.specs.metadata import MetadataSpec
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+def test_batch_loader_coalesces_and_dedupes():
+    calls = []
+
+    def batch(keys):
+        calls.append(keys)
+        return {key: key * 2 for key in keys if key != 3}
+
+    with BatchLoader(batch, wait=0.05) as loader:
+        futures = loader.load_many([1, 2, 1, 3])
+        assert [future.result() for future in futures] == [2, 4, 2, None]
+        assert loader.get(2) == 4  # cached
+    assert calls == [[1, 2, 3]]
+
+
+def test_batch_loader_from_many_threads_and_max_batch_size():
+    calls = []
+    lock = threading.Lock()
+
+    def batch(keys):
+        with lock:
+            calls.append(len(keys))
+        return {key: str(key) for key in keys}
+
+    loader = BatchLoader(batch, max_batch_size=10, wait=0.05)
+    results = {}
+
+    def worker(key):
+        results[key] = loader.get(key)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(25)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    loader.close()
+
+    assert results == {i: str(i) for i in range(25)}
+    assert sum(calls) == 25
+    assert max(calls) <= 10
+    assert len(calls) < 25
+
+
+def test_batch_loader_errors_are_not_cached():
+    attempts = []
+
+    def batch(keys):
+        attempts.append(keys)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        return {key: key for key in keys}
+
+    loader = BatchLoader(batch, wait=0.001)
+    with pytest.raises(RuntimeError):
+        loader.get("a")
+    assert loader.get("a") == "a"
+    loader.close()
+
+
+def test_batch_loader_cancelled_caller_does_not_affect_others():
+    started = threading.Event()
+    release = threading.Event()
+
+    def batch(keys):
+        started.set()
+        release.wait(5)
+        return {key: key * 2 for key in keys}
+
+    with BatchLoader(batch, wait=0.001) as loader:
+        cancelled, other, same = loader.load(1), loader.load(2), loader.load(1)
+        assert started.wait(5)
+        assert cancelled.cancel()
+        release.set()
+        assert other.result(timeout=5) == 4
+        assert same.result(timeout=5) == 2
+        # the cached value is not cancelled either
+        assert loader.get(1) == 2
+
+
+def test_batch_loader_resolves_the_batch_on_base_exceptions():
+    def batch(keys):
+        raise KeyboardInterrupt
+
+    loader = BatchLoader(batch, wait=0.001)
+    future = loader.load("a")
+    with pytest.raises(KeyboardInterrupt):
+        future.result(timeout=5)
+    loader.close()
+
+
+def test_async_batch_loader_one_tick():
+    calls = []
+
+    async def batch(keys):
+        calls.append(keys)
+        return {key: key.upper() for key in keys}
+
+    async def run():
+        loader = AsyncBatchLoader(batch)
+
+        async def lookup(key):
+            return await loader.load(key)
+
+        first = await asyncio.gather(lookup("a"), lookup("b"), lookup("a"))
+        second = await loader.load_many(["a", "c"])
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == ["A", "B", "A"]
+    assert second == ["A", "C"]
+    assert calls == [["a", "b"], ["c"]]
+
+
+def test_async_batch_loader_cancelled_caller_does_not_affect_others():
+    calls = []
+
+    async def batch(keys):
+        calls.append(keys)
+        await asyncio.sleep(0.05)
+        return {key: key * 2 for key in keys}
+
+    async def run():
+        loader = AsyncBatchLoader(batch)
+        other = asyncio.ensure_future(loader.load(1))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(loader.load(1), 0.01)
+        assert await other == 2
+        # the cached value was not cancelled
+        assert await loader.load(1) == 2
+        return loader
+
+    loader = asyncio.run(run())
+    assert calls == [[1]]
+    assert not loader._tasks
+
+
+def test_async_batch_loader_cancelled_batch_is_not_cached():
+    calls = []
+
+    async def batch(keys):
+        calls.append(keys)
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+        return {key: key for key in keys}
+
+    async def run():
+        loader = AsyncBatchLoader(batch)
+        first = asyncio.ensure_future(loader.load("a"))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        for task in loader._tasks:
+            task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await loader.load("a")
+
+    assert asyncio.run(run()) == "a"
+    assert calls == [["a"], ["a"]]
+
+
+def test_asset_loader_uses_get_many():
+    with requests_mock.Mocker() as m:
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        assets = client.assets()
+        ids = [str(uuid.uuid4()) for _ in range(3)]
+
+        def respond(request, context):
+            requested = request.json()["filter"]["terms"][0]["value_in"]
+            return {"objects": [{"id": i} for i in requested]}
+
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json=respond)
+
+        with asset_loader(assets, wait=0.05) as loader:
+            futures = loader.load_many(ids)
+            assert [future.result().id for future in futures] == ids
+        assert m.call_count == 1
+
+
+def test_metadata_loader_fans_out():
+    with requests_mock.Mocker() as m:
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        metadata = client.metadata()
+        view_id = str(uuid.uuid4())
+        with_metadata, without_metadata = str(uuid.uuid4()), str(uuid.uuid4())
+        m.get(
+            MetadataSpec.gen_url(f"assets/{with_metadata}/views/{view_id}/"),
+            json={"metadata_values": {"field": {"field_values": [{"value": "x"}]}}},
+        )
+        m.get(MetadataSpec.gen_url(f"assets/{without_metadata}/views/{view_id}/"), status_code=404)
+
+        with metadata_loader(metadata, wait=0.05) as loader:
+            found, missing, again = loader.load_many(
+                [(with_metadata, view_id), (without_metadata, view_id), (with_metadata, view_id)]
+            )
+            assert isinstance(found.result(), ViewMetadata)
+            assert missing.result() is None
+            assert again is not found
+            assert again.result() is found.result()
+        assert m.call_count == 2
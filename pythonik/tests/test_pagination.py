@@ -0,0 +1,346 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+import requests
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.models.assets.assets import Asset
+from pythonik.models.files.file import File, FileSet
+from pythonik.models.files.proxy import Proxy
+from pythonik.models.base import PaginatedResponse, Response
+from pythonik.models.search.search_body import SearchBody, SortItem
+from pythonik.pagination import aprefetch_pages, next_url_cursor, prefetch_pages
+from pythonik.specs.assets import GET_SEGMENTS_URL, LIST_URL, AssetSpec
+from pythonik.specs.collection import GET_CONTENTS, CollectionSpec
+from pythonik.specs.files import (
+    GET_ASSET_PROXIES_PATH,
+    GET_DELETE_QUEUE_OBJECT_TYPE_PATH,
+    GET_STORAGE_FILES_PATH,
+    FilesSpec,
+)
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+def make_client():
+    return PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+
+
+def test_iter_all_follows_next_url():
+    with requests_mock.Mocker() as m:
+        assets = make_client().assets()
+        first = AssetSpec.gen_url(LIST_URL)
+        second = first + "?page=2"
+        ids = [str(uuid.uuid4()) for _ in range(3)]
+        m.get(
+            first,
+            json={"objects": [{"id": ids[0]}, {"id": ids[1]}], "next_url": second, "page": 1, "pages": 2},
+        )
+        m.get(second, json={"objects": [{"id": ids[2]}], "next_url": None, "page": 2, "pages": 2})
+
+        assets = assets.iter_all(params={"per_page": 2})
+        assert not m.called  # lazy until consumed
+        result = list(assets)
+
+        assert [asset.id for asset in result] == ids
+        assert all(isinstance(asset, Asset) for asset in result)
+        assert m.call_count == 2
+        assert m.request_history[0].qs == {"per_page": ["2"]}
+
+
+def test_iter_asset_proxies_streams_typed_objects():
+    with requests_mock.Mocker() as m:
+        files = make_client().files()
+        asset_id = str(uuid.uuid4())
+        first = FilesSpec.gen_url(GET_ASSET_PROXIES_PATH.format(asset_id))
+        second = "/API/files/v1/" + GET_ASSET_PROXIES_PATH.format(asset_id) + "?page=2"
+        m.get(first, json={"objects": [{"id": "a"}], "next_url": second})
+        m.get(FilesSpec.gen_url(second), json={"objects": [{"id": "b"}]})
+
+        iterator = files.iter_asset_proxies(asset_id)
+        proxy = next(iterator)
+        assert isinstance(proxy, Proxy)
+        assert m.call_count == 1  # the second page is only fetched on demand
+        assert [proxy.id] + [p.id for p in iterator] == ["a", "b"]
+        assert m.call_count == 2
+
+
+def test_iter_storage_files():
+    with requests_mock.Mocker() as m:
+        files_spec = make_client().files()
+        storage_id = str(uuid.uuid4())
+        m.get(
+            FilesSpec.gen_url(GET_STORAGE_FILES_PATH.format(storage_id)),
+            json={"objects": [{"id": "f1"}, {"id": "f2"}], "next_url": ""},
+        )
+        files = list(files_spec.iter_storage_files(storage_id))
+        assert [f.id for f in files] == ["f1", "f2"]
+        assert all(isinstance(f, File) for f in files)
+
+
+def test_iter_deleted_file_sets_is_typed():
+    with requests_mock.Mocker() as m:
+        files = make_client().files()
+        url = FilesSpec.gen_url(GET_DELETE_QUEUE_OBJECT_TYPE_PATH.format("file_sets"))
+        m.get(url, json={"objects": [{"id": "fs1", "status": "DELETED"}]})
+        result = list(files.iter_deleted_file_sets())
+        assert isinstance(result[0], FileSet)
+
+        # the plain getter keeps returning the raw response
+        assert files.get_deleted_file_sets().data is None
+
+
+def test_iter_contents():
+    with requests_mock.Mocker() as m:
+        collections = make_client().collections()
+        collection_id = str(uuid.uuid4())
+        m.get(
+            CollectionSpec.gen_url(GET_CONTENTS.format(collection_id)),
+            json={"objects": [{"id": "x", "object_type": "assets"}]},
+        )
+        contents = list(collections.iter_contents(collection_id))
+        assert contents == [{"id": "x", "object_type": "assets"}]
+
+
+def test_pagination_raises_on_failed_page():
+    with requests_mock.Mocker() as m:
+        assets = make_client().assets()
+        first = AssetSpec.gen_url(LIST_URL)
+        m.get(first, json={"objects": [{"id": "a"}], "next_url": first + "?page=2"})
+        m.get(first + "?page=2", status_code=500)
+
+        iterator = assets.iter_all()
+        assert next(iterator).id == "a"
+        with pytest.raises(requests.HTTPError):
+            next(iterator)
+
+
+def test_paginate_yields_pages():
+    with requests_mock.Mocker() as m:
+        spec = make_client().assets()
+        first = AssetSpec.gen_url(LIST_URL)
+        m.get(first, json={"objects": [1], "next_url": first + "?page=2", "page": 1})
+        m.get(first + "?page=2", json={"objects": [2], "page": 2})
+        pages = list(spec.paginate(spec.list_all))
+        assert [page.data.page for page in pages] == [1, 2]
+
+
+def test_async_iter_all():
+    httpx = pytest.importorskip("httpx")
+    from pythonik.specs.assets import AsyncAssetSpec
+
+    spec = AsyncAssetSpec(None, timeout=3)
+    first = AsyncAssetSpec.gen_url(LIST_URL)
+    pages = {
+        first: {"objects": [{"id": "a"}], "next_url": first + "?page=2"},
+        first + "?page=2": {"objects": [{"id": "b"}], "next_url": None},
+    }
+    spec.session = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json=pages[str(request.url)])
+        )
+    )
+
+    async def run():
+        return [asset.id async for asset in spec.iter_all()]
+
+    assert asyncio.run(run()) == ["a", "b"]
+
+
+def fake_page(number, pages):
+    response = requests.Response()
+    response.status_code = 200
+    next_url = f"page-{number + 1}" if number < pages else None
+    return Response(
+        response=response,
+        data=PaginatedResponse(objects=[number], page=number, next_url=next_url),
+    )
+
+
+def test_prefetch_pages_reads_ahead_with_bounded_depth():
+    fetched = []
+
+    def fetch(cursor):
+        number = 1 if cursor is None else int(cursor.split("-")[1])
+        fetched.append(number)
+        return fake_page(number, pages=10)
+
+    pages = prefetch_pages(fetch, next_url_cursor, depth=2)
+    first = next(pages)
+    assert first.data.page == 1
+    # the worker fetches ahead but never holds more than `depth` pages
+    for _ in range(100):
+        if len(fetched) >= 3:
+            break
+        time.sleep(0.01)
+    assert len(fetched) == 3
+    time.sleep(0.1)
+    assert len(fetched) == 3
+    assert [page.data.page for page in pages] == list(range(2, 11))
+
+
+def test_prefetch_pages_propagates_errors():
+    def fetch(cursor):
+        if cursor is None:
+            return fake_page(1, pages=2)
+        raise requests.ConnectionError("boom")
+
+    pages = prefetch_pages(fetch, next_url_cursor, depth=1)
+    assert next(pages).data.page == 1
+    with pytest.raises(requests.ConnectionError):
+        next(pages)
+
+    with pytest.raises(ValueError):
+        prefetch_pages(fetch, next_url_cursor, depth=0)
+
+
+def test_aprefetch_pages():
+    async def fetch(cursor):
+        number = 1 if cursor is None else int(cursor.split("-")[1])
+        return fake_page(number, pages=5)
+
+    async def run():
+        return [page.data.page async for page in aprefetch_pages(fetch, next_url_cursor, depth=2)]
+
+    assert asyncio.run(run()) == [1, 2, 3, 4, 5]
+
+
+def test_iter_all_with_prefetch():
+    with requests_mock.Mocker() as m:
+        assets = make_client().assets()
+        first = AssetSpec.gen_url(LIST_URL)
+        m.get(first, json={"objects": [{"id": "a"}], "next_url": first + "?page=2"})
+        m.get(first + "?page=2", json={"objects": [{"id": "b"}]})
+
+        assert [asset.id for asset in assets.iter_all(prefetch=2)] == ["a", "b"]
+
+
+def test_search_pages_feeds_search_after():
+    with requests_mock.Mocker() as m:
+        search = make_client().search()
+        hits = [{"id": str(i), "_sort": [i, str(i)]} for i in range(5)]
+
+        def respond(request, context):
+            after = request.json().get("search_after")
+            start = 0 if after is None else after[0] + 1
+            return {"objects": hits[start:start + 2]}
+
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json=respond)
+        body = SearchBody(
+            doc_types=["assets"],
+            sort=[SortItem(name="date_created", order="asc"), SortItem(name="id", order="asc")],
+        )
+
+        pages = list(search.search_pages(body, per_page=2, prefetch=1))
+        assert [[obj.id for obj in page.data.objects] for page in pages] == [
+            ["0", "1"],
+            ["2", "3"],
+            ["4"],
+        ]
+        assert [call.json().get("search_after") for call in m.request_history] == [
+            None,
+            [1, "1"],
+            [3, "3"],
+        ]
+        assert m.request_history[0].qs["per_page"] == ["2"]
+
+        with pytest.raises(ValueError):
+            search.search_pages(SearchBody(doc_types=["assets"]))
+
+
+def test_iter_segments_scrolls():
+    with requests_mock.Mocker() as m:
+        assets = make_client().assets()
+        asset_id = str(uuid.uuid4())
+        batches = {
+            None: {"objects": [{"id": "s1"}, {"id": "s2"}], "scroll_id": "scroll-1"},
+            "scroll-1": {"objects": [{"id": "s3"}], "scroll_id": "scroll-2"},
+            "scroll-2": {"objects": [], "scroll_id": "scroll-3"},
+        }
+
+        def respond(request, context):
+            scroll_id = request.qs.get("scroll_id", [None])[0]
+            return batches[scroll_id]
+
+        m.get(AssetSpec.gen_url(GET_SEGMENTS_URL.format(asset_id)), json=respond)
+
+        segments = list(assets.iter_segments(asset_id, per_page=2, prefetch=1, segment_type="COMMENT"))
+        assert [segment.id for segment in segments] == ["s1", "s2", "s3"]
+        assert m.call_count == 3
+        assert m.request_history[0].qs["scroll"] == ["true"]
+        assert m.request_history[0].qs["segment_type"] == ["comment"]
+
+
+def test_fetch_all_fans_out_pages_in_order():
+    with requests_mock.Mocker() as m:
+        collections = make_client().collections()
+        collection_id = str(uuid.uuid4())
+
+        def respond(request, context):
+            page = int(request.qs["page"][0])
+            # later pages answer first to prove the output is still ordered
+            time.sleep(0.01 * (6 - page))
+            return {"objects": [{"id": str(page)}], "page": page, "pages": 5, "total": 5}
+
+        m.get(CollectionSpec.gen_url(GET_CONTENTS.format(collection_id)), json=respond)
+
+        contents = collections.iter_contents(
+            collection_id, parallel=3, params={"per_page": 1}
+        )
+        assert [obj["id"] for obj in contents] == ["1", "2", "3", "4", "5"]
+        assert sorted(int(call.qs["page"][0]) for call in m.request_history) == [1, 2, 3, 4, 5]
+        assert all(call.qs["per_page"] == ["1"] for call in m.request_history)
+
+
+def test_fetch_all_without_page_count_follows_pages_serially():
+    with requests_mock.Mocker() as m:
+        assets = make_client().assets()
+
+        def respond(request, context):
+            page = int(request.qs["page"][0])
+            return {"objects": [{"id": str(page)}], "next_url": "more" if page < 3 else None}
+
+        m.get(AssetSpec.gen_url(LIST_URL), json=respond)
+        pages = list(assets.fetch_all(assets.list_all, parallel=4))
+        assert [page.data.objects[0]["id"] for page in pages] == ["1", "2", "3"]
+
+        with pytest.raises(ValueError):
+            list(assets.iter_all(parallel=2, prefetch=2))
+
+
+def test_fetch_all_raises_on_failed_page():
+    with requests_mock.Mocker() as m:
+        assets = make_client().assets()
+
+        def respond(request, context):
+            if request.qs["page"] == ["3"]:
+                context.status_code = 500
+                return {}
+            return {"objects": [], "pages": 4}
+
+        m.get(AssetSpec.gen_url(LIST_URL), json=respond)
+        pages = assets.fetch_all(assets.list_all, parallel=2)
+        assert len([next(pages), next(pages)]) == 2
+        with pytest.raises(requests.HTTPError):
+            next(pages)
+
+
+def test_async_fetch_all():
+    httpx = pytest.importorskip("httpx")
+    from pythonik.specs.files import AsyncFilesSpec
+
+    spec = AsyncFilesSpec(None, timeout=3)
+    asset_id = str(uuid.uuid4())
+
+    def respond(request):
+        page = int(request.url.params["page"])
+        return httpx.Response(200, json={"objects": [{"id": str(page)}], "pages": 4})
+
+    spec.session = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+
+    async def run():
+        return [f.id async for f in spec.iter_asset_files(asset_id, parallel=2)]
+
+    assert asyncio.run(run()) == ["1", "2", "3", "4"]
@@ -0,0 +1,247 @@
+import asyncio
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.models.assets.assets import Asset
+from pythonik.ratelimit import (
+    MAX_PAUSE,
+    RateLimiter,
+    SharedBuckets,
+    SharedTokenBucket,
+    TokenBucket,
+    endpoint_family,
+    retry_after,
+)
+from pythonik.specs.assets import GET_URL, AssetSpec, AsyncAssetSpec
+from pythonik.specs.search import SEARCH_PATH, SearchSpec
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_token_bucket_bursts_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # tokens are handed out in order, each one a tenth of a second later
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+    clock.now += 1
+    assert bucket.reserve() == 0
+
+
+def test_token_bucket_throttle_pauses_and_adapts():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, clock=clock)
+    bucket.throttle(2)
+    assert bucket.rate == 5
+    assert bucket.reserve() == pytest.approx(2 + 1 / 5)
+
+    for _ in range(50):
+        bucket.succeed()
+    assert bucket.rate == 10
+
+    for _ in range(10):
+        bucket.throttle(0)
+    assert bucket.rate == bucket.min_rate == 1
+
+
+def test_token_bucket_is_thread_safe():
+    bucket = TokenBucket(rate=1000, capacity=1000, clock=FakeClock())
+    waits = []
+
+    def take():
+        for _ in range(100):
+            waits.append(bucket.reserve())
+
+    threads = [threading.Thread(target=take) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(1 for wait in waits if wait == 0) == 1000
+
+
+def test_token_bucket_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_endpoint_family():
+    url = SearchSpec.gen_url(SEARCH_PATH)
+    assert endpoint_family("POST", url) == ("search", "write")
+    assert endpoint_family("get", AssetSpec.gen_url("assets/")) == ("assets", "read")
+    assert endpoint_family("GET", "https://storage.example.com/bucket/key") == ("default", "read")
+
+
+def test_retry_after():
+    assert retry_after(FakeResponse(429)) is None
+    assert retry_after(FakeResponse(429, {"Retry-After": "3"})) == 3
+    assert retry_after(FakeResponse(429, {"Retry-After": "garbage"})) is None
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = retry_after(FakeResponse(429, {"Retry-After": format_datetime(when, usegmt=True)}))
+    assert 28 <= delay <= 30
+
+
+def test_limiter_budgets_by_family():
+    limiter = RateLimiter(rate=50, budgets={"search": 5, "metadata.write": 10})
+    search = SearchSpec.gen_url(SEARCH_PATH)
+    metadata = "https://app.iconik.io/API/metadata/v1/assets/x/views/y/"
+    assert limiter.buckets("POST", search) == [limiter.global_bucket, limiter.budgets["search"]]
+    assert limiter.buckets("PUT", metadata)[1] is limiter.budgets["metadata.write"]
+    assert limiter.buckets("GET", metadata) == [limiter.global_bucket]
+
+
+def test_limiter_throttle_only_pauses_its_family():
+    limiter = RateLimiter(budgets={"search": 5, "assets": 5})
+    search = SearchSpec.gen_url(SEARCH_PATH)
+    assets = AssetSpec.gen_url("assets/")
+    assert limiter.should_retry("POST", search, FakeResponse(429, {"Retry-After": "5"}), 0)
+    assert limiter.budgets["search"].rate == 2.5
+    assert limiter.reserve("POST", search) > 4
+    assert limiter.reserve("GET", assets) == 0
+
+
+def test_limiter_gives_up_after_max_retries():
+    limiter = RateLimiter(max_retries=2)
+    url = SearchSpec.gen_url(SEARCH_PATH)
+    throttled = FakeResponse(429, {"Retry-After": "0"})
+    assert limiter.should_retry("POST", url, throttled, 1)
+    assert not limiter.should_retry("POST", url, throttled, 2)
+    assert not limiter.should_retry("POST", url, FakeResponse(200), 0)
+
+
+def test_client_retries_throttled_requests():
+    limiter = RateLimiter(rate=100, budgets={"assets": 50})
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3, rate_limiter=limiter)
+    assets = client.assets()
+    asset_id = str(uuid.uuid4())
+    with requests_mock.Mocker() as m:
+        m.get(
+            AssetSpec.gen_url(GET_URL.format(asset_id)),
+            [
+                {"status_code": 429, "headers": {"Retry-After": "0"}},
+                {"status_code": 200, "json": Asset(id=asset_id).model_dump()},
+            ],
+        )
+        result = assets.get(asset_id)
+
+    assert m.call_count == 2
+    assert result.data.id == asset_id
+    assert limiter.budgets["assets"].rate < 50
+
+
+def test_client_returns_429_once_retries_are_exhausted():
+    limiter = RateLimiter(max_retries=1)
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3, rate_limiter=limiter)
+    search = client.search()
+    with requests_mock.Mocker() as m:
+        m.post(
+            SearchSpec.gen_url(SEARCH_PATH),
+            status_code=429,
+            headers={"Retry-After": "0"},
+            json={},
+        )
+        result = search.search({"doc_types": ["assets"]})
+
+    assert m.call_count == 2
+    assert result.response.status_code == 429
+
+
+def test_client_shares_limiter_with_specs():
+    limiter = RateLimiter(rate=10)
+    client = PythonikClient(app_id="app", auth_token="token", timeout=3, rate_limiter=limiter)
+    assets = client.assets()
+    assert assets.rate_limiter is limiter
+    assert assets.collections.rate_limiter is limiter
+    assert client.search().rate_limiter is limiter
+    assert client.files().rate_limiter is limiter
+
+
+def test_async_spec_retries_throttled_requests():
+    httpx = pytest.importorskip("httpx")
+    asset_id = str(uuid.uuid4())
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json=Asset(id=asset_id).model_dump()),
+    ]
+    session = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: responses.pop(0)))
+    spec = AsyncAssetSpec(session, timeout=3, rate_limiter=RateLimiter(rate=100))
+
+    result = asyncio.run(spec.get(asset_id))
+    assert result.data.id == asset_id
+    assert not responses
+
+
+def _reserve_shared(path, count):
+    bucket = SharedTokenBucket(path, rate=0.001, capacity=10)
+    try:
+        return [bucket.reserve() for _ in range(count)]
+    finally:
+        bucket.close()
+
+
+def test_shared_bucket_state_is_shared(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "search.bucket"
+    first = SharedTokenBucket(path, rate=10, capacity=2, clock=clock)
+    second = SharedTokenBucket(path, rate=10, capacity=2, clock=clock)
+    assert first.reserve() == 0
+    assert second.reserve() == 0
+    assert first.reserve() == pytest.approx(0.1)
+
+    second.throttle(1)
+    assert first.rate == 5
+    assert first.reserve() > 1
+    first.close()
+    second.close()
+
+
+def test_shared_bucket_ignores_state_from_before_a_reboot(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "global.bucket"
+    bucket = SharedTokenBucket(path, rate=10, capacity=1, clock=clock)
+    bucket.throttle(10)
+    clock.now -= MAX_PAUSE + 100
+    assert bucket.reserve() == 0
+    bucket.close()
+
+
+def test_shared_bucket_across_processes(tmp_path):
+    path = str(tmp_path / "global.bucket")
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=4, mp_context=context) as executor:
+        results = list(executor.map(_reserve_shared, [path] * 4, [5] * 4))
+    waits = [wait for result in results for wait in result]
+    # 20 requests against a burst of 10: exactly 10 go through immediately
+    assert sum(1 for wait in waits if wait == 0) == 10
+
+
+def test_limiter_with_shared_buckets(tmp_path):
+    limiter = RateLimiter(rate=10, budgets={"search": 5}, bucket_factory=SharedBuckets(tmp_path))
+    assert isinstance(limiter.global_bucket, SharedTokenBucket)
+    assert (tmp_path / "global.bucket").exists()
+    assert (tmp_path / "search.bucket").exists()
+    assert limiter.reserve("POST", SearchSpec.gen_url(SEARCH_PATH)) == 0
+    limiter.close()
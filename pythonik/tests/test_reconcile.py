@@ -0,0 +1,206 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.models.files.file import File
+from pythonik.reconcile import (
+    CHANGED,
+    EXTRA,
+    MISSING,
+    FileEntry,
+    PartitionedJoin,
+    reconcile,
+    scan_tree,
+    storage_file_entry,
+)
+from pythonik.specs.files import GET_STORAGE_FILES_PATH, AsyncFilesSpec, FilesSpec
+
+
+def make_tree(root):
+    for path, content in {
+        "a.mov": b"a" * 10,
+        "clips/b.mov": b"b" * 20,
+        "clips/day1/c.mov": b"c" * 30,
+        "clips/day1/d.mov": b"",
+    }.items():
+        full = root / path
+        full.parent.mkdir(parents=True, exist_ok=True)
+        full.write_bytes(content)
+        os.utime(full, (1700000000, 1700000000))
+    (root / "empty").mkdir()
+    os.symlink(root / "a.mov", root / "link.mov")
+
+
+def test_scan_tree(tmp_path):
+    make_tree(tmp_path)
+    entries = sorted(scan_tree(tmp_path, workers=3))
+    assert entries == [
+        FileEntry("a.mov", 10, 1700000000.0),
+        FileEntry("clips/b.mov", 20, 1700000000.0),
+        FileEntry("clips/day1/c.mov", 30, 1700000000.0),
+        FileEntry("clips/day1/d.mov", 0, 1700000000.0),
+    ]
+    assert "link.mov" in {entry.path for entry in scan_tree(tmp_path, follow_symlinks=True)}
+
+
+def test_scan_tree_reports_unlistable_directories(tmp_path):
+    errors = []
+    assert list(scan_tree(tmp_path / "missing", onerror=errors.append)) == []
+    assert isinstance(errors[0], FileNotFoundError)
+
+
+def test_scan_tree_skips_only_the_entries_removed_during_the_scan(tmp_path, monkeypatch):
+    make_tree(tmp_path)
+    (tmp_path / "clips" / "vanished.mov").write_bytes(b"v")
+    scandir = os.scandir
+
+    class RemovingScandir:
+        """Removes vanished.mov after it is listed, before it is stat'ed"""
+
+        def __init__(self, path):
+            self.it = scandir(path)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self.it.close()
+
+        def __iter__(self):
+            for entry in self.it:
+                if entry.name == "vanished.mov":
+                    os.remove(entry.path)
+                yield entry
+
+    monkeypatch.setattr("pythonik.reconcile.os.scandir", RemovingScandir)
+    errors = []
+    paths = sorted(entry.path for entry in scan_tree(tmp_path, onerror=errors.append))
+
+    # the rest of the directory and its subtree are still listed
+    assert paths == ["a.mov", "clips/b.mov", "clips/day1/c.mov", "clips/day1/d.mov"]
+    assert [type(error) for error in errors] == [FileNotFoundError]
+
+
+def test_storage_file_entry():
+    file = File(
+        id="f-1",
+        name="c.mov",
+        directory_path="clips/day1",
+        size=30,
+        type="FILE",
+        file_date_modified="2023-11-14T22:13:20Z",
+    )
+    assert storage_file_entry(file) == FileEntry("clips/day1/c.mov", 30, 1700000000.0, "f-1")
+    assert storage_file_entry(File(name="a.mov", directory_path="", size=1)).path == "a.mov"
+    assert storage_file_entry(File(name="clips", type="DIRECTORY")) is None
+
+
+def test_reconcile(tmp_path):
+    local = [
+        FileEntry("same.mov", 10, 100.0),
+        FileEntry("touched.mov", 10, 100.4),
+        FileEntry("new.mov", 10, 100.0),
+        FileEntry("resized.mov", 11, 100.0),
+        FileEntry("rewritten.mov", 10, 500.0),
+    ]
+    remote = [
+        FileEntry("same.mov", 10, 100.0, "f-1"),
+        FileEntry("touched.mov", 10, 100.0, "f-2"),
+        FileEntry("resized.mov", 10, 100.0, "f-3"),
+        FileEntry("rewritten.mov", 10, 100.0, "f-4"),
+        FileEntry("deleted.mov", 10, 100.0, "f-5"),
+    ]
+    differences = list(reconcile(iter(local), iter(remote), partitions=3, directory=tmp_path))
+
+    by_path = {diff.path: diff for diff in differences}
+    assert {path: diff.kind for path, diff in by_path.items()} == {
+        "new.mov": MISSING,
+        "resized.mov": CHANGED,
+        "rewritten.mov": CHANGED,
+        "deleted.mov": EXTRA,
+    }
+    assert by_path["resized.mov"].remote.file_id == "f-3"
+    assert by_path["new.mov"].remote is None
+    # the spilled partitions are removed
+    assert os.listdir(tmp_path) == []
+
+
+def test_partitioned_join_keeps_one_partition_in_memory(tmp_path):
+    with PartitionedJoin(partitions=8, directory=tmp_path) as join:
+        join.add("local", (FileEntry(f"{i}.mov", i, 0.0) for i in range(1000)))
+        join.add("remote", (FileEntry(f"{i}.mov", i, 0.0) for i in range(10, 1000)))
+        join.flush()
+        sizes = [len(list(join._load("local", index))) for index in range(8)]
+        assert sum(sizes) == 1000
+        assert max(sizes) < 200
+        assert sorted(diff.path for diff in join.differences()) == sorted(f"{i}.mov" for i in range(10))
+
+    with pytest.raises(ValueError):
+        PartitionedJoin(partitions=0)
+
+
+def storage_files(files, next_url=None):
+    return {"objects": [file.model_dump(exclude_defaults=True) for file in files], "next_url": next_url}
+
+
+def remote_files():
+    return [
+        File(id="f-1", name="a.mov", directory_path="", size=10, type="FILE",
+             file_date_modified="2023-11-14T22:13:20+00:00"),
+        File(id="f-2", name="b.mov", directory_path="clips", size=99, type="FILE",
+             file_date_modified="2023-11-14T22:13:20+00:00"),
+        File(id="f-3", name="gone.mov", directory_path="clips", size=1, type="FILE"),
+        File(id="d-1", name="day1", directory_path="clips", type="DIRECTORY"),
+    ]
+
+
+def test_reconcile_storage(tmp_path):
+    make_tree(tmp_path)
+    storage_id = str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    url = FilesSpec.gen_url(GET_STORAGE_FILES_PATH.format(storage_id))
+    remote = remote_files()
+    with requests_mock.Mocker() as m:
+        m.get(
+            url,
+            [
+                {"json": storage_files(remote[:2], next_url=url + "?page=2")},
+                {"json": storage_files(remote[2:])},
+            ],
+        )
+        differences = sorted(files.reconcile_storage(storage_id, tmp_path, partitions=4))
+
+    assert [(diff.kind, diff.path) for diff in differences] == [
+        (CHANGED, "clips/b.mov"),
+        (EXTRA, "clips/gone.mov"),
+        (MISSING, "clips/day1/c.mov"),
+        (MISSING, "clips/day1/d.mov"),
+    ]
+    assert m.call_count == 2
+
+
+def test_async_reconcile_storage(tmp_path):
+    httpx = pytest.importorskip("httpx")
+    make_tree(tmp_path)
+    storage_id = str(uuid.uuid4())
+    remote = remote_files()
+
+    def handler(request):
+        return httpx.Response(200, json=storage_files(remote))
+
+    spec = AsyncFilesSpec(httpx.AsyncClient(transport=httpx.MockTransport(handler)), timeout=3)
+
+    async def run():
+        return [diff async for diff in spec.reconcile_storage(storage_id, tmp_path, partitions=2)]
+
+    differences = sorted(asyncio.run(run()))
+    assert [(diff.kind, diff.path) for diff in differences] == [
+        (CHANGED, "clips/b.mov"),
+        (EXTRA, "clips/gone.mov"),
+        (MISSING, "clips/day1/c.mov"),
+        (MISSING, "clips/day1/d.mov"),
+    ]
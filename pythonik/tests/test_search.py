@@ -121,3 +121,162 @@ def test_search_with_various_query_params(test_id, query_params, expected_qs_dic
 
         assert matcher.called_once
         assert m.last_request.qs == expected_qs_dict
+
+
+def test_iter_search_injects_tiebreaker_and_streams():
+    with requests_mock.Mocker() as m:
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        search = client.search()
+        hits = [{"id": str(i), "_sort": ["2024-01-01", str(i)]} for i in range(5)]
+
+        def respond(request, context):
+            after = request.json().get("search_after")
+            start = 0 if after is None else int(after[1]) + 1
+            return {"objects": hits[start:start + 2]}
+
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json=respond)
+
+        ids = [obj.id for obj in search.iter_search(SearchBody(doc_types=["assets"]), per_page=2)]
+        assert ids == ["0", "1", "2", "3", "4"]
+        assert m.call_count == 3
+        assert m.request_history[0].json()["sort"] == [
+            {"name": "date_created", "order": "asc"},
+            {"name": "id", "order": "asc"},
+        ]
+        assert m.request_history[2].json()["search_after"] == ["2024-01-01", "3"]
+
+
+def test_iter_search_appends_id_to_custom_sort():
+    body = {"doc_types": ["assets"], "sort": [{"name": "title", "order": "desc"}]}
+    assert SearchSpec._with_stable_sort(body)["sort"] == [
+        {"name": "title", "order": "desc"},
+        {"name": "id", "order": "asc"},
+    ]
+    assert body["sort"] == [{"name": "title", "order": "desc"}]  # input untouched
+
+    with_id = {"sort": [{"name": "id", "order": "desc"}]}
+    assert SearchSpec._with_stable_sort(with_id)["sort"] == [{"name": "id", "order": "desc"}]
+
+
+def fake_search_index(objects):
+    """requests_mock callback answering searches over objects like Iconik does"""
+    from pythonik.specs.search import _to_millis
+
+    def in_filter(obj, filter_):
+        for term in filter_.get("terms") or []:
+            if "range" in term:
+                value = _to_millis(obj[term["name"]])
+                if not _to_millis(term["range"]["min"]) <= value <= _to_millis(term["range"]["max"]):
+                    return False
+        return all(in_filter(obj, nested) for nested in filter_.get("filters") or [])
+
+    def respond(request, context):
+        body = request.json()
+        per_page = int(request.qs.get("per_page", ["10"])[0])
+        hits = [obj for obj in objects if in_filter(obj, body.get("filter") or {})]
+        keys = [item["name"] for item in body.get("sort") or []]
+        orders = [item["order"] for item in body.get("sort") or []]
+
+        def sort_key(obj):
+            return [_to_millis(obj[k]) if k == "date_created" else obj[k] for k in keys]
+
+        if orders and orders[0] == "desc":
+            hits.sort(key=sort_key, reverse=True)
+        else:
+            hits.sort(key=sort_key)
+        after = body.get("search_after")
+        if after:
+            hits_after = [obj for obj in hits if sort_key(obj) > after]
+        else:
+            hits_after = hits
+        page = [{**obj, "_sort": sort_key(obj)} for obj in hits_after[:per_page]]
+        return {"objects": page, "total": len(hits)}
+
+    return respond
+
+
+def make_objects():
+    from datetime import datetime, timedelta, timezone
+
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    objects = []
+    # a burst of 60 objects within one second, then a sparse tail
+    for i in range(60):
+        objects.append(base + timedelta(milliseconds=10 * i))
+    for i in range(40):
+        objects.append(base + timedelta(days=i + 1))
+    # objects created in the very same millisecond only differ by id
+    objects.append(base + timedelta(days=1))
+    return [
+        {"id": f"{i:04d}", "date_created": date.strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")}
+        for i, date in enumerate(objects)
+    ]
+
+
+def test_plan_scan_splits_dense_ranges():
+    with requests_mock.Mocker() as m:
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        search = client.search()
+        objects = make_objects()
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json=fake_search_index(objects))
+
+        ranges = search.plan_scan(SearchBody(doc_types=["assets"]), partitions=4, max_partition_size=20)
+        assert ranges[0][0] == "2024-01-01T00:00:00.000Z"
+        assert ranges[-1][1] == "2024-02-10T00:00:00.000Z"
+        assert len(ranges) > 4  # the burst was re-split
+        for (_, high), (low, _) in zip(ranges, ranges[1:]):
+            assert high < low
+
+
+def test_scan_yields_every_object_once():
+    with requests_mock.Mocker() as m:
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        search = client.search()
+        objects = make_objects()
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json=fake_search_index(objects))
+
+        body = SearchBody(doc_types=["assets"], filter=Filter(operator="AND", terms=[Term(name="status", value="ACTIVE")]))
+        ids = [obj.id for obj in search.scan(body, partitions=4, workers=3, per_page=7)]
+        assert sorted(ids) == sorted(obj["id"] for obj in objects)
+        assert len(ids) == len(set(ids))
+
+        scan_call = m.request_history[-1].json()
+        assert scan_call["filter"]["filters"] == [
+            {"operator": "AND", "terms": [{"name": "status", "value": "ACTIVE"}]}
+        ]
+
+
+def test_scan_empty_result():
+    with requests_mock.Mocker() as m:
+        client = PythonikClient(app_id=str(uuid.uuid4()), auth_token=str(uuid.uuid4()), timeout=3)
+        search = client.search()
+        m.post(SearchSpec.gen_url(SEARCH_PATH), json=fake_search_index([]))
+        assert list(search.scan(SearchBody(doc_types=["assets"]))) == []
+
+
+def test_async_scan_yields_every_object_once():
+    import asyncio
+    import json
+    from types import SimpleNamespace
+
+    httpx = pytest.importorskip("httpx")
+    from pythonik.specs.search import AsyncSearchSpec
+
+    spec = AsyncSearchSpec(None, timeout=3)
+    objects = make_objects()
+    respond = fake_search_index(objects)
+
+    def handler(request):
+        fake = SimpleNamespace(
+            json=lambda: json.loads(request.content),
+            qs={key: [value] for key, value in request.url.params.items()},
+        )
+        return httpx.Response(200, json=respond(fake, None))
+
+    spec.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run():
+        return [obj.id async for obj in spec.scan(SearchBody(doc_types=["assets"]), partitions=3, per_page=9)]
+
+    ids = asyncio.run(run())
+    assert sorted(ids) == sorted(obj["id"] for obj in objects)
@@ -0,0 +1,160 @@
+import pickle
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from urllib3.exceptions import ClosedPoolError, NewConnectionError
+
+from pythonik.client import PythonikClient
+from pythonik.transport import KEEPALIVE_SOCKET_OPTIONS, PooledHTTPAdapter, new_storage_session
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    # statuses to answer before succeeding
+    failures = []
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = b"{}"
+        self.send_response(self.failures.pop(0) if self.failures else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(base_url, **kwargs):
+    return PythonikClient(app_id="app", auth_token="token", timeout=3, base_url=base_url, **kwargs)
+
+
+def test_client_uses_configured_pool(server):
+    client = make_client(server, pool_connections=4, pool_maxsize=32, pool_block=True)
+    adapter = client.session.get_adapter(server)
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_block is True
+
+
+def test_connections_are_reused(server):
+    client = make_client(server)
+    for _ in range(3):
+        assert client.session.get(server).ok
+
+    stats = client.pool_stats()
+    assert stats.hosts == 1
+    assert stats.opened == 1
+    assert stats.reused == 2
+    assert stats.requests == 3
+    assert stats.in_use == 0
+    assert stats.idle == 1
+
+
+def test_warmup_opens_connections_used_by_requests(server):
+    client = make_client(server, pool_maxsize=3)
+    assert client.warmup(5) == 3
+    assert client.pool_stats().idle == 3
+    # already open connections are not opened twice
+    assert client.warmup(3) == 0
+
+    client.session.get(server)
+    stats = client.pool_stats()
+    assert stats.opened == 3
+    assert stats.reused == 4
+
+
+def test_undersized_pool_discards_connections(server, monkeypatch):
+    monkeypatch.setattr(KeepAliveHandler, "delay", 0.05)
+    client = make_client(server, pool_maxsize=1)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert all(r.ok for r in executor.map(client.session.get, [server] * 4))
+
+    stats = client.pool_stats()
+    assert stats.discarded > 0
+    assert stats.in_use == 0
+
+
+def test_failed_checkouts_and_requests_release_their_count(server):
+    client = make_client(server)
+    client.warmup(1)
+    pool = client.session.get_adapter(server)._pools()[0]
+    pool.close()
+    # urllib3 puts back None for a checkout that never happened
+    with pytest.raises(ClosedPoolError):
+        pool.urlopen("GET", "/")
+    assert pool.in_use == 0
+
+    # a connection closed after an error is put back as None, its checkout ends
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        refused = f"http://127.0.0.1:{sock.getsockname()[1]}/"
+    refused_pool = client.session.get_adapter(refused).poolmanager.connection_from_url(refused)
+    with pytest.raises(NewConnectionError):
+        refused_pool.urlopen("GET", "/", retries=False)
+    assert refused_pool.in_use == 0
+    assert refused_pool.opened == 1
+    assert refused_pool.discarded == 0
+
+
+def test_tcp_keepalive(server):
+    client = make_client(server, tcp_keepalive=True)
+    client.warmup(1)
+    pool = client.session.get_adapter(server)._pools()[0]
+    conn = pool._get_conn()
+    try:
+        assert conn.sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    finally:
+        pool._put_conn(conn)
+
+
+def test_adapter_pickles_with_its_settings():
+    adapter = pickle.loads(pickle.dumps(PooledHTTPAdapter(pool_maxsize=20, tcp_keepalive=True)))
+    assert adapter.tcp_keepalive is True
+    assert adapter._pool_maxsize == 20
+    assert adapter.poolmanager.connection_pool_kw["socket_options"] == KEEPALIVE_SOCKET_OPTIONS
+
+
+def test_storage_session_retries_and_reuses_connections(server, monkeypatch):
+    monkeypatch.setattr(KeepAliveHandler, "failures", [503, 500])
+    session = new_storage_session(backoff_factor=0)
+    assert session.post(server).status_code == 200
+    assert session.get(server).ok
+    stats = session.get_adapter(server).pool_stats()
+    assert stats.requests == 4
+    assert stats.opened == 1
+
+
+def test_storage_session_returns_last_error_response(server, monkeypatch):
+    monkeypatch.setattr(KeepAliveHandler, "failures", [503] * 3)
+    session = new_storage_session(retries=2, backoff_factor=0)
+    assert session.post(server).status_code == 503
+
+
+def test_client_storage_session_is_separate(server):
+    with make_client(server) as client:
+        assert client.storage_session is not client.session
+        assert "Auth-Token" not in client.storage_session.headers
+        client.storage_session.get(server)
+        assert client.storage_pool_stats().opened == 1
+        assert client.pool_stats().opened == 0
@@ -0,0 +1,953 @@
+import asyncio
+import hashlib
+import io
+import json
+import mmap
+import os
+import threading
+import uuid
+from xml.dom.minidom import parseString
+
+import pytest
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.exceptions import UnexpectedStorageMethodForProxy, UploadError
+from pythonik.models.base import StorageMethod
+from pythonik.models.files.keyframe import Keyframe
+from pythonik.models.files.proxy import Proxy
+from pythonik.specs.async_base import to_httpx_kwargs
+from pythonik.specs.files import (
+    GET_ASSET_KEYFRAME,
+    GET_ASSET_KEYFRAME_MULTIPART_COMPLETE_URL_PATH,
+    GET_ASSET_KEYFRAME_MULTIPART_URL_PATH,
+    GET_ASSET_KEYFRAMES,
+    GET_ASSET_PROXIES_MULTIPART_COMPLETE_URL_PATH,
+    GET_ASSET_PROXIES_MULTIPART_URL_PATH,
+    GET_ASSET_PROXIES_PATH,
+    GET_ASSET_PROXY_PATH,
+    AsyncFilesSpec,
+    FilesSpec,
+)
+from pythonik.tests.utils import (
+    generate_mock_gcs_upload_url,
+    generate_mock_s3_multipart_upload_start_response,
+    generate_mock_s3_multipart_upload_url,
+)
+from pythonik.uploads import (
+    GCS_CHUNK_ALIGNMENT,
+    S3_MAX_PARTS,
+    GrowingFile,
+    KeyframeIngestItem,
+    MiB,
+    ProxyIngestItem,
+    UploadDigest,
+    Part,
+    ResumableState,
+    check_gcs_chunk_size,
+    gcs_committed,
+    gcs_content_range,
+    iter_stream_parts,
+    map_part,
+    plan_parts,
+    s3_complete_body,
+    s3_part_size,
+)
+
+BUCKET_URL = "https://bucket.s3.us-west-2.amazonaws.com/proxy.mp4"
+COMPLETE_URL = BUCKET_URL + "?uploadId=upload-1&X-Amz-Signature=complete"
+
+
+def part_url(number):
+    return f"{BUCKET_URL}?partNumber={number}&uploadId=upload-1&X-Amz-Signature=sig"
+
+
+def test_s3_part_size():
+    assert s3_part_size(100, 1024) == 5 * MiB
+    assert s3_part_size(100 * MiB, 16 * MiB) == 16 * MiB
+    # 200 GiB in 16 MiB parts would need 12,800 parts
+    assert s3_part_size(200 * 1024 * MiB, 16 * MiB) == 21 * MiB
+
+
+def test_plan_parts():
+    assert plan_parts(0, 10) == [Part(1, 0, 0)]
+    assert plan_parts(25, 10) == [Part(1, 0, 10), Part(2, 10, 10), Part(3, 20, 5)]
+    assert plan_parts(20, 10) == [Part(1, 0, 10), Part(2, 10, 10)]
+
+
+def test_s3_complete_body_lists_parts_in_order():
+    body = parseString(s3_complete_body({2: '"b"', 1: '"a"'}))
+    numbers = [node.firstChild.nodeValue for node in body.getElementsByTagName("PartNumber")]
+    etags = [node.firstChild.nodeValue for node in body.getElementsByTagName("ETag")]
+    assert numbers == ["1", "2"]
+    assert etags == ['"a"', '"b"']
+
+
+def test_upload_digest_hashes_each_byte_once_in_order():
+    data = bytes(range(256)) * 4
+    md5 = hashlib.md5()
+    digest = UploadDigest([md5])
+    digest.update(512, memoryview(data)[512:768])
+    assert digest.position == 0
+    digest.update(0, data[:300])
+    # resent after a failure, partly hashed already
+    digest.update(256, data[256:512])
+    digest.update(768, data[768:])
+    assert digest.position == len(data)
+    assert md5.hexdigest() == hashlib.md5(data).hexdigest()
+
+
+def make_file(tmp_path, size):
+    path = tmp_path / "proxy.mp4"
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+def test_map_part(tmp_path):
+    path = make_file(tmp_path, mmap.ALLOCATIONGRANULARITY * 3)
+    content = path.read_bytes()
+    part = Part(2, mmap.ALLOCATIONGRANULARITY + 100, mmap.ALLOCATIONGRANULARITY)
+    view = map_part(path, part)
+    assert isinstance(view, memoryview)
+    assert view.readonly
+    assert view == content[part.offset : part.offset + part.length]
+    assert map_part(path, Part(1, 0, 0)) == b""
+
+
+def test_memoryview_bodies_are_streamed_to_httpx():
+    kwargs = to_httpx_kwargs({"data": memoryview(b"part"), "headers": {"Content-Type": "video/mp4"}})
+    assert "data" not in kwargs
+    assert kwargs["headers"] == {"Content-Length": "4", "Content-Type": "video/mp4"}
+
+    async def body():
+        return [chunk async for chunk in kwargs["content"]]
+
+    # the same view is sent again when the request is retried
+    assert asyncio.run(body()) == asyncio.run(body()) == [memoryview(b"part")]
+
+
+def mock_s3_upload(m, asset_id, proxy_id, parts_num, storage_method=StorageMethod.S3):
+    """
+    Register the Iconik and S3 endpoints of a multipart upload, returning the
+    PUT mocks. Part URLs are listed for parts 1 to the parts_num requested.
+    """
+    start_url = generate_mock_s3_multipart_upload_url("bucket", "proxy.mp4")
+    proxy = Proxy(
+        asset_id=asset_id,
+        id=proxy_id,
+        multipart_upload_url=start_url,
+        storage_method=storage_method,
+    )
+    m.get(FilesSpec.gen_url(GET_ASSET_PROXY_PATH.format(asset_id, proxy_id)), json=proxy.model_dump())
+    m.post(
+        start_url,
+        text=generate_mock_s3_multipart_upload_start_response("bucket", "proxy.mp4", "upload-1"),
+    )
+
+    def part_urls(request, context):
+        assert set(request.qs) == {"upload_id", "parts_num"}
+        numbers = range(1, int(request.qs["parts_num"][0]) + 1)
+        return {"objects": [{"number": n, "url": part_url(n)} for n in numbers]}
+
+    m.get(FilesSpec.gen_url(GET_ASSET_PROXIES_MULTIPART_URL_PATH.format(asset_id, proxy_id)), json=part_urls)
+    m.get(
+        FilesSpec.gen_url(GET_ASSET_PROXIES_MULTIPART_COMPLETE_URL_PATH.format(asset_id, proxy_id)),
+        json={"complete_url": COMPLETE_URL},
+    )
+    m.post(COMPLETE_URL, text="<CompleteMultipartUploadResult></CompleteMultipartUploadResult>")
+    return [
+        m.put(part_url(n), headers={"ETag": f'"etag-{n}"'}) for n in range(1, parts_num + 1)
+    ]
+
+
+def test_upload_proxy_file(tmp_path):
+    path = make_file(tmp_path, 11 * MiB)
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        puts = mock_s3_upload(m, asset_id, proxy_id, parts_num=3)
+        md5, sha256 = hashlib.md5(), hashlib.sha256()
+        result = files.upload_proxy_file(
+            asset_id, proxy_id, path, part_size=5 * MiB, workers=2, url_batch_size=2, hashes=[md5, sha256]
+        )
+
+    assert result.data == "upload-1"
+    assert result.response.ok
+    content = path.read_bytes()
+    # parts are sent straight from the mapped file
+    assert all(isinstance(put.last_request.body, memoryview) for put in puts)
+    uploaded = b"".join(put.last_request.body for put in puts)
+    assert uploaded == content
+    assert [len(put.last_request.body) for put in puts] == [5 * MiB, 5 * MiB, MiB]
+    assert md5.hexdigest() == hashlib.md5(content).hexdigest()
+    assert sha256.hexdigest() == hashlib.sha256(content).hexdigest()
+    # presigned URLs were requested in two growing windows
+    url_requests = [r for r in m.request_history if "multipart_url/part" in r.url]
+    assert [r.qs["parts_num"] for r in url_requests] == [["2"], ["3"]]
+
+    completion = m.request_history[-1]
+    assert completion.url == COMPLETE_URL
+    assert "Auth-Token" not in completion.headers
+    assert completion.body == s3_complete_body({n: f'"etag-{n}"' for n in (1, 2, 3)})
+
+
+def test_upload_proxy_file_uses_extra_listed_urls(tmp_path):
+    path = make_file(tmp_path, 11 * MiB)
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        mock_s3_upload(m, asset_id, proxy_id, parts_num=3)
+        # an API returning every URL at once needs a single request
+        m.get(
+            FilesSpec.gen_url(GET_ASSET_PROXIES_MULTIPART_URL_PATH.format(asset_id, proxy_id)),
+            json={"objects": [{"number": n, "url": part_url(n)} for n in (1, 2, 3)]},
+        )
+        result = files.upload_proxy_file(asset_id, proxy_id, path, part_size=5 * MiB, url_batch_size=1)
+
+    assert result.data == "upload-1"
+    assert sum(1 for r in m.request_history if "multipart_url/part" in r.url) == 1
+
+
+def test_upload_proxy_file_part_failure(tmp_path):
+    path = make_file(tmp_path, 6 * MiB)
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        mock_s3_upload(m, asset_id, proxy_id, parts_num=2)
+        m.put(part_url(2), status_code=403)
+        with pytest.raises(UploadError) as error:
+            files.upload_proxy_file(asset_id, proxy_id, path, part_size=5 * MiB)
+
+    assert error.value.response.status_code == 403
+    assert not any(r.url == COMPLETE_URL for r in m.request_history)
+
+
+def test_upload_proxy_file_completion_error(tmp_path):
+    path = make_file(tmp_path, 1024)
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        mock_s3_upload(m, asset_id, proxy_id, parts_num=1)
+        m.post(COMPLETE_URL, text="<Error><Code>InternalError</Code></Error>")
+        with pytest.raises(UploadError, match="InternalError"):
+            files.upload_proxy_file(asset_id, proxy_id, path)
+
+
+def test_upload_proxy_file_rejects_unknown_storage(tmp_path):
+    path = make_file(tmp_path, 1024)
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        mock_s3_upload(m, asset_id, proxy_id, parts_num=1, storage_method="I_MADE_IT_UP")
+        with pytest.raises(UnexpectedStorageMethodForProxy):
+            files.upload_proxy_file(asset_id, proxy_id, path)
+
+
+def test_upload_proxy_file_empty_file(tmp_path):
+    path = make_file(tmp_path, 0)
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        puts = mock_s3_upload(m, asset_id, proxy_id, parts_num=1)
+        result = files.upload_proxy_file(asset_id, proxy_id, path)
+
+    assert result.data == "upload-1"
+    request = puts[0].last_request
+    assert request.headers["Content-Length"] == "0"
+    assert "Transfer-Encoding" not in request.headers
+
+
+def chunked(data, size):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+def test_iter_stream_parts():
+    data = os.urandom(25)
+    parts = list(iter_stream_parts(chunked(data, 3), 10))
+    assert [part for part, _ in parts] == [Part(1, 0, 10), Part(2, 10, 10), Part(3, 20, 5)]
+    assert b"".join(body for _, body in parts) == data
+
+    parts = list(iter_stream_parts(io.BytesIO(data[:20]), 10))
+    assert [part for part, _ in parts] == [Part(1, 0, 10), Part(2, 10, 10)]
+    assert [part for part, _ in iter_stream_parts(iter([]), 10)] == [Part(1, 0, 0)]
+
+
+def test_iter_stream_parts_rejects_too_long_streams():
+    parts = iter_stream_parts(io.BytesIO(bytes(S3_MAX_PARTS + 1)), 1)
+    with pytest.raises(UploadError, match="larger part_size"):
+        for _ in parts:
+            pass
+
+
+def test_growing_file_waits_for_the_producer(tmp_path):
+    path = tmp_path / "proxy.mp4"
+    path.write_bytes(b"")
+    done = threading.Event()
+
+    def produce():
+        with open(path, "ab") as f:
+            for _ in range(5):
+                f.write(b"x" * 1000)
+                f.flush()
+                done.wait(0.02)
+        done.set()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    with GrowingFile(path, finished=done.is_set, poll_interval=0.005) as source:
+        assert len(source.read()) == 5000
+    thread.join()
+
+
+def test_upload_proxy_stream(tmp_path):
+    data = os.urandom(11 * MiB)
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        puts = mock_s3_upload(m, asset_id, proxy_id, parts_num=3)
+        md5 = hashlib.md5()
+        result = files.upload_proxy_stream(
+            asset_id, proxy_id, chunked(data, 300_000), part_size=5 * MiB, url_batch_size=2, hashes=[md5]
+        )
+
+    assert result.data == "upload-1"
+    assert b"".join(put.last_request.body for put in puts) == data
+    assert md5.hexdigest() == hashlib.md5(data).hexdigest()
+    # URLs are requested as the stream reaches them, not for S3_MAX_PARTS parts
+    url_requests = [r for r in m.request_history if "multipart_url/part" in r.url]
+    assert [r.qs["parts_num"] for r in url_requests] == [["2"], ["4"]]
+    assert m.request_history[-1].body == s3_complete_body({n: f'"etag-{n}"' for n in (1, 2, 3)})
+
+
+def test_upload_proxy_stream_uploads_parts_while_the_file_grows(tmp_path):
+    path = tmp_path / "proxy.mp4"
+    path.write_bytes(b"")
+    data = os.urandom(11 * MiB)
+    first_part_sent = threading.Event()
+    finished = threading.Event()
+
+    def produce():
+        with open(path, "ab") as f:
+            f.write(data[: 6 * MiB])
+            f.flush()
+            # the rest is only written once the first part went out
+            first_part_sent.wait(10)
+            f.write(data[6 * MiB :])
+        finished.set()
+
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    thread = threading.Thread(target=produce)
+    thread.start()
+    with requests_mock.Mocker() as m:
+        puts = mock_s3_upload(m, asset_id, proxy_id, parts_num=3)
+
+        def put_first(request, context):
+            first_part_sent.set()
+            context.headers["ETag"] = '"etag-1"'
+            return ""
+
+        puts[0] = m.put(part_url(1), text=put_first)
+        source = GrowingFile(path, finished=finished.is_set, poll_interval=0.005)
+        result = files.upload_proxy_stream(asset_id, proxy_id, source, part_size=5 * MiB)
+    thread.join()
+
+    assert result.data == "upload-1"
+    assert first_part_sent.is_set()
+    assert b"".join(put.last_request.body for put in puts) == data
+
+
+def test_upload_proxy_stream_requires_s3():
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        m.get(
+            FilesSpec.gen_url(GET_ASSET_PROXY_PATH.format(asset_id, proxy_id)),
+            json=gcs_proxy(asset_id, proxy_id).model_dump(),
+        )
+        with pytest.raises(UnexpectedStorageMethodForProxy):
+            files.upload_proxy_stream(asset_id, proxy_id, iter([b"data"]))
+
+
+def test_bulk_ingest_proxies(tmp_path):
+    path = make_file(tmp_path, 6 * MiB)
+    asset_ids = [str(uuid.uuid4()) for _ in range(4)]
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    reported = []
+    with requests_mock.Mocker() as m:
+        for asset_id in asset_ids:
+            proxy_id = f"proxy-{asset_id}"
+            mock_s3_upload(m, asset_id, proxy_id, parts_num=2)
+            proxy = Proxy(
+                asset_id=asset_id,
+                id=proxy_id,
+                multipart_upload_url=generate_mock_s3_multipart_upload_url("bucket", "proxy.mp4"),
+                storage_method=StorageMethod.S3,
+            )
+            m.post(FilesSpec.gen_url(GET_ASSET_PROXIES_PATH.format(asset_id)), json=proxy.model_dump())
+            m.patch(FilesSpec.gen_url(GET_ASSET_PROXY_PATH.format(asset_id, proxy_id)), json=proxy.model_dump())
+        # the second asset cannot get a proxy, the file of the third is missing
+        m.post(FilesSpec.gen_url(GET_ASSET_PROXIES_PATH.format(asset_ids[1])), status_code=400, json={})
+        items = [
+            ProxyIngestItem(asset_id, tmp_path / "missing.mp4" if i == 2 else path, {"name": "proxy.mp4"})
+            for i, asset_id in enumerate(asset_ids)
+        ]
+        results = files.bulk_ingest_proxies(
+            iter(items), concurrency=2, part_size=5 * MiB, on_result=reported.append
+        )
+
+    assert [result.item for result in results] == items
+    assert [result.stage for result in results] == ["done", "create", "upload", "done"]
+    assert [result.ok for result in results] == [True, False, False, True]
+    assert results[0].upload_id == "upload-1"
+    assert results[0].proxy.id == f"proxy-{asset_ids[0]}"
+    assert results[1].response.status_code == 400
+    assert results[2].error.startswith("FileNotFoundError")
+    assert len(reported) == 4
+    # the created proxies are uploaded without being fetched again
+    assert not [r for r in m.request_history if r.method == "GET" and r.url.endswith(f"proxy-{asset_ids[0]}/")]
+    closes = [r for r in m.request_history if r.method == "PATCH"]
+    assert len(closes) == 2
+    assert closes[0].json() == {"status": "CLOSED"}
+
+
+def test_upload_proxy_file_returns_iconik_errors(tmp_path):
+    path = make_file(tmp_path, 1024)
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    with requests_mock.Mocker() as m:
+        m.get(FilesSpec.gen_url(GET_ASSET_PROXY_PATH.format(asset_id, proxy_id)), status_code=404)
+        result = files.upload_proxy_file(asset_id, proxy_id, path)
+
+    assert result.response.status_code == 404
+    assert result.data is None
+
+
+def test_async_upload_proxy_file(tmp_path):
+    httpx = pytest.importorskip("httpx")
+    path = make_file(tmp_path, 11 * MiB)
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    start_url = generate_mock_s3_multipart_upload_url("bucket", "proxy.mp4")
+    proxy = Proxy(
+        asset_id=asset_id, id=proxy_id, multipart_upload_url=start_url, storage_method=StorageMethod.S3
+    )
+    uploaded = {}
+
+    def handler(request):
+        url = str(request.url)
+        proxy_url = AsyncFilesSpec.gen_url(GET_ASSET_PROXY_PATH.format(asset_id, proxy_id))
+        if request.method == "GET" and url.startswith(proxy_url):
+            if "multipart_url/part" in url:
+                return httpx.Response(
+                    200, json={"objects": [{"number": n, "url": part_url(n)} for n in (1, 2, 3)]}
+                )
+            if "multipart_url" in url:
+                return httpx.Response(200, json={"complete_url": COMPLETE_URL})
+            return httpx.Response(200, json=proxy.model_dump())
+        if request.method == "POST" and url == start_url:
+            return httpx.Response(
+                200, text=generate_mock_s3_multipart_upload_start_response("bucket", "proxy.mp4", "upload-1")
+            )
+        if request.method == "PUT":
+            number = int(request.url.params["partNumber"])
+            uploaded[number] = request.content
+            return httpx.Response(200, headers={"ETag": f'"etag-{number}"'})
+        if request.method == "POST" and url == COMPLETE_URL:
+            assert request.content == s3_complete_body({n: f'"etag-{n}"' for n in (1, 2, 3)})
+            return httpx.Response(200, text="<CompleteMultipartUploadResult/>")
+        return httpx.Response(404)
+
+    transport = httpx.MockTransport(handler)
+    spec = AsyncFilesSpec(
+        httpx.AsyncClient(transport=transport),
+        timeout=3,
+        storage_session=httpx.AsyncClient(transport=transport),
+    )
+
+    sha256 = hashlib.sha256()
+    result = asyncio.run(
+        spec.upload_proxy_file(asset_id, proxy_id, path, part_size=5 * MiB, hashes=[sha256])
+    )
+    assert result.data == "upload-1"
+    assert sha256.hexdigest() == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert b"".join(uploaded[n] for n in sorted(uploaded)) == path.read_bytes()
+
+
+SESSION_URI = "https://storage.googleapis.com/upload/storage/v1/b/bucket/o?upload_id=session-1"
+CHUNK = GCS_CHUNK_ALIGNMENT
+
+
+@pytest.fixture(autouse=True)
+def no_resume_backoff(monkeypatch):
+    monkeypatch.setattr("pythonik.uploads.RESUME_BACKOFF", 0)
+
+
+class FakeGCS:
+    """A resumable upload session, failing the PUTs listed in ``failures``"""
+
+    def __init__(self, failures=()):
+        self.received = bytearray()
+        self.failures = list(failures)
+        self.puts = 0
+        self.gone = False
+
+    def put(self, request, context):
+        self.puts += 1
+        if self.gone:
+            context.status_code = 410
+            return ""
+        if self.puts in self.failures:
+            context.status_code = 503
+            return ""
+        content_range = request.headers["Content-Range"]
+        size = int(content_range.rsplit("/", 1)[1])
+        if not content_range.startswith("bytes */"):
+            start = int(content_range.split()[1].split("-")[0])
+            assert start == len(self.received)
+            self.received += request.body
+        if len(self.received) == size:
+            context.status_code = 200
+            return "{}"
+        context.status_code = 308
+        if self.received:
+            context.headers["Range"] = f"bytes=0-{len(self.received) - 1}"
+        return ""
+
+
+def mock_gcs_upload(m, target, gcs):
+    m.post(
+        target.upload_url,
+        status_code=201,
+        headers={"Location": SESSION_URI, "X-GUploader-UploadID": "gcs-upload-1"},
+    )
+    m.put(SESSION_URI, text=gcs.put)
+
+
+def gcs_proxy(asset_id, proxy_id):
+    return Proxy(
+        asset_id=asset_id,
+        id=proxy_id,
+        upload_url=generate_mock_gcs_upload_url("bucket", "proxy.mp4"),
+        storage_method=StorageMethod.GCS,
+    )
+
+
+def test_gcs_helpers():
+    assert check_gcs_chunk_size(CHUNK * 4) == CHUNK * 4
+    with pytest.raises(ValueError):
+        check_gcs_chunk_size(CHUNK + 1)
+    assert gcs_content_range(0, 10, 100) == "bytes 0-9/100"
+    assert gcs_content_range(10, 0, 100) == "bytes */100"
+
+    class Response:
+        headers = {"Range": "bytes=0-262143"}
+
+    assert gcs_committed(Response) == CHUNK
+    Response.headers = {}
+    assert gcs_committed(Response) == 0
+
+
+def test_upload_resumable(tmp_path):
+    path = make_file(tmp_path, CHUNK * 2 + 100)
+    proxy = gcs_proxy(str(uuid.uuid4()), str(uuid.uuid4()))
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    gcs = FakeGCS()
+    with requests_mock.Mocker() as m:
+        mock_gcs_upload(m, proxy, gcs)
+        result = files.upload_resumable(proxy, path, chunk_size=CHUNK)
+
+    assert result.data == "gcs-upload-1"
+    assert result.response.status_code == 200
+    assert bytes(gcs.received) == path.read_bytes()
+    assert gcs.puts == 3
+    assert m.request_history[0].headers["X-Goog-Resumable"] == "start"
+
+
+def test_upload_resumable_resumes_from_committed_offset(tmp_path):
+    path = make_file(tmp_path, CHUNK * 3)
+    proxy = gcs_proxy(str(uuid.uuid4()), str(uuid.uuid4()))
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    # the second chunk fails, then the status query and the rest succeed
+    gcs = FakeGCS(failures=[2])
+    md5 = hashlib.md5()
+    with requests_mock.Mocker() as m:
+        mock_gcs_upload(m, proxy, gcs)
+        result = files.upload_resumable(proxy, path, chunk_size=CHUNK, hashes=[md5])
+
+    assert result.data == "gcs-upload-1"
+    assert bytes(gcs.received) == path.read_bytes()
+    assert md5.hexdigest() == hashlib.md5(path.read_bytes()).hexdigest()
+    ranges = [r.headers["Content-Range"] for r in m.request_history if r.method == "PUT"]
+    assert ranges == [
+        f"bytes 0-{CHUNK - 1}/{CHUNK * 3}",
+        f"bytes {CHUNK}-{CHUNK * 2 - 1}/{CHUNK * 3}",
+        f"bytes */{CHUNK * 3}",
+        f"bytes {CHUNK}-{CHUNK * 2 - 1}/{CHUNK * 3}",
+        f"bytes {CHUNK * 2}-{CHUNK * 3 - 1}/{CHUNK * 3}",
+    ]
+
+
+def test_upload_resumable_gives_up(tmp_path):
+    path = make_file(tmp_path, CHUNK)
+    proxy = gcs_proxy(str(uuid.uuid4()), str(uuid.uuid4()))
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    gcs = FakeGCS(failures=range(1, 10))
+    with requests_mock.Mocker() as m:
+        mock_gcs_upload(m, proxy, gcs)
+        with pytest.raises(UploadError, match="after 2 retries") as error:
+            files.upload_resumable(proxy, path, chunk_size=CHUNK, max_retries=2)
+
+    assert error.value.response.status_code == 503
+    assert gcs.puts == 3
+
+
+def test_upload_resumable_continues_saved_session(tmp_path):
+    path = make_file(tmp_path, CHUNK * 2)
+    state_path = tmp_path / "proxy.mp4.upload"
+    proxy = gcs_proxy(str(uuid.uuid4()), str(uuid.uuid4()))
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    gcs = FakeGCS(failures=range(2, 10))
+    with requests_mock.Mocker() as m:
+        mock_gcs_upload(m, proxy, gcs)
+        with pytest.raises(UploadError):
+            files.upload_resumable(proxy, path, chunk_size=CHUNK, state_path=state_path, max_retries=1)
+        assert state_path.exists()
+
+        # another process picks the session up where it stopped
+        gcs.failures = []
+        gcs.puts = 0
+        other = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+        md5 = hashlib.md5()
+        result = other.upload_resumable(proxy, path, chunk_size=CHUNK, state_path=state_path, hashes=[md5])
+
+    assert result.data == "gcs-upload-1"
+    assert bytes(gcs.received) == path.read_bytes()
+    # a status query and the missing chunk, without starting a new session
+    assert gcs.puts == 2
+    # the chunk sent by the first process is hashed from the file
+    assert md5.hexdigest() == hashlib.md5(path.read_bytes()).hexdigest()
+    assert sum(1 for r in m.request_history if r.method == "POST") == 1
+    assert not state_path.exists()
+
+
+def test_upload_resumable_restarts_expired_session(tmp_path):
+    path = make_file(tmp_path, CHUNK)
+    stat = path.stat()
+    state_path = tmp_path / "proxy.mp4.upload"
+    ResumableState(SESSION_URI + "-expired", "old", stat.st_size, stat.st_mtime_ns).save(state_path)
+    proxy = gcs_proxy(str(uuid.uuid4()), str(uuid.uuid4()))
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    gcs = FakeGCS()
+    with requests_mock.Mocker() as m:
+        mock_gcs_upload(m, proxy, gcs)
+        m.put(SESSION_URI + "-expired", status_code=404)
+        result = files.upload_resumable(proxy, path, chunk_size=CHUNK, state_path=state_path)
+
+    assert result.data == "gcs-upload-1"
+    assert bytes(gcs.received) == path.read_bytes()
+    assert not state_path.exists()
+
+
+def test_upload_resumable_ignores_state_of_changed_file(tmp_path):
+    path = make_file(tmp_path, CHUNK)
+    state_path = tmp_path / "proxy.mp4.upload"
+    ResumableState(SESSION_URI + "-stale", "old", CHUNK, 0).save(state_path)
+    assert ResumableState.load(state_path, CHUNK, path.stat().st_mtime_ns) is None
+
+
+def test_upload_proxy_file_uses_resumable_upload_on_gcs(tmp_path):
+    path = make_file(tmp_path, CHUNK + 1)
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    proxy = gcs_proxy(asset_id, proxy_id)
+    gcs = FakeGCS()
+    with requests_mock.Mocker() as m:
+        m.get(FilesSpec.gen_url(GET_ASSET_PROXY_PATH.format(asset_id, proxy_id)), json=proxy.model_dump())
+        mock_gcs_upload(m, proxy, gcs)
+        result = files.upload_proxy_file(asset_id, proxy_id, path, part_size=CHUNK)
+
+    assert result.data == "gcs-upload-1"
+    assert gcs.puts == 2
+
+
+def test_upload_keyframe_file(tmp_path):
+    path = make_file(tmp_path, 1000)
+    asset_id, keyframe_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    keyframe = Keyframe(
+        asset_id=asset_id,
+        id=keyframe_id,
+        upload_url=generate_mock_gcs_upload_url("bucket", "keyframe.jpg"),
+        storage_method=StorageMethod.GCS,
+    )
+    gcs = FakeGCS()
+    with requests_mock.Mocker() as m:
+        m.get(FilesSpec.gen_url(GET_ASSET_KEYFRAME.format(asset_id, keyframe_id)), json=keyframe.model_dump())
+        mock_gcs_upload(m, keyframe, gcs)
+        result = files.upload_keyframe_file(asset_id, keyframe_id, path)
+
+    assert result.data == "gcs-upload-1"
+    assert bytes(gcs.received) == path.read_bytes()
+
+
+def test_upload_keyframe_file_on_s3(tmp_path):
+    path = make_file(tmp_path, 1000)
+    asset_id, keyframe_id = str(uuid.uuid4()), str(uuid.uuid4())
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    start_url = generate_mock_s3_multipart_upload_url("bucket", "keyframe.jpg")
+    keyframe = Keyframe(
+        asset_id=asset_id, id=keyframe_id, multipart_upload_url=start_url, storage_method=StorageMethod.S3
+    )
+    with requests_mock.Mocker() as m:
+        m.get(FilesSpec.gen_url(GET_ASSET_KEYFRAME.format(asset_id, keyframe_id)), json=keyframe.model_dump())
+        m.post(
+            start_url,
+            text=generate_mock_s3_multipart_upload_start_response("bucket", "keyframe.jpg", "upload-1"),
+        )
+        m.get(
+            FilesSpec.gen_url(GET_ASSET_KEYFRAME_MULTIPART_URL_PATH.format(asset_id, keyframe_id)),
+            json={"objects": [{"number": 1, "url": part_url(1)}]},
+        )
+        m.get(
+            FilesSpec.gen_url(GET_ASSET_KEYFRAME_MULTIPART_COMPLETE_URL_PATH.format(asset_id, keyframe_id)),
+            json={"complete_url": COMPLETE_URL},
+        )
+        put = m.put(part_url(1), headers={"ETag": '"etag-1"'})
+        m.post(COMPLETE_URL, text="<CompleteMultipartUploadResult></CompleteMultipartUploadResult>")
+        result = files.upload_keyframe_file(asset_id, keyframe_id, path)
+
+    assert result.data == "upload-1"
+    assert bytes(put.last_request.body) == path.read_bytes()
+    assert m.request_history[-1].body == s3_complete_body({1: '"etag-1"'})
+
+
+def test_bulk_upload_keyframes(tmp_path):
+    asset_id = str(uuid.uuid4())
+    names = [f"frame-{i}.jpg" for i in range(5)]
+    for name in names:
+        (tmp_path / name).write_bytes(os.urandom(1000))
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    received = {}
+
+    def create(request, context):
+        name = request.json()["name"]
+        if name == "frame-1.jpg":
+            context.status_code = 400
+            return {}
+        context.status_code = 201
+        return Keyframe(
+            asset_id=asset_id,
+            id=f"id-{name}",
+            upload_url=f"https://storage.googleapis.com/bucket/{name}?X-Goog-Signature=sig",
+            storage_method=StorageMethod.GCS,
+        ).model_dump()
+
+    def put(request, context):
+        received[request.url.rsplit("=", 1)[1]] = bytes(request.body)
+        context.status_code = 200
+        return "{}"
+
+    with requests_mock.Mocker() as m:
+        m.post(FilesSpec.gen_url(GET_ASSET_KEYFRAMES.format(asset_id)), json=create)
+        for name in names:
+            m.post(
+                f"https://storage.googleapis.com/bucket/{name}?X-Goog-Signature=sig",
+                status_code=201,
+                headers={"Location": f"{SESSION_URI}-{name}", "X-GUploader-UploadID": name},
+            )
+            m.put(f"{SESSION_URI}-{name}", text=put)
+            m.patch(FilesSpec.gen_url(GET_ASSET_KEYFRAME.format(asset_id, f"id-{name}")), json={})
+        items = [
+            KeyframeIngestItem(asset_id, tmp_path / name, Keyframe(name=name, type="STORYBOARD"))
+            for name in names
+        ]
+        results = files.bulk_upload_keyframes(items, concurrency=3)
+
+    assert [result.item for result in results] == items
+    assert [result.stage for result in results] == ["done", "create", "done", "done", "done"]
+    assert results[1].response.status_code == 400
+    assert results[0].keyframe.id == "id-frame-0.jpg"
+    assert results[0].upload_id == "frame-0.jpg"
+    uploaded = [name for name in names if name != "frame-1.jpg"]
+    assert received == {f"session-1-{name}": (tmp_path / name).read_bytes() for name in uploaded}
+    closes = [r for r in m.request_history if r.method == "PATCH"]
+    assert len(closes) == 4
+    assert all(r.json() == {"status": "CLOSED"} for r in closes)
+
+
+def test_async_upload_resumable(tmp_path):
+    httpx = pytest.importorskip("httpx")
+    path = make_file(tmp_path, CHUNK * 2 + 10)
+    proxy = gcs_proxy(str(uuid.uuid4()), str(uuid.uuid4()))
+    received = bytearray()
+    failures = [2]
+    puts = []
+
+    def handler(request):
+        if request.method == "POST":
+            return httpx.Response(
+                201, headers={"Location": SESSION_URI, "X-GUploader-UploadID": "gcs-upload-1"}
+            )
+        puts.append(request.headers["Content-Range"])
+        if len(puts) in failures:
+            raise httpx.ConnectError("connection reset", request=request)
+        if not request.headers["Content-Range"].startswith("bytes */"):
+            received.extend(request.content)
+        if len(received) == path.stat().st_size:
+            return httpx.Response(200, json={})
+        return httpx.Response(308, headers={"Range": f"bytes=0-{len(received) - 1}"})
+
+    transport = httpx.MockTransport(handler)
+    spec = AsyncFilesSpec(
+        httpx.AsyncClient(transport=transport),
+        timeout=3,
+        storage_session=httpx.AsyncClient(transport=transport),
+    )
+
+    result = asyncio.run(spec.upload_resumable(proxy, path, chunk_size=CHUNK))
+    assert result.data == "gcs-upload-1"
+    assert bytes(received) == path.read_bytes()
+    assert puts[2] == f"bytes */{CHUNK * 2 + 10}"
+
+
+def test_async_upload_proxy_stream():
+    httpx = pytest.importorskip("httpx")
+    data = os.urandom(11 * MiB)
+    asset_id, proxy_id = str(uuid.uuid4()), str(uuid.uuid4())
+    start_url = generate_mock_s3_multipart_upload_url("bucket", "proxy.mp4")
+    proxy = Proxy(
+        asset_id=asset_id, id=proxy_id, multipart_upload_url=start_url, storage_method=StorageMethod.S3
+    )
+    uploaded = {}
+    windows = []
+
+    def handler(request):
+        url = str(request.url)
+        proxy_url = AsyncFilesSpec.gen_url(GET_ASSET_PROXY_PATH.format(asset_id, proxy_id))
+        if request.method == "GET" and url.startswith(proxy_url):
+            if "multipart_url/part" in url:
+                assert "page" not in request.url.params
+                windows.append(int(request.url.params["parts_num"]))
+                numbers = range(1, windows[-1] + 1)
+                return httpx.Response(200, json={"objects": [{"number": n, "url": part_url(n)} for n in numbers]})
+            if "multipart_url" in url:
+                return httpx.Response(200, json={"complete_url": COMPLETE_URL})
+            return httpx.Response(200, json=proxy.model_dump())
+        if request.method == "POST" and url == start_url:
+            return httpx.Response(
+                200, text=generate_mock_s3_multipart_upload_start_response("bucket", "proxy.mp4", "upload-1")
+            )
+        if request.method == "PUT":
+            number = int(request.url.params["partNumber"])
+            uploaded[number] = request.read()
+            return httpx.Response(200, headers={"ETag": f'"etag-{number}"'})
+        if request.method == "POST" and url == COMPLETE_URL:
+            assert request.content == s3_complete_body({n: f'"etag-{n}"' for n in (1, 2, 3)})
+            return httpx.Response(200, text="<CompleteMultipartUploadResult/>")
+        return httpx.Response(404)
+
+    transport = httpx.MockTransport(handler)
+    spec = AsyncFilesSpec(
+        httpx.AsyncClient(transport=transport),
+        timeout=3,
+        storage_session=httpx.AsyncClient(transport=transport),
+    )
+
+    result = asyncio.run(
+        spec.upload_proxy_stream(
+            asset_id, proxy_id, io.BytesIO(data), part_size=5 * MiB, url_batch_size=2
+        )
+    )
+    assert result.data == "upload-1"
+    assert b"".join(uploaded[n] for n in sorted(uploaded)) == data
+    assert windows == [2, 4]
+
+
+def test_async_bulk_ingest_proxies(tmp_path):
+    httpx = pytest.importorskip("httpx")
+    path = make_file(tmp_path, 1000)
+    asset_ids = [str(uuid.uuid4()) for _ in range(3)]
+    start_url = generate_mock_s3_multipart_upload_url("bucket", "proxy.mp4")
+    closed = []
+
+    def handler(request):
+        url = str(request.url)
+        if request.method == "POST" and url == start_url:
+            return httpx.Response(
+                200, text=generate_mock_s3_multipart_upload_start_response("bucket", "proxy.mp4", "upload-1")
+            )
+        if request.method == "POST" and url == COMPLETE_URL:
+            return httpx.Response(200, text="<CompleteMultipartUploadResult/>")
+        if request.method == "PUT":
+            return httpx.Response(200, headers={"ETag": '"etag-1"'})
+        asset_id = url.split("/assets/")[1].split("/")[0]
+        proxy = Proxy(
+            asset_id=asset_id, id="proxy-1", multipart_upload_url=start_url, storage_method=StorageMethod.S3
+        )
+        if request.method == "POST":
+            return httpx.Response(201, json=proxy.model_dump())
+        if request.method == "PATCH":
+            closed.append(asset_id)
+            return httpx.Response(200, json=proxy.model_dump())
+        if "multipart_url/part" in url:
+            return httpx.Response(200, json={"objects": [{"number": 1, "url": part_url(1)}]})
+        if "multipart_url" in url:
+            return httpx.Response(200, json={"complete_url": COMPLETE_URL})
+        return httpx.Response(404)
+
+    transport = httpx.MockTransport(handler)
+    spec = AsyncFilesSpec(
+        httpx.AsyncClient(transport=transport),
+        timeout=3,
+        storage_session=httpx.AsyncClient(transport=transport),
+    )
+
+    items = [ProxyIngestItem(asset_id, path, Proxy(name="proxy.mp4")) for asset_id in asset_ids]
+    results = asyncio.run(spec.bulk_ingest_proxies(items, concurrency=2))
+    assert [result.ok for result in results] == [True] * 3
+    assert [result.item.asset_id for result in results] == asset_ids
+    assert sorted(closed) == sorted(asset_ids)
+
+
+def test_async_bulk_upload_keyframes(tmp_path):
+    httpx = pytest.importorskip("httpx")
+    asset_id = str(uuid.uuid4())
+    path = tmp_path / "frame.jpg"
+    path.write_bytes(os.urandom(1000))
+    upload_url = generate_mock_gcs_upload_url("bucket", "frame.jpg")
+    received = []
+    closed = []
+
+    def handler(request):
+        url = str(request.url)
+        if request.method == "POST" and url == AsyncFilesSpec.gen_url(GET_ASSET_KEYFRAMES.format(asset_id)):
+            keyframe_id = json.loads(request.content)["name"]
+            keyframe = Keyframe(
+                asset_id=asset_id, id=keyframe_id, upload_url=upload_url, storage_method=StorageMethod.GCS
+            )
+            return httpx.Response(201, json=keyframe.model_dump())
+        if request.method == "POST":
+            return httpx.Response(
+                201, headers={"Location": SESSION_URI, "X-GUploader-UploadID": "gcs-upload-1"}
+            )
+        if request.method == "PUT":
+            received.append(request.content)
+            return httpx.Response(200, json={})
+        if request.method == "PATCH":
+            closed.append(url.rstrip("/").rsplit("/", 1)[1])
+            return httpx.Response(200, json={})
+        return httpx.Response(404)
+
+    transport = httpx.MockTransport(handler)
+    spec = AsyncFilesSpec(
+        httpx.AsyncClient(transport=transport),
+        timeout=3,
+        storage_session=httpx.AsyncClient(transport=transport),
+    )
+
+    items = [KeyframeIngestItem(asset_id, path, {"name": f"frame-{i}"}) for i in range(4)]
+    results = asyncio.run(spec.bulk_upload_keyframes(items, concurrency=2))
+    assert [result.ok for result in results] == [True] * 4
+    assert [result.keyframe.id for result in results] == [f"frame-{i}" for i in range(4)]
+    assert received == [path.read_bytes()] * 4
+    assert sorted(closed) == [f"frame-{i}" for i in range(4)]
@@ -0,0 +1,232 @@
+import os
+import sys
+import uuid
+
+import pytest
+import requests_mock
+
+from pythonik.client import PythonikClient
+from pythonik.models.files.file import FileStatus
+from pythonik.specs.files import GET_STORAGE_FILE_PATH, GET_STORAGE_FILES_PATH, FilesSpec
+from pythonik.watch import (
+    REGISTERED,
+    UPDATED,
+    InotifySource,
+    PollingSource,
+    StorageWatcher,
+)
+
+
+class FakeSource:
+    """Answers the scripted events, one list per read"""
+
+    def __init__(self):
+        self.events = []
+        self.closed = False
+
+    def read(self, timeout):
+        return self.events.pop(0) if self.events else []
+
+    def close(self):
+        self.closed = True
+
+
+def inotify_source(root):
+    if not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux only")
+    try:
+        return InotifySource(root)
+    except OSError as e:
+        pytest.skip(f"inotify is not available: {e}")
+
+
+def read_all(source, reads=5):
+    events = []
+    for _ in range(reads):
+        events.extend(source.read(0.2))
+    return events
+
+
+def test_inotify_source(tmp_path):
+    (tmp_path / "existing").mkdir()
+    source = inotify_source(tmp_path)
+    try:
+        with open(tmp_path / "existing" / "a.mov", "wb") as f:
+            f.write(b"a" * 10)
+        (tmp_path / "clips" / "day1").mkdir(parents=True)
+        (tmp_path / "clips" / "day1" / "b.mov").write_bytes(b"b")
+        staging = tmp_path / "staging.tmp"
+        os.rename(tmp_path / "existing" / "a.mov", staging)
+        os.rename(staging, tmp_path / "c.mov")
+
+        events = read_all(source)
+    finally:
+        source.close()
+
+    assert ("existing/a.mov", False) in events
+    assert ("existing/a.mov", True) in events
+    assert "clips/day1/b.mov" in {path for path, _ in events}
+    # moved in place, the file is complete
+    assert ("c.mov", True) in events
+    assert not any(path in ("clips", "clips/day1") for path, _ in events)
+
+
+def test_inotify_source_requires_the_root(tmp_path):
+    if not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux only")
+    with pytest.raises(OSError):
+        InotifySource(tmp_path / "missing")
+
+
+def test_polling_source(tmp_path):
+    (tmp_path / "old.mov").write_bytes(b"old")
+    (tmp_path / "same.mov").write_bytes(b"same")
+    source = PollingSource(tmp_path, interval=0)
+
+    (tmp_path / "old.mov").write_bytes(b"old and longer")
+    (tmp_path / "clips").mkdir()
+    (tmp_path / "clips" / "new.mov").write_bytes(b"new")
+
+    assert sorted(source.read(0)) == [("clips/new.mov", False), ("old.mov", False)]
+    assert source.read(0) == []
+
+
+def mock_storage(m, storage_id, file_ids):
+    created = iter(file_ids)
+    m.post(
+        FilesSpec.gen_url(GET_STORAGE_FILES_PATH.format(storage_id)),
+        json=lambda request, context: {"objects": [{"id": next(created)}]},
+    )
+    for file_id in file_ids:
+        m.patch(
+            FilesSpec.gen_url(GET_STORAGE_FILE_PATH.format(storage_id, file_id)),
+            json={"id": file_id},
+        )
+
+
+def make_watcher(root, storage_id, source, results, **kwargs):
+    files = PythonikClient(app_id="app", auth_token="token", timeout=3).files()
+    options = {"debounce": 0, "max_delay": 0, "growing_interval": 0, "settle": 3600}
+    options.update(kwargs)
+    return StorageWatcher(files, storage_id, root, source=source, on_result=results.append, **options)
+
+
+def test_storage_watcher(tmp_path):
+    storage_id = str(uuid.uuid4())
+    (tmp_path / "clips").mkdir()
+    (tmp_path / "clips" / "a.mov").write_bytes(b"a" * 10)
+    (tmp_path / "b.mov").write_bytes(b"b" * 5)
+    (tmp_path / "b.mov.part").write_bytes(b"")
+    source = FakeSource()
+    results = []
+    watcher = make_watcher(
+        tmp_path, storage_id, source, results, ignore=lambda path: path.endswith(".part")
+    )
+    with requests_mock.Mocker() as m:
+        mock_storage(m, storage_id, ["f-a", "f-b"])
+
+        source.events = [[("clips/a.mov", False)]]
+        assert watcher.poll() == 1
+        watcher.wait()
+        created = m.last_request.json()
+        assert created["name"] == "a.mov"
+        assert created["directory_path"] == "clips"
+        assert created["size"] == 10
+        assert created["type"] == "FILE"
+        assert created["status"] == FileStatus.GROWING.value
+
+        # the growing file is updated as its size changes
+        with open(tmp_path / "clips" / "a.mov", "ab") as f:
+            f.write(b"a" * 10)
+        assert watcher.poll() == 1
+        watcher.wait()
+        assert m.last_request.method == "PATCH"
+        assert m.last_request.json()["size"] == 20
+        assert m.last_request.json()["status"] == FileStatus.GROWING.value
+
+        # a burst of events is coalesced into one request per file
+        source.events = [
+            [("clips/a.mov", False), ("b.mov", False), ("b.mov.part", False), ("b.mov", True)]
+        ]
+        assert watcher.poll() == 2
+        watcher.wait()
+        # nothing changed
+        assert watcher.poll() == 0
+        watcher.close()
+
+    assert source.closed
+    # a.mov did not change during the burst, so it is not updated again
+    assert m.call_count == 3
+    assert [(r.path, r.action, r.status, r.file_id) for r in results] == [
+        ("clips/a.mov", REGISTERED, FileStatus.GROWING, "f-a"),
+        ("clips/a.mov", UPDATED, FileStatus.GROWING, "f-a"),
+        ("b.mov", REGISTERED, FileStatus.CLOSED, "f-b"),
+    ]
+    assert all(result.ok for result in results)
+
+
+def test_storage_watcher_closes_settled_files(tmp_path):
+    storage_id = str(uuid.uuid4())
+    (tmp_path / "a.mov").write_bytes(b"a" * 10)
+    source = FakeSource()
+    results = []
+    with make_watcher(tmp_path, storage_id, source, results, settle=0) as watcher:
+        with requests_mock.Mocker() as m:
+            mock_storage(m, storage_id, ["f-a"])
+            source.events = [[("a.mov", False)]]
+            watcher.poll()
+            watcher.wait()
+            watcher.poll()
+            watcher.wait()
+
+    assert [(r.action, r.status, r.size) for r in results] == [
+        (REGISTERED, FileStatus.GROWING, 10),
+        (UPDATED, FileStatus.CLOSED, 10),
+    ]
+    assert m.last_request.json()["status"] == FileStatus.CLOSED.value
+
+
+def test_storage_watcher_debounces_and_updates_known_files(tmp_path):
+    storage_id = str(uuid.uuid4())
+    (tmp_path / "a.mov").write_bytes(b"a" * 10)
+    source = FakeSource()
+    results = []
+    with make_watcher(
+        tmp_path, storage_id, source, results, debounce=3600, max_delay=3600, known={"a.mov": "f-a"}
+    ) as watcher:
+        with requests_mock.Mocker() as m:
+            mock_storage(m, storage_id, ["f-a"])
+            source.events = [[("a.mov", True)]]
+            assert watcher.poll() == 0
+            assert m.call_count == 0
+            watcher.debounce = 0
+            assert watcher.poll() == 1
+            watcher.wait()
+
+    assert m.call_count == 1
+    assert m.last_request.method == "PATCH"
+    assert [(r.action, r.status, r.file_id) for r in results] == [(UPDATED, FileStatus.CLOSED, "f-a")]
+
+
+def test_storage_watcher_reports_failures_and_retries(tmp_path):
+    storage_id = str(uuid.uuid4())
+    (tmp_path / "a.mov").write_bytes(b"a" * 10)
+    source = FakeSource()
+    results = []
+    with make_watcher(tmp_path, storage_id, source, results) as watcher:
+        with requests_mock.Mocker() as m:
+            m.post(
+                FilesSpec.gen_url(GET_STORAGE_FILES_PATH.format(storage_id)),
+                [{"status_code": 500}, {"json": {"objects": [{"id": "f-a"}]}}],
+            )
+            source.events = [[("a.mov", True)], [("removed.mov", True)], [("a.mov", True)]]
+            for _ in range(3):
+                watcher.poll()
+                watcher.wait()
+
+    assert [(r.action, r.ok, r.error, r.file_id) for r in results] == [
+        (REGISTERED, False, "HTTP 500", None),
+        (REGISTERED, True, None, "f-a"),
+    ]
+    assert results[0].response.status_code == 500
+    assert m.call_count == 2
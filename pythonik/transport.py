@@ -0,0 +1,248 @@
+import socket
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from requests import PreparedRequest, Session
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import Retry
+
+# SO_KEEPALIVE on top of urllib3's defaults (TCP_NODELAY)
+KEEPALIVE_SOCKET_OPTIONS: List[Tuple[int, int, int]] = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+]
+# object stores ask clients to back off with these (S3 SlowDown is a 503)
+STORAGE_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class PoolStats:
+    """
+    Connection pool counters of an adapter, summed over its hosts.
+
+    ``opened`` counts checkouts that had to open a connection (TCP and TLS
+    handshake), ``reused`` those served by a live pooled connection. A high
+    ``discarded`` count means ``pool_maxsize`` is lower than the number of
+    threads sharing the session.
+    """
+
+    hosts: int = 0
+    in_use: int = 0
+    idle: int = 0
+    opened: int = 0
+    reused: int = 0
+    discarded: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.opened + self.reused
+
+
+class _CountingPoolMixin:
+    """Count connection checkouts, reuses and discards of a urllib3 pool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        # set on a thread whose checkout failed, see _put_conn
+        self._failed_checkout = threading.local()
+        self.in_use = 0
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def _get_conn(self, timeout=None):
+        try:
+            conn = super()._get_conn(timeout)
+        except Exception:
+            self._failed_checkout.value = True
+            raise
+        # dropped connections are reset by urllib3 and reconnect like new ones
+        live = getattr(conn, "sock", None) is not None
+        with self._stats_lock:
+            self.in_use += 1
+            if live:
+                self.reused += 1
+            else:
+                self.opened += 1
+        return conn
+
+    def _put_conn(self, conn):
+        # urlopen puts back None both for a connection it closed after an
+        # error, which was checked out, and after a failed checkout (e.g. a
+        # closed pool), which was not
+        failed_checkout = conn is None and getattr(self._failed_checkout, "value", False)
+        self._failed_checkout.value = False
+        if not failed_checkout:
+            with self._stats_lock:
+                self.in_use -= 1
+                if conn is not None and self.pool is not None and self.pool.full():
+                    self.discarded += 1
+        super()._put_conn(conn)
+
+    def idle(self) -> int:
+        """Number of live connections waiting in the pool"""
+        pool = self.pool
+        if pool is None:
+            return 0
+        return sum(1 for conn in list(pool.queue) if getattr(conn, "sock", None) is not None)
+
+
+class CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    ``HTTPAdapter`` reporting connection pool statistics and able to open
+    connections ahead of the first request.
+
+    Args:
+        pool_connections: Number of hosts whose pools are kept
+        pool_maxsize: Connections kept alive per host, should be at least the
+            number of threads sharing the session
+        pool_block: Wait for a free connection when all ``pool_maxsize``
+            connections are in use, instead of opening one that is discarded
+            after the request
+        max_retries: urllib3 ``Retry`` policy
+        tcp_keepalive: Enable TCP keep-alive probes on the connections, so
+            idle pooled connections are not silently dropped by middleboxes
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["tcp_keepalive"]
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        max_retries=0,
+        tcp_keepalive: bool = False,
+    ):
+        self.tcp_keepalive = tcp_keepalive
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.tcp_keepalive:
+            pool_kwargs.setdefault("socket_options", KEEPALIVE_SOCKET_OPTIONS)
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+    def _pools(self) -> List[HTTPConnectionPool]:
+        pools = self.poolmanager.pools
+        return [pool for pool in (pools.get(key) for key in pools.keys()) if pool is not None]
+
+    def pool_stats(self) -> PoolStats:
+        """Connection counters summed over every host pool of the adapter"""
+        stats = PoolStats()
+        for pool in self._pools():
+            if not isinstance(pool, _CountingPoolMixin):
+                continue
+            stats.hosts += 1
+            stats.in_use += pool.in_use
+            stats.idle += pool.idle()
+            stats.opened += pool.opened
+            stats.reused += pool.reused
+            stats.discarded += pool.discarded
+        return stats
+
+    def warmup(
+        self,
+        request: PreparedRequest,
+        connections: int = 1,
+        verify=True,
+        cert=None,
+        proxies: Optional[dict] = None,
+    ) -> int:
+        """
+        Open connections to the host of ``request`` and park them in its pool.
+
+        The pool is selected exactly like :meth:`send` would, so the warmed
+        connections serve the following requests to that host.
+
+        Args:
+            request: Request to the host to connect to
+            connections: Number of connections to open, capped at pool_maxsize
+            verify: TLS verification setting the requests will use
+            cert: Client certificate the requests will use
+            proxies: Proxies the requests will use
+
+        Returns:
+            Number of connections opened
+        """
+        if hasattr(self, "get_connection_with_tls_context"):
+            pool = self.get_connection_with_tls_context(request, verify, proxies=proxies, cert=cert)
+        else:  # pragma: no cover - requests < 2.32.2
+            pool = self.get_connection(request.url, proxies)
+        connections = min(connections, pool.pool.maxsize if pool.pool is not None else 0)
+
+        conns = []
+        opened = 0
+        try:
+            for _ in range(connections):
+                conn = pool._get_conn()
+                conns.append(conn)
+                if getattr(conn, "sock", None) is None:
+                    conn.connect()
+                    opened += 1
+        finally:
+            for conn in conns:
+                pool._put_conn(conn)
+        return opened
+
+
+def new_storage_session(
+    pool_maxsize: int = 10,
+    pool_block: bool = False,
+    tcp_keepalive: bool = False,
+    retries: int = 4,
+    backoff_factor: float = 0.5,
+) -> Session:
+    """
+    Session for object storage (S3/GCS) traffic: upload initiation, part
+    uploads, completion and downloads.
+
+    It never carries the Iconik credentials, keeps connections to the bucket
+    hosts alive across calls and retries connection errors and throttling or
+    server errors with exponential backoff, honoring Retry-After.
+
+    Args:
+        pool_maxsize: Connections kept alive per storage host
+        pool_block: Wait for a free connection instead of opening extra ones
+        tcp_keepalive: Enable TCP keep-alive probes on pooled connections
+        retries: Maximum number of retries per request
+        backoff_factor: urllib3 backoff factor between retries
+    """
+    retry_strategy = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=STORAGE_RETRY_STATUSES,
+        # part uploads, initiation and completion are safe to repeat
+        allowed_methods=None,
+        # hand the last error response to the caller instead of raising
+        raise_on_status=False,
+    )
+    adapter = PooledHTTPAdapter(
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+        max_retries=retry_strategy,
+        tcp_keepalive=tcp_keepalive,
+    )
+    session = Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,420 @@
+import io
+import json
+import math
+import mmap
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from xml.dom.minidom import parseString
+from xml.sax.saxutils import escape
+
+import requests
+
+from pythonik.exceptions import UploadError
+from pythonik.models.files.keyframe import Keyframe
+from pythonik.models.files.proxy import Proxy
+
+MiB = 1024 * 1024
+# S3 multipart limits: every part but the last must be at least 5 MiB
+S3_MIN_PART_SIZE = 5 * MiB
+S3_MAX_PARTS = 10000
+DEFAULT_PART_SIZE = 16 * MiB
+# presigned part URLs requested per call, fetched as the upload progresses so
+# they do not expire before long uploads reach them
+DEFAULT_URL_BATCH_SIZE = 100
+
+# GCS resumable uploads: every chunk but the last must be a multiple of 256 KiB
+GCS_CHUNK_ALIGNMENT = 256 * 1024
+DEFAULT_GCS_CHUNK_SIZE = 32 * GCS_CHUNK_ALIGNMENT
+# "Resume Incomplete", the answer to a chunk or status query of an unfinished upload
+GCS_RESUME_INCOMPLETE = 308
+# statuses after which an upload session is gone and must be restarted
+GCS_SESSION_GONE = (404, 410)
+RESUMABLE_RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+# delay before the first resume attempt, doubled on each further failure
+RESUME_BACKOFF = 1.0
+RESUME_MAX_BACKOFF = 30.0
+
+# seconds between checks for new data in a file that is still being written
+DEFAULT_POLL_INTERVAL = 0.5
+
+# stages of a bulk proxy ingest, an item that failed keeps the stage it failed at
+INGEST_CREATE = "create"
+INGEST_UPLOAD = "upload"
+INGEST_CLOSE = "close"
+INGEST_DONE = "done"
+
+PathLike = Union[str, "os.PathLike[str]"]
+# a binary file object (pipe, GrowingFile, ...) or an iterable of byte chunks
+StreamSource = Union[BinaryIO, Iterable[bytes]]
+
+
+class Part(NamedTuple):
+    """A byte range of the file to upload, numbered from 1"""
+
+    number: int
+    offset: int
+    length: int
+
+
+def s3_part_size(size: int, part_size: int = DEFAULT_PART_SIZE) -> int:
+    """
+    Part size to use for a file of ``size`` bytes: at least ``part_size`` and
+    S3's 5 MiB minimum, grown in whole MiB when the file would otherwise need
+    more than 10,000 parts.
+    """
+    part_size = max(part_size, S3_MIN_PART_SIZE)
+    if size > part_size * S3_MAX_PARTS:
+        part_size = math.ceil(size / S3_MAX_PARTS / MiB) * MiB
+    return part_size
+
+
+def plan_parts(size: int, part_size: int) -> List[Part]:
+    """Split ``size`` bytes into consecutive parts, an empty file is one empty part"""
+    if size == 0:
+        return [Part(1, 0, 0)]
+    return [
+        Part(number, offset, min(part_size, size - offset))
+        for number, offset in enumerate(range(0, size, part_size), start=1)
+    ]
+
+
+def map_part(path: PathLike, part: Part) -> memoryview:
+    """
+    Memory-map a part of the file, without copying it into Python memory.
+
+    Only the pages of the part are mapped, and they are unmapped once the
+    returned view and every slice of it are released, so resident memory
+    stays around one part per upload in flight whatever the file size. The
+    view can be sent, and re-sent on retries, as a request body. The part
+    must lie within the file, and the file must not be truncated while the
+    view is in use.
+    """
+    if part.length == 0:
+        return memoryview(b"")
+    # mappings must start on an allocation granularity boundary
+    start = part.offset - part.offset % mmap.ALLOCATIONGRANULARITY
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(
+            f.fileno(), part.offset + part.length - start, offset=start, access=mmap.ACCESS_READ
+        )
+    if hasattr(mmap, "MADV_WILLNEED"):
+        # the whole part is about to be sent, start reading it in
+        mapped.madvise(mmap.MADV_WILLNEED)
+    return memoryview(mapped)[part.offset - start :]
+
+
+class UploadDigest:
+    """
+    Feeds hash objects, such as ``hashlib.md5()`` or ``hashlib.sha256()``,
+    with the bytes of an upload from the buffers the upload sends, so the
+    file is not read a second time to compute its checksum.
+
+    Every byte is hashed once and in file order: a part arriving ahead of
+    its predecessors is held until the gap is filled, and a range sent again
+    after a failure is skipped. Not thread-safe, parts are fed by the thread
+    dispatching them.
+    """
+
+    def __init__(self, hashes: Iterable[Any] = ()):
+        self.hashes = list(hashes)
+        self.position = 0
+        self._held: Dict[int, memoryview] = {}
+
+    def update(self, offset: int, data):
+        """Hash the bytes of data, found at offset in the file, that were not hashed yet"""
+        if not self.hashes:
+            return
+        if offset > self.position:
+            self._held[offset] = data
+            return
+        self._feed(offset, data)
+        while True:
+            ready = [held for held in self._held if held <= self.position]
+            if not ready:
+                return
+            for held in sorted(ready):
+                self._feed(held, self._held.pop(held))
+
+    def _feed(self, offset: int, data):
+        view = memoryview(data)[self.position - offset :]
+        if not view:
+            return
+        for digest in self.hashes:
+            digest.update(view)
+        self.position += len(view)
+
+    def catch_up(self, path: PathLike, offset: int):
+        """Hash the file from the current position to offset, for uploads resumed by another process"""
+        while self.hashes and self.position < offset:
+            length = min(offset - self.position, DEFAULT_PART_SIZE)
+            self.update(self.position, map_part(path, Part(0, self.position, length)))
+
+
+class GrowingFile(io.RawIOBase):
+    """
+    Binary reader of a file another process is still writing, such as a
+    transcoder output.
+
+    Reads wait for new data instead of returning end of file, until
+    ``finished`` returns True and everything written has been read.
+
+    Args:
+        path: File being written, it must already exist
+        finished: Returns True once the producer is done, e.g.
+            ``lambda: process.poll() is not None``
+        poll_interval: Seconds to wait before checking for new data again
+
+    Example:
+        process = subprocess.Popen(["ffmpeg", ..., "proxy.mp4"])
+        source = GrowingFile("proxy.mp4", finished=lambda: process.poll() is not None)
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        finished: Callable[[], bool],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        super().__init__()
+        self._file = open(path, "rb", buffering=0)
+        self._finished = finished
+        self.poll_interval = poll_interval
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while True:
+            # checked before reading, so data written before the producer
+            # finished is never mistaken for the end of the file
+            done = self._finished()
+            read = self._file.readinto(buffer)
+            if read or done:
+                return read
+            time.sleep(self.poll_interval)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+class _ChunkReader:
+    """``readinto`` over an iterable of byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk).cast("B")
+        read = min(len(buffer), len(self._pending))
+        buffer[:read] = self._pending[:read]
+        self._pending = self._pending[read:]
+        return read
+
+
+def iter_stream_parts(source: StreamSource, part_size: int) -> Iterator[Tuple[Part, memoryview]]:
+    """
+    Cut a stream into numbered parts of ``part_size`` bytes, yielding each
+    one as soon as it is full. The last part holds the remainder, an empty
+    stream is one empty part.
+
+    File objects are read with ``readinto`` straight into the part buffer.
+
+    Raises:
+        UploadError: If the stream needs more than 10,000 parts
+    """
+    readinto = source.readinto if hasattr(source, "readinto") else _ChunkReader(source).readinto
+    number, offset = 1, 0
+    while True:
+        buffer = memoryview(bytearray(part_size))
+        filled = 0
+        while filled < part_size:
+            read = readinto(buffer[filled:])
+            if not read:
+                break
+            filled += read
+        if filled == 0 and number > 1:
+            return
+        if number > S3_MAX_PARTS:
+            raise UploadError(
+                f"The stream needs more than {S3_MAX_PARTS} parts of {part_size} bytes,"
+                " use a larger part_size"
+            )
+        yield Part(number, offset, filled), buffer[:filled]
+        if filled < part_size:
+            return
+        number += 1
+        offset += filled
+
+
+def s3_complete_body(etags: Dict[int, str]) -> bytes:
+    """CompleteMultipartUpload document listing the uploaded parts in order"""
+    parts = "".join(
+        f"<Part><PartNumber>{number}</PartNumber><ETag>{escape(etags[number])}</ETag></Part>"
+        for number in sorted(etags)
+    )
+    return f"<CompleteMultipartUpload>{parts}</CompleteMultipartUpload>".encode()
+
+
+def s3_error(response) -> Optional[str]:
+    """
+    Error code of an S3 response, if any. CompleteMultipartUpload can fail
+    with a 200 status and an ``<Error>`` document, so the body is checked too.
+    """
+    if not response.ok:
+        return f"HTTP {response.status_code}"
+    if b"<Error>" not in response.content:
+        return None
+    try:
+        codes = parseString(response.content).getElementsByTagName("Code")
+        return codes[0].firstChild.nodeValue if codes else "Error"
+    except Exception:
+        return "Error"
+
+
+def check_gcs_chunk_size(chunk_size: int) -> int:
+    """
+    Raises:
+        ValueError: If chunk_size is not a positive multiple of 256 KiB
+    """
+    if chunk_size <= 0 or chunk_size % GCS_CHUNK_ALIGNMENT:
+        raise ValueError("chunk_size must be a positive multiple of 256 KiB")
+    return chunk_size
+
+
+def gcs_content_range(offset: int, length: int, size: int) -> str:
+    """Content-Range of a chunk, or of a status query when length is 0"""
+    if length == 0:
+        return f"bytes */{size}"
+    return f"bytes {offset}-{offset + length - 1}/{size}"
+
+
+def gcs_committed(response) -> int:
+    """Number of bytes GCS has persisted, from the Range header of a 308 response"""
+    persisted = response.headers.get("Range")
+    if not persisted:
+        return 0
+    return int(persisted.rsplit("-", 1)[1]) + 1
+
+
+def resume_delay(failures: int) -> float:
+    """Seconds to wait before resuming after the given number of consecutive failures"""
+    return min(RESUME_BACKOFF * 2 ** (failures - 1), RESUME_MAX_BACKOFF)
+
+
+@dataclass
+class ResumableState:
+    """
+    What is needed to resume a GCS upload from another process: the session
+    URI, and the size and modification time of the file it was started for.
+    """
+
+    session_uri: str
+    upload_id: str
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def load(cls, state_path: PathLike, size: int, mtime_ns: int) -> Optional["ResumableState"]:
+        """The saved state, or None if missing, unreadable or for another version of the file"""
+        try:
+            with open(state_path, encoding="utf-8") as f:
+                state = cls(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        if state.size != size or state.mtime_ns != mtime_ns:
+            return None
+        return state
+
+    def save(self, state_path: PathLike):
+        """Write the state atomically"""
+        tmp_path = f"{os.fspath(state_path)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f)
+        os.replace(tmp_path, state_path)
+
+    @staticmethod
+    def clear(state_path: PathLike):
+        try:
+            os.remove(state_path)
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class ProxyIngestItem:
+    """
+    A proxy to register on an asset and upload.
+
+    Args:
+        asset_id: Asset to add the proxy to
+        path: Proxy file to upload
+        proxy: Body of ``create_asset_proxy``
+    """
+
+    asset_id: str
+    path: PathLike
+    proxy: Union[Proxy, Dict[str, Any]]
+
+
+@dataclass
+class ProxyIngestResult:
+    """
+    Outcome of one item of a bulk proxy ingest.
+
+    ``stage`` is ``done`` on success, otherwise the stage that failed
+    (``create``, ``upload`` or ``close``), with the error and, when the
+    failure was an HTTP response, that response.
+    """
+
+    item: ProxyIngestItem
+    stage: str
+    proxy: Optional[Proxy] = None
+    upload_id: Optional[str] = None
+    error: Optional[str] = None
+    response: Optional[requests.Response] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.stage == INGEST_DONE
+
+
+@dataclass
+class KeyframeIngestItem:
+    """
+    A keyframe image to register on an asset and upload.
+
+    Args:
+        asset_id: Asset to add the keyframe to
+        path: Image file to upload
+        keyframe: Body of ``create_asset_keyframe``
+    """
+
+    asset_id: str
+    path: PathLike
+    keyframe: Union[Keyframe, Dict[str, Any]]
+
+
+@dataclass
+class KeyframeIngestResult:
+    """
+    Outcome of one item of a bulk keyframe upload, see :class:`ProxyIngestResult`.
+    """
+
+    item: KeyframeIngestItem
+    stage: str
+    keyframe: Optional[Keyframe] = None
+    upload_id: Optional[str] = None
+    error: Optional[str] = None
+    response: Optional[requests.Response] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.stage == INGEST_DONE
@@ -0,0 +1,566 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import posixpath
+import select
+import stat
+import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+import requests
+
+from pythonik.models.base import FileType
+from pythonik.models.files.file import FileStatus
+from pythonik.reconcile import DEFAULT_SCAN_WORKERS, scan_tree
+from pythonik.uploads import PathLike
+
+if TYPE_CHECKING:
+    from pythonik.specs.files import FilesSpec
+
+# actions of WatchResult
+REGISTERED = "registered"
+UPDATED = "updated"
+
+DEFAULT_DEBOUNCE = 1.0
+DEFAULT_MAX_DELAY = 5.0
+DEFAULT_GROWING_INTERVAL = 5.0
+DEFAULT_SETTLE = 30.0
+DEFAULT_POLL_INTERVAL = 10.0
+DEFAULT_WATCH_WORKERS = 8
+DEFAULT_MAX_BATCH = 500
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_ONLYDIR
+
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+# (path relative to the root, whether the file was closed or moved in place)
+Event = Tuple[str, bool]
+
+
+def _libc():
+    """The C library, if it provides inotify"""
+    name = ctypes.util.find_library("c")
+    libc = ctypes.CDLL(name, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError(errno.ENOSYS, "inotify is not available")
+    return libc
+
+
+class InotifySource:
+    """
+    Events of a directory tree from Linux inotify.
+
+    Every directory of the tree is watched when the source is created, and
+    directories created or moved in later are watched as they appear. Only
+    directories are listed, files are not stat'ed until they change.
+
+    If the kernel queue overflows events are lost: the watches are kept, and
+    :meth:`FilesSpec.reconcile_storage` finds the files that were missed.
+
+    Args:
+        root: Directory to watch
+
+    Raises:
+        OSError: If inotify is not available, or a directory cannot be
+            watched, e.g. when ``fs.inotify.max_user_watches`` is reached
+    """
+
+    def __init__(self, root: PathLike):
+        self.root = os.fspath(root)
+        self._libc = _libc()
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._fd = fd
+        # watch descriptor -> directory relative to the root
+        self._directories: Dict[int, str] = {}
+        try:
+            self._watch_tree("")
+        except BaseException:
+            self.close()
+            raise
+
+    def _watch(self, relative: str):
+        path = os.path.join(self.root, relative) if relative else self.root
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        self._directories[wd] = relative
+
+    def _watch_tree(self, relative: str) -> List[str]:
+        """Watch a directory and its subdirectories, returns the files they contain"""
+        files = []
+        pending = [relative]
+        while pending:
+            directory = pending.pop()
+            try:
+                self._watch(directory)
+                with os.scandir(os.path.join(self.root, directory)) as it:
+                    for entry in it:
+                        path = posixpath.join(directory, entry.name) if directory else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(path)
+                        elif entry.is_file(follow_symlinks=False):
+                            files.append(path)
+            except FileNotFoundError:
+                if not directory:
+                    raise
+                # removed before it could be watched
+                continue
+        return files
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self, timeout: float) -> List[Event]:
+        """
+        Wait up to ``timeout`` seconds for events.
+
+        Returns:
+            The changed files, in the order of their events
+        """
+        if not select.select([self._fd], [], [], max(timeout, 0))[0]:
+            return []
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            events.extend(self._parse(data))
+        return events
+
+    def _parse(self, data: bytes) -> List[Event]:
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                continue
+            if mask & IN_IGNORED:
+                self._directories.pop(wd, None)
+                continue
+            directory = self._directories.get(wd)
+            if directory is None or not name:
+                continue
+            path = posixpath.join(directory, name) if directory else name
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # files written before the watch was added have no event
+                    events.extend((file, False) for file in self._watch_tree(path))
+            else:
+                events.append((path, bool(mask & (IN_CLOSE_WRITE | IN_MOVED_TO))))
+        return events
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingSource:
+    """
+    Events of a directory tree from periodic scans, where inotify is not
+    available, e.g. on network filesystems or other platforms.
+
+    The size and modification time of every file is kept between scans, and
+    the files that appeared or changed are reported. Files present at the
+    first scan are not reported.
+
+    Args:
+        root: Directory to watch
+        interval: Seconds between two scans
+        workers: Maximum number of directories listed concurrently, see
+            :func:`pythonik.reconcile.scan_tree`
+    """
+
+    def __init__(
+        self,
+        root: PathLike,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        workers: int = DEFAULT_SCAN_WORKERS,
+    ):
+        self.root = os.fspath(root)
+        self.interval = interval
+        self.workers = workers
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> Dict[str, Tuple[int, float]]:
+        return {entry.path: (entry.size, entry.mtime) for entry in scan_tree(self.root, self.workers)}
+
+    def read(self, timeout: float) -> List[Event]:
+        """
+        Scan the tree if it is due within ``timeout`` seconds, otherwise wait
+        for ``timeout`` seconds.
+
+        Returns:
+            The files that appeared or changed since the previous scan
+        """
+        wait = self._next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(max(timeout, 0))
+            return []
+        time.sleep(max(wait, 0))
+        self._next_scan = time.monotonic() + self.interval
+        snapshot = self._scan()
+        changed = [
+            (path, False)
+            for path, signature in snapshot.items()
+            if self._snapshot.get(path) != signature
+        ]
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        self._snapshot = {}
+
+
+def default_source(root: PathLike, poll_interval: float = DEFAULT_POLL_INTERVAL):
+    """An InotifySource of root, or a PollingSource if inotify is not available"""
+    try:
+        return InotifySource(root)
+    except OSError:
+        return PollingSource(root, poll_interval)
+
+
+@dataclass
+class WatchResult:
+    """
+    Outcome of registering or updating one file of a watched tree.
+
+    ``action`` is ``registered`` when the file was created in Iconik, and
+    ``updated`` when its size or status was updated.
+    """
+
+    path: str
+    action: str
+    status: FileStatus
+    size: Optional[int] = None
+    file_id: Optional[str] = None
+    error: Optional[str] = None
+    response: Optional[requests.Response] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Tracked:
+    file_id: str
+    size: Optional[int]
+    status: FileStatus
+    # monotonic time the size last changed
+    changed_at: float
+
+
+class StorageWatcher:
+    """
+    Register the files written under a storage root in Iconik as they
+    appear, instead of rescanning the tree.
+
+    Events are debounced per path: a file is registered or updated once it
+    has had no event for ``debounce`` seconds, or ``max_delay`` seconds after
+    its first pending event while it keeps changing. The files ready
+    together are sent as one batch, ``workers`` requests at a time.
+
+    Files are registered with :meth:`FilesSpec.create_storage_file`. A file
+    still being written is registered ``GROWING`` and its size is updated
+    with :meth:`FilesSpec.partial_update_storage_file` while it grows; it is
+    set ``CLOSED`` when its writer closes it (or moves it in place), or when
+    its size has not changed for ``settle`` seconds, which is how polling
+    detects the end of a write.
+
+    Only the files seen since the watcher started (and the ``known`` ones)
+    are tracked, so files that existed before are registered again if they
+    change: seed ``known`` from :meth:`FilesSpec.list_storage_files` or
+    :meth:`FilesSpec.reconcile_storage` to update them instead.
+
+    Args:
+        files: The files spec of a client, requests are sent from worker
+            threads
+        storage_id: The ID of the storage
+        root: Local directory the storage is mounted on
+        source: Event source, by default :func:`default_source`
+        debounce: Seconds without events before a file is registered
+        max_delay: Maximum seconds a changing file waits to be registered
+            or updated
+        growing_interval: Seconds between two checks of the growing files
+        settle: Seconds without size change after which a growing file is
+            closed
+        workers: Maximum number of concurrent requests
+        max_batch: Maximum number of files dispatched at once
+        known: Paths relative to the root already registered, mapped to
+            their file ID
+        ignore: Called with each relative path, the file is skipped if it
+            returns True, e.g. for temporary files
+        file_defaults: Extra fields of the files registered
+        on_result: Called with each WatchResult, from a worker thread
+        poll_interval: Seconds between scans of the default PollingSource
+    """
+
+    def __init__(
+        self,
+        files: "FilesSpec",
+        storage_id: str,
+        root: PathLike,
+        source: Any = None,
+        debounce: float = DEFAULT_DEBOUNCE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        growing_interval: float = DEFAULT_GROWING_INTERVAL,
+        settle: float = DEFAULT_SETTLE,
+        workers: int = DEFAULT_WATCH_WORKERS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        known: Optional[Mapping[str, str]] = None,
+        ignore: Optional[Callable[[str], bool]] = None,
+        file_defaults: Optional[Dict[str, Any]] = None,
+        on_result: Optional[Callable[[WatchResult], None]] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        self.files = files
+        self.storage_id = storage_id
+        self.root = os.fspath(root)
+        self.source = source if source is not None else default_source(root, poll_interval)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.growing_interval = growing_interval
+        self.settle = settle
+        self.max_batch = max_batch
+        self.ignore = ignore
+        self.file_defaults = file_defaults or {}
+        self.on_result = on_result
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pythonik-watch")
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        now = time.monotonic()
+        self._tracked: Dict[str, _Tracked] = {
+            path: _Tracked(file_id, None, FileStatus.CLOSED, now) for path, file_id in (known or {}).items()
+        }
+        # path -> [first event, last event, closed]
+        self._pending: Dict[str, List[Any]] = {}
+        self._in_flight: Set[str] = set()
+        self._futures: Set[Future] = set()
+        self._next_growing_check = now + growing_interval
+
+    def poll(self, timeout: Optional[float] = None) -> int:
+        """
+        Wait up to ``timeout`` seconds for events (by default ``debounce``),
+        then dispatch the files that are ready.
+
+        Returns:
+            Number of files dispatched
+        """
+        events = self.source.read(self.debounce if timeout is None else timeout)
+        now = time.monotonic()
+        for path, closed in events:
+            self._queue(path, closed, now)
+        if now >= self._next_growing_check:
+            self._check_growing(now)
+            self._next_growing_check = now + self.growing_interval
+        return self._dispatch(now)
+
+    def run(self):
+        """Watch until :meth:`stop` is called, then wait for the requests in flight"""
+        try:
+            while not self._stopped.is_set():
+                self.poll()
+        finally:
+            self.close()
+
+    def stop(self):
+        """Make :meth:`run` return, from another thread or a callback"""
+        self._stopped.set()
+
+    def wait(self):
+        """Wait for the requests in flight"""
+        while True:
+            with self._lock:
+                futures = list(self._futures)
+            if not futures:
+                return
+            for future in futures:
+                future.result()
+
+    def close(self):
+        """Wait for the requests in flight and close the event source"""
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
+            self.source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _queue(self, path: str, closed: bool, now: float):
+        if self.ignore is not None and self.ignore(path):
+            return
+        entry = self._pending.get(path)
+        if entry is None:
+            self._pending[path] = [now, now, closed]
+        else:
+            entry[1] = now
+            entry[2] = entry[2] or closed
+
+    def _check_growing(self, now: float):
+        """Queue the growing files that changed size or settled"""
+        with self._lock:
+            growing = [
+                (path, tracked)
+                for path, tracked in self._tracked.items()
+                if tracked.status == FileStatus.GROWING
+                and path not in self._in_flight
+                and path not in self._pending
+            ]
+        for path, tracked in growing:
+            try:
+                size = os.stat(os.path.join(self.root, path)).st_size
+            except FileNotFoundError:
+                with self._lock:
+                    self._tracked.pop(path, None)
+                continue
+            if size != tracked.size:
+                self._queue(path, False, now)
+            elif now - tracked.changed_at >= self.settle:
+                # the last event is in the past so the file is dispatched now
+                self._queue(path, True, now - self.debounce)
+
+    def _dispatch(self, now: float) -> int:
+        ready = []
+        for path, (first, last, closed) in self._pending.items():
+            if len(ready) >= self.max_batch:
+                break
+            if path in self._in_flight:
+                continue
+            if now - last >= self.debounce or now - first >= self.max_delay:
+                ready.append((path, closed))
+        for path, closed in ready:
+            del self._pending[path]
+            with self._lock:
+                self._in_flight.add(path)
+                future = self._executor.submit(self._sync, path, closed)
+                self._futures.add(future)
+            future.add_done_callback(lambda future, path=path: self._done(path, future))
+        return len(ready)
+
+    def _done(self, path: str, future: Future):
+        try:
+            result = future.result()
+            if result is not None and self.on_result is not None:
+                self.on_result(result)
+        finally:
+            # wait() returns once the results have been reported
+            with self._lock:
+                self._in_flight.discard(path)
+                self._futures.discard(future)
+
+    def _file_body(self, path: str, info: os.stat_result, status: FileStatus) -> Dict[str, Any]:
+        directory, name = posixpath.split(path)
+        body = {
+            "name": name,
+            "original_name": name,
+            "directory_path": directory,
+            "size": info.st_size,
+            "type": FileType.FILE.value,
+            "status": status.value,
+            "file_date_modified": _isoformat(info.st_mtime),
+        }
+        body.update(self.file_defaults)
+        return body
+
+    def _sync(self, path: str, closed: bool) -> Optional[WatchResult]:
+        """Register or update one file, from a worker thread"""
+        status = FileStatus.CLOSED if closed else FileStatus.GROWING
+        with self._lock:
+            tracked = self._tracked.get(path)
+        action = REGISTERED if tracked is None else UPDATED
+        try:
+            info = os.stat(os.path.join(self.root, path))
+        except FileNotFoundError:
+            # removed before it was registered, e.g. a temporary file
+            with self._lock:
+                self._tracked.pop(path, None)
+            return None
+        except OSError as e:
+            return WatchResult(path, action, status, error=str(e))
+        if not stat.S_ISREG(info.st_mode):
+            return None
+        if tracked is not None and tracked.size == info.st_size and tracked.status == status:
+            return None
+
+        result = WatchResult(path, action, status, info.st_size)
+        try:
+            if tracked is None:
+                response = self.files.create_storage_file(
+                    self.storage_id, body=self._file_body(path, info, status)
+                )
+            else:
+                result.file_id = tracked.file_id
+                response = self.files.partial_update_storage_file(
+                    self.storage_id,
+                    tracked.file_id,
+                    {
+                        "size": info.st_size,
+                        "status": status.value,
+                        "file_date_modified": _isoformat(info.st_mtime),
+                    },
+                )
+        except requests.RequestException as e:
+            result.error = str(e)
+            return result
+        result.response = response.response
+        if not response.response.ok:
+            result.error = f"HTTP {response.response.status_code}"
+            return result
+
+        if tracked is None:
+            result.file_id = _created_file_id(response.data)
+            if result.file_id is None:
+                result.error = "The created file has no ID"
+                return result
+        now = time.monotonic()
+        with self._lock:
+            if tracked is None or tracked.size != info.st_size:
+                changed_at = now
+            else:
+                changed_at = tracked.changed_at
+            self._tracked[path] = _Tracked(result.file_id, info.st_size, status, changed_at)
+        return result
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def _created_file_id(data: Any) -> Optional[str]:
+    """ID of the file created by create_storage_file, parsed as a page of files"""
+    objects = getattr(data, "objects", None)
+    if objects:
+        return objects[0].id or None
+    return getattr(data, "id", None) or None